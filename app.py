@@ -1,5 +1,6 @@
 import streamlit as st
 from llm.explanation_llm import generate_explanation   # ✅ NEW
+from src.app_predict import warm_up_async
 
 # ======================
 # PAGE CONFIG
@@ -10,6 +11,11 @@ st.set_page_config(
     layout="wide"
 )
 
+# ======================
+# MODEL WARM-UP (background thread, once per process)
+# ======================
+warm_up_async()
+
 # ======================
 # LOAD CYBER CSS
 # ======================
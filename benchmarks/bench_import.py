@@ -0,0 +1,105 @@
+"""
+Import-time guard for the modules Streamlit pages load at startup.
+
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --max-ms 300 --out .cache/bench/import.json
+
+The modules are read from the top-level imports of app.py and pages/*.py
+(anything under src, llm or utils), so a page that starts importing a new
+project module is covered without editing this file. Each module is
+imported in a fresh interpreter several times. The check
+fails (exit 1) if a heavy dependency gets imported eagerly or the median
+import time exceeds the budget.
+"""
+import argparse
+import ast
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.report import environment, write_report
+
+ROOT = Path(__file__).resolve().parent.parent
+ENTRY_POINTS = ("app.py", "pages/*.py")
+PROJECT_PACKAGES = ("src", "llm", "utils")
+
+# Must only be imported on first use
+HEAVY = ("torch", "whisper", "librosa", "scipy", "sklearn", "joblib", "numba")
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t0
+heavy = sorted(m for m in {heavy!r} if m in sys.modules)
+print(json.dumps({{"elapsed_ms": elapsed * 1000.0, "heavy": heavy}}))
+"""
+
+
+def _is_module(name: str) -> bool:
+    path = ROOT.joinpath(*name.split("."))
+    return path.with_suffix(".py").exists() or path.is_dir()
+
+
+def _imported(tree):
+    """Module names imported by statements that run when the script does (not inside defs)."""
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        for sub in ast.walk(node):
+            if isinstance(sub, ast.Import):
+                yield from (alias.name for alias in sub.names)
+            elif isinstance(sub, ast.ImportFrom) and sub.module and not sub.level:
+                # `from src import config` imports the submodule src.config
+                names = [f"{sub.module}.{alias.name}" for alias in sub.names]
+                yield from [n for n in names if _is_module(n)] or [sub.module]
+
+
+def page_modules(root: Path = ROOT) -> list:
+    """Project modules imported by the Streamlit entry points, in first-seen order."""
+    modules = {}
+    for pattern in ENTRY_POINTS:
+        for path in sorted(root.glob(pattern)):
+            tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+            for name in _imported(tree):
+                if name.split(".")[0] in PROJECT_PACKAGES:
+                    modules.setdefault(name)
+    return list(modules)
+
+
+def probe(module: str) -> dict:
+    code = _PROBE.format(module=module, heavy=HEAVY)
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that page-level imports stay light.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=400.0, help="budget for the median import time")
+    parser.add_argument("--out", help="optional JSON report path")
+    args = parser.parse_args(argv)
+
+    report = {"env": environment(), "budget_ms": args.max_ms, "modules": {}}
+    failed = False
+    for module in page_modules():
+        runs = [probe(module) for _ in range(args.repeat)]
+        median_ms = statistics.median(r["elapsed_ms"] for r in runs)
+        heavy = sorted(set().union(*(r["heavy"] for r in runs)))
+        ok = not heavy and median_ms <= args.max_ms
+        failed |= not ok
+        report["modules"][module] = {"median_ms": round(median_ms, 1), "heavy_imports": heavy, "ok": ok}
+        status = "ok" if ok else "FAIL"
+        extra = f" eager heavy imports: {', '.join(heavy)}" if heavy else ""
+        print(f"{status:4} {module}: {median_ms:.1f} ms{extra}")
+
+    if args.out:
+        write_report(report, args.out)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Parity check and micro-benchmark for batched MFCC extraction.
+
+    python -m benchmarks.bench_mfcc
+    python -m benchmarks.bench_mfcc --model-dir models/best_text_audio_mfcc --out .cache/bench/mfcc.json
+
+Synthetic clips of mixed lengths (tones plus noise at random levels,
+including empty and sub-frame clips) are featurized by the original
+`librosa.feature.mfcc` mean/std, by `MfccEngine.stats` one clip at a time
+and by `MfccEngine.stats_batch`. The run fails (exit 1) if the batched
+features differ from librosa's by more than --rtol relative to each
+feature's magnitude (float32 rounding gives ~1e-5). The sample rate and
+coefficient count come from the bundle's meta.json; --fft-workers lets
+the stacked FFT blocks spread over several cores.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.report import environment, percentiles, write_report
+
+BATCH_SIZES = (1, 8, 64)
+
+
+def synthetic_clips(sr: int, n: int, max_s: float, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    clips = [np.zeros(0, dtype=np.float32), np.zeros(sr // 50, dtype=np.float32)]
+    while len(clips) < n:
+        t = np.arange(int(rng.uniform(0.05, max_s) * sr)) / sr
+        tone = np.sin(2 * np.pi * rng.uniform(80, 4000) * t) * rng.uniform(0.0, 0.5)
+        noise = rng.standard_normal(len(t)) * 10 ** rng.uniform(-4, -0.5)
+        clips.append((tone + noise).astype(np.float32))
+    return clips
+
+
+def librosa_stats(y: np.ndarray, sr: int, n_mfcc: int) -> np.ndarray:
+    import librosa
+
+    if y.size == 0:
+        return np.zeros(n_mfcc * 2, dtype=np.float32)
+    mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=n_mfcc)
+    return np.concatenate([mfcc.mean(axis=1), mfcc.std(axis=1)]).astype(np.float32)
+
+
+def time_call(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check and time batched MFCC extraction against librosa.")
+    parser.add_argument("--model-dir", default="models/best_text_audio_mfcc")
+    parser.add_argument("--clips", type=int, default=64, help="clips for the parity check")
+    parser.add_argument("--max-seconds", type=float, default=8.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--rtol", type=float, default=1e-4)
+    parser.add_argument("--fft-workers", type=int, default=1)
+    parser.add_argument("--out", help="optional JSON report path")
+    args = parser.parse_args(argv)
+
+    import warnings
+    from src.mfcc import MfccEngine
+
+    warnings.filterwarnings("ignore", message="n_fft=.*is too large")  # librosa, on sub-frame clips
+    meta = json.loads((Path(args.model_dir) / "meta.json").read_text(encoding="utf-8"))
+    sr, n_mfcc = int(meta["sr"]), int(meta["n_mfcc"])
+    engine = MfccEngine(sr, n_mfcc, fft_workers=args.fft_workers)
+
+    # Parity over clips of mixed lengths
+    clips = synthetic_clips(sr, args.clips, args.max_seconds)
+    expected = np.stack([librosa_stats(y, sr, n_mfcc) for y in clips])
+    actual = engine.stats_batch(clips)
+    single = np.stack([engine.stats(y) for y in clips])
+    scale = np.maximum(np.abs(expected), 1.0)
+    max_rel_diff = float(np.max(np.abs(expected - actual) / scale))
+    single_rel_diff = float(np.max(np.abs(single - actual) / scale))
+    print(f"[mfcc] parity over {len(clips)} clips (sr={sr}, n_mfcc={n_mfcc}): "
+          f"max rel diff vs librosa = {max_rel_diff:.3e}, vs stats() = {single_rel_diff:.3e}", file=sys.stderr)
+
+    report = {
+        "env": environment(),
+        "parity": {"clips": len(clips), "max_rel_diff": max_rel_diff, "stats_rel_diff": single_rel_diff},
+        "batches": {},
+    }
+    for n in BATCH_SIZES:
+        batch = clips[2:2 + n]
+        seconds = sum(len(y) for y in batch) / sr
+        slow = time_call(lambda: [librosa_stats(y, sr, n_mfcc) for y in batch], args.repeat)
+        looped = time_call(lambda: [engine.stats(y) for y in batch], args.repeat)
+        batched = time_call(lambda: engine.stats_batch(batch), args.repeat)
+        speedup = np.median(slow) / np.median(batched)
+        report["batches"][str(n)] = {
+            "audio_s": seconds,
+            "librosa_s": percentiles(slow),
+            "engine_s": percentiles(looped),
+            "batch_s": percentiles(batched),
+            "speedup_p50": float(speedup),
+        }
+        print(f"[mfcc] batch {n:>3} ({seconds:6.1f} s audio): librosa {np.median(slow) * 1e3:8.2f} ms, "
+              f"engine {np.median(looped) * 1e3:8.2f} ms, batched {np.median(batched) * 1e3:8.2f} ms "
+              f"({speedup:.1f}x)", file=sys.stderr)
+
+    if args.out:
+        write_report(report, args.out)
+
+    if max_rel_diff > args.rtol:
+        print("[mfcc] FAIL: batched MFCC features disagree with librosa", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
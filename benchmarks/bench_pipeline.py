@@ -0,0 +1,213 @@
+"""
+End-to-end benchmark of the detection pipeline on the synthetic corpus.
+
+    python -m benchmarks.bench_pipeline --out .cache/bench/report.json
+    python -m benchmarks.bench_pipeline --baseline .cache/bench/baseline.json
+
+Modes:
+  single    predict_media() one file at a time, with per-stage timings
+  batch     predict_media_batch() over the whole corpus
+  parallel  one predict_media() per file on a process pool
+
+Every mode runs in fresh spawned processes so peak RSS is per mode. The
+result cache is bypassed. `--whisper auto` uses the configured backend
+(DEEPFAKE_WHISPER_BACKEND) when openai-whisper weights are already in
+~/.cache/whisper and the stub backend otherwise, so the benchmark never
+touches the network.
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import resource
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from benchmarks.corpus import CONTAINERS, DURATIONS_S, build_corpus
+from benchmarks.report import compare, environment, percentiles, print_regressions, write_report
+
+# Metrics checked against a baseline, and which direction is better
+BASELINE_METRICS = {
+    f"modes.{mode}.{metric}": better
+    for mode in ("single", "batch", "parallel")
+    for metric, better in (
+        ("latency_s.p50", "lower"),
+        ("throughput_fpm", "higher"),
+        ("peak_rss_mb", "lower"),
+    )
+}
+
+# Caches switched off for every benchmark run (recorded in the report's env block)
+BENCH_CACHE_ENV = ("DEEPFAKE_RESULT_CACHE", "DEEPFAKE_TRANSCRIPT_CACHE", "DEEPFAKE_FEATURE_STORE")
+
+
+def whisper_weights_cached(name: str) -> bool:
+    root = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "whisper"
+    return (root / f"{name}.pt").exists()
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+# ----------------------- Worker Side -----------------------
+def _init_worker(torch_threads: int, stub: bool):
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(torch_threads)
+    os.environ["DEEPFAKE_WHISPER_THREADS"] = str(torch_threads)
+    if stub:
+        os.environ["DEEPFAKE_WHISPER_BACKEND"] = "stub"
+
+    from src import app_predict
+    app_predict.warm_up(include_whisper=True)
+
+
+def _mode_single(paths):
+    from src.app_predict import predict_media
+
+    latencies = []
+    stage_wall = defaultdict(float)
+    for path in paths:
+        t0 = time.perf_counter()
+        result = predict_media(path, use_cache=False, timings=True)
+        latencies.append(time.perf_counter() - t0)
+        for rec in result["timings"]["stages"]:
+            stage_wall[rec["stage"]] += rec["wall_s"]
+    return {"latencies": latencies, "stage_wall": dict(stage_wall), "peak_rss_mb": _peak_rss_mb()}
+
+
+def _mode_batch(paths):
+    from src.app_predict import predict_media_batch
+
+    t0 = time.perf_counter()
+    results = predict_media_batch(paths, use_cache=False)
+    elapsed = time.perf_counter() - t0
+    errors = sum(1 for r in results if "error" in r)
+    return {"elapsed": elapsed, "errors": errors, "peak_rss_mb": _peak_rss_mb()}
+
+
+def _predict_one(path):
+    from src.app_predict import predict_media
+
+    t0 = time.perf_counter()
+    predict_media(path, use_cache=False)
+    return time.perf_counter() - t0, _peak_rss_mb()
+
+# ----------------------- Driver -----------------------
+def _pool(workers: int, torch_threads: int, stub: bool):
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(torch_threads, stub),
+    )
+
+
+def run_modes(paths, modes, workers: int, torch_threads: int, stub: bool) -> dict:
+    out = {}
+    n = len(paths)
+
+    if "single" in modes:
+        with _pool(1, torch_threads, stub) as pool:
+            t0 = time.perf_counter()
+            res = pool.submit(_mode_single, paths).result()
+            elapsed = time.perf_counter() - t0
+        out["single"] = {
+            "files": n,
+            "latency_s": percentiles(res["latencies"]),
+            "throughput_fpm": n / sum(res["latencies"]) * 60 if n else 0.0,
+            "wall_s": elapsed,
+            "peak_rss_mb": res["peak_rss_mb"],
+            "stage_mean_s": {k: v / n for k, v in sorted(res["stage_wall"].items())},
+        }
+
+    if "batch" in modes:
+        with _pool(1, torch_threads, stub) as pool:
+            res = pool.submit(_mode_batch, paths).result()
+        out["batch"] = {
+            "files": n,
+            "errors": res["errors"],
+            "latency_s": percentiles([res["elapsed"] / n] if n else []),
+            "throughput_fpm": n / res["elapsed"] * 60 if res["elapsed"] else 0.0,
+            "wall_s": res["elapsed"],
+            "peak_rss_mb": res["peak_rss_mb"],
+        }
+
+    if "parallel" in modes:
+        with _pool(workers, torch_threads, stub) as pool:
+            # Let the workers start and warm up before timing
+            list(pool.map(_peak_rss_mb_probe, range(workers)))
+            t0 = time.perf_counter()
+            res = list(pool.map(_predict_one, paths))
+            elapsed = time.perf_counter() - t0
+        out["parallel"] = {
+            "files": n,
+            "workers": workers,
+            "torch_threads": torch_threads,
+            "latency_s": percentiles([r[0] for r in res]),
+            "throughput_fpm": n / elapsed * 60 if elapsed else 0.0,
+            "wall_s": elapsed,
+            "peak_rss_mb": max((r[1] for r in res), default=None),
+        }
+
+    return out
+
+
+def _peak_rss_mb_probe(_):
+    return _peak_rss_mb()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the detection pipeline on synthetic media.")
+    parser.add_argument("--corpus", default=".cache/bench_corpus")
+    parser.add_argument("--durations", type=int, nargs="+", default=list(DURATIONS_S))
+    parser.add_argument("--containers", nargs="+", default=list(CONTAINERS))
+    parser.add_argument("--modes", nargs="+", default=["single", "batch", "parallel"])
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 1) // 2))
+    parser.add_argument("--torch-threads", type=int, default=1)
+    parser.add_argument("--whisper", choices=["auto", "real", "stub"], default="auto")
+    parser.add_argument("--out", default=".cache/bench/report.json")
+    parser.add_argument("--baseline", help="report to compare against; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    # Every mode must do the full work: no cached results or transcripts (the corpus
+    # wraps the same clip in several containers, which the transcript cache would match),
+    # and no feature-store writes. Set before config is imported; spawned workers inherit it.
+    for var in BENCH_CACHE_ENV:
+        os.environ[var] = "0"
+
+    from src import config
+    if args.whisper == "auto":
+        stub = config.WHISPER_BACKEND.startswith("openai") and not whisper_weights_cached(config.WHISPER_MODEL)
+    else:
+        stub = args.whisper == "stub"
+    whisper_label = "stub" if stub else f"{config.WHISPER_BACKEND}:{config.WHISPER_MODEL}"
+
+    manifest = build_corpus(args.corpus, durations=args.durations, containers=args.containers)
+    paths = [m["path"] for m in manifest]
+    print(f"[bench] {len(paths)} files, whisper={whisper_label}", file=sys.stderr)
+
+    report = {
+        "env": dict(environment(), cache={var: os.environ[var] for var in BENCH_CACHE_ENV}),
+        "config": {
+            "whisper": whisper_label,
+            "durations_s": args.durations,
+            "containers": args.containers,
+            "corpus_bytes": sum(m["bytes"] for m in manifest),
+        },
+        "modes": run_modes(paths, args.modes, args.workers, args.torch_threads, stub),
+    }
+    write_report(report, args.out)
+    print(f"[bench] report written to {args.out}", file=sys.stderr)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        if print_regressions(compare(report, baseline, BASELINE_METRICS, args.tolerance)):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Parity check and micro-benchmark for the fast linear scorer.
+
+    python -m benchmarks.bench_scorer
+    python -m benchmarks.bench_scorer --model-dir models/best_text_audio_mfcc --out .cache/bench/scorer.json
+
+Random transcripts (drawn from the vectorizer's vocabulary) and MFCC
+vectors (drawn around the scaler's mean) are scored by the sklearn path
+(hstack + predict_proba) and by `LinearScorer`. The run fails (exit 1) if
+any probability differs by more than --atol on float64 features, or by
+more than --atol32 on the pipeline's float32 MFCC vectors (sklearn scales
+those in float32, so ~1e-7 drift is expected), or if any predicted class
+differs. The same checks run in tests/test_fast_scorer.py on a synthetic
+bundle. Timings cover scoring only;
+TF-IDF vectorization is shared by both paths and reported separately.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.report import environment, percentiles, write_report
+
+BATCH_SIZES = (1, 8, 64, 512)
+
+
+def load_model(model_dir: str):
+    from src.model_registry import ModelRegistry
+
+    return ModelRegistry(Path(model_dir)).get()
+
+
+def synthetic_inputs(vec, scaler, n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    vocab = np.asarray(sorted(vec.vocabulary_))
+    transcripts = [
+        " ".join(rng.choice(vocab, size=int(rng.integers(0, 60))))
+        for _ in range(n)
+    ]
+    mean = getattr(scaler, "mean_", None)
+    scale = getattr(scaler, "scale_", None)
+    n_audio = scaler.n_features_in_
+    feats = rng.standard_normal((n, n_audio))
+    if scale is not None:
+        feats *= scale
+    if mean is not None:
+        feats += mean
+    return transcripts, feats
+
+
+def sklearn_proba(scaler, clf, X_text, feats):
+    from scipy.sparse import hstack, csr_matrix
+
+    X = hstack([X_text, csr_matrix(scaler.transform(feats))]).tocsr()
+    return clf.predict_proba(X)
+
+
+def time_call(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check and time the fast linear scorer against sklearn.")
+    parser.add_argument("--model-dir", default="models/best_text_audio_mfcc")
+    parser.add_argument("--samples", type=int, default=2000, help="rows for the parity check")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--atol", type=float, default=1e-12)
+    parser.add_argument("--atol32", type=float, default=1e-6)
+    parser.add_argument("--out", help="optional JSON report path")
+    args = parser.parse_args(argv)
+
+    from src.fast_scorer import LinearScorer
+
+    vec, scaler, clf, _ = load_model(args.model_dir)
+    scorer = LinearScorer.from_bundle(vec, scaler, clf)
+    if scorer is None:
+        print(f"[scorer] {type(clf).__name__} is not a binary linear model; nothing to compare", file=sys.stderr)
+        sys.exit(1)
+
+    # Parity over many random rows
+    transcripts, feats = synthetic_inputs(vec, scaler, args.samples)
+    X_text = vec.transform(transcripts)
+    expected = sklearn_proba(scaler, clf, X_text, feats)
+    actual = scorer.predict_proba(X_text, feats)
+    max_abs_diff = float(np.max(np.abs(expected - actual)))
+    same_argmax = bool(np.array_equal(expected.argmax(axis=1), actual.argmax(axis=1)))
+    feats32 = feats.astype(np.float32)
+    expected32 = sklearn_proba(scaler, clf, X_text, feats32)
+    actual32 = scorer.predict_proba(X_text, feats32)
+    float32_diff = float(np.max(np.abs(expected32 - actual32)))
+    same_argmax = same_argmax and bool(np.array_equal(expected32.argmax(axis=1), actual32.argmax(axis=1)))
+    print(f"[scorer] parity over {args.samples} rows: max |diff| = {max_abs_diff:.3e} "
+          f"(float32 features: {float32_diff:.3e}), same predictions = {same_argmax}", file=sys.stderr)
+
+    report = {
+        "env": environment(),
+        "parity": {
+            "samples": args.samples,
+            "max_abs_diff": max_abs_diff,
+            "float32_max_abs_diff": float32_diff,
+            "same_predictions": same_argmax,
+        },
+        "batches": {},
+    }
+    for n in BATCH_SIZES:
+        batch_text, batch_feats = transcripts[:n], feats[:n]
+        X_batch = vec.transform(batch_text)
+        vectorize = time_call(lambda: vec.transform(batch_text), args.repeat)
+        slow = time_call(lambda: sklearn_proba(scaler, clf, X_batch, batch_feats), args.repeat)
+        fast = time_call(lambda: scorer.predict_proba(X_batch, batch_feats), args.repeat)
+        speedup = np.median(slow) / np.median(fast)
+        report["batches"][str(n)] = {
+            "vectorize_s": percentiles(vectorize),
+            "sklearn_s": percentiles(slow),
+            "fast_s": percentiles(fast),
+            "speedup_p50": float(speedup),
+        }
+        print(f"[scorer] batch {n:>4}: sklearn {np.median(slow) * 1e6:9.1f} us, "
+              f"fast {np.median(fast) * 1e6:9.1f} us ({speedup:.1f}x), "
+              f"vectorize {np.median(vectorize) * 1e6:9.1f} us", file=sys.stderr)
+
+    if args.out:
+        write_report(report, args.out)
+
+    if max_abs_diff > args.atol or float32_diff > args.atol32 or not same_argmax:
+        print("[scorer] FAIL: fast scorer disagrees with predict_proba", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Deterministic synthetic media for benchmarks (no network, no real speech).
+
+    python -m benchmarks.corpus --out .cache/bench_corpus
+
+Each clip is generated from a fixed seed, written as 16 kHz WAV with the
+stdlib `wave` module, then wrapped into MP3 and MP4 with ffmpeg.
+"""
+import argparse
+import json
+import subprocess
+import wave
+from pathlib import Path
+
+import numpy as np
+
+SR = 16000
+KINDS = ("tone", "noise", "speechlike")
+DURATIONS_S = (5, 30, 120)
+CONTAINERS = ("wav", "mp3", "mp4")
+
+
+# ----------------------- Signals -----------------------
+def tone(duration_s: float, rng) -> np.ndarray:
+    t = np.arange(int(duration_s * SR)) / SR
+    return 0.3 * np.sin(2 * np.pi * 440.0 * t) + 0.1 * np.sin(2 * np.pi * 880.0 * t)
+
+
+def noise(duration_s: float, rng) -> np.ndarray:
+    return 0.1 * rng.standard_normal(int(duration_s * SR))
+
+
+def speechlike(duration_s: float, rng) -> np.ndarray:
+    """Voiced harmonics with moving formants, ~4 syllables/s and short pauses."""
+    n = int(duration_s * SR)
+    t = np.arange(n) / SR
+    f0 = 120.0 + 20.0 * np.sin(2 * np.pi * 0.5 * t) + 5.0 * np.sin(2 * np.pi * 5.0 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / SR
+
+    syllables = int(duration_s * 4) + 1
+    f1 = np.repeat(rng.uniform(300, 800, syllables), SR // 4)[:n]
+    f2 = np.repeat(rng.uniform(900, 2500, syllables), SR // 4)[:n]
+
+    y = np.zeros(n)
+    for h in range(1, 30):
+        fh = h * f0
+        weight = np.exp(-((fh - f1) / 150.0) ** 2) + 0.5 * np.exp(-((fh - f2) / 250.0) ** 2)
+        y += weight * np.sin(h * phase)
+
+    envelope = np.clip(np.sin(2 * np.pi * 4.0 * t), 0, None) ** 0.5
+    pauses = np.repeat(rng.random(int(duration_s) + 1) < 0.2, SR)[:n]  # ~20% silent seconds
+    envelope[pauses] = 0.0
+    y = y * envelope + 0.003 * rng.standard_normal(n)
+    return 0.3 * y / (np.abs(y).max() + 1e-9)
+
+
+GENERATORS = {"tone": tone, "noise": noise, "speechlike": speechlike}
+
+# ----------------------- Containers -----------------------
+def write_wav(path: Path, y: np.ndarray):
+    pcm = (np.clip(y, -1.0, 1.0) * 32767).astype(np.int16)
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SR)
+        w.writeframes(pcm.tobytes())
+
+
+def _ffmpeg(*args):
+    subprocess.run(["ffmpeg", "-y", "-nostdin", "-loglevel", "error", *args], check=True)
+
+
+def wrap(wav_path: Path, container: str) -> Path:
+    out = wav_path.with_suffix(f".{container}")
+    if container == "mp3":
+        _ffmpeg("-i", str(wav_path), "-b:a", "64k", str(out))
+    elif container == "mp4":
+        _ffmpeg(
+            "-f", "lavfi", "-i", "color=c=black:s=320x240:r=10",
+            "-i", str(wav_path), "-shortest",
+            "-c:v", "mpeg4", "-c:a", "aac", "-b:a", "64k", str(out),
+        )
+    return out
+
+
+def build_corpus(out_dir, kinds=KINDS, durations=DURATIONS_S, containers=CONTAINERS, seed: int = 0):
+    """Generate (or reuse) the corpus and return its manifest: a list of dicts."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = []
+    for k_i, kind in enumerate(kinds):
+        for duration in durations:
+            stem = out_dir / f"{kind}_{duration}s"
+            wav_path = stem.with_suffix(".wav")
+            if not wav_path.exists():
+                rng = np.random.default_rng(seed * 1000 + k_i * 100 + duration)
+                write_wav(wav_path, GENERATORS[kind](duration, rng))
+            for container in containers:
+                path = wav_path if container == "wav" else stem.with_suffix(f".{container}")
+                if not path.exists():
+                    wrap(wav_path, container)
+                manifest.append({
+                    "path": str(path),
+                    "kind": kind,
+                    "duration_s": duration,
+                    "container": container,
+                    "bytes": path.stat().st_size,
+                })
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the synthetic benchmark corpus.")
+    parser.add_argument("--out", default=".cache/bench_corpus")
+    parser.add_argument("--durations", type=int, nargs="+", default=list(DURATIONS_S))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    manifest = build_corpus(args.out, durations=args.durations, seed=args.seed)
+    print(f"{len(manifest)} files in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
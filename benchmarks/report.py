@@ -0,0 +1,72 @@
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+
+
+# ----------------------- Report Helpers -----------------------
+def percentiles(values, ps=(50, 90, 99)) -> dict:
+    if not values:
+        return {f"p{p}": None for p in ps}
+    ordered = sorted(values)
+    out = {}
+    for p in ps:
+        idx = min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))
+        out[f"p{p}"] = ordered[idx]
+    return out
+
+
+def environment() -> dict:
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def write_report(report: dict, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def compare(current: dict, baseline: dict, metrics, tolerance: float = 0.10):
+    """
+    Compare flattened metrics against a baseline report.
+
+    `metrics` maps a dotted path to "lower" or "higher" (which direction is
+    better). Returns a list of (metric, baseline, current, change) regressions
+    worse than `tolerance`.
+    """
+    regressions = []
+    for dotted, better in metrics.items():
+        base, cur = _lookup(baseline, dotted), _lookup(current, dotted)
+        if not base or cur is None:
+            continue
+        change = (cur - base) / base
+        worse = change > tolerance if better == "lower" else change < -tolerance
+        if worse:
+            regressions.append((dotted, base, cur, change))
+    return regressions
+
+
+def _lookup(report: dict, dotted: str):
+    node = report
+    for part in dotted.split("."):
+        if not isinstance(node, dict) or part not in node:
+            return None
+        node = node[part]
+    return node if isinstance(node, (int, float)) else None
+
+
+def print_regressions(regressions, stream=sys.stdout) -> bool:
+    if not regressions:
+        print("No regressions against baseline.", file=stream)
+        return False
+    for metric, base, cur, change in regressions:
+        print(f"REGRESSION {metric}: {base:.4g} -> {cur:.4g} ({change:+.1%})", file=stream)
+    return True
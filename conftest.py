@@ -0,0 +1 @@
+# Lets `pytest` import the `src`, `llm` and `utils` packages from the repository root.
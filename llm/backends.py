@@ -0,0 +1,224 @@
+"""
+Optional LLM backends for free-text explanations, behind a response cache.
+
+DEEPFAKE_LLM_BACKEND selects one:
+    none               (default) no LLM; callers keep the template text
+    stub               deterministic local reply, for tests and offline runs
+    openai-compatible  POST {DEEPFAKE_LLM_URL}/chat/completions with DEEPFAKE_LLM_MODEL
+
+Responses are cached by (backend, model, prompt) in SQLite under
+CACHE_ROOT, with the most recent ones also kept in memory, so a prompt is
+sent at most once however often a page reruns or a batch repeats it.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from src import config
+from utils.prompt_builder import build_prompt
+
+
+class LLMError(RuntimeError):
+    """The backend could not produce a response."""
+
+
+# ----------------------- Backends -----------------------
+class LLMBackend:
+    """Turns a prompt into a response."""
+
+    name = "base"
+
+    def __init__(self, model: str = "", url: str = "", api_key: str = "", timeout_s: float = 60.0):
+        self.model = model
+        self.url = url.rstrip("/")
+        self.api_key = api_key
+        self.timeout_s = timeout_s
+
+    def backend_id(self) -> str:
+        return f"{self.name}:{self.model}"
+
+    def complete(self, prompt: str) -> str:
+        raise NotImplementedError
+
+
+class StubBackend(LLMBackend):
+    """No model; echoes the prompt's confidence line so tests can check what was sent."""
+
+    name = "stub"
+
+    def complete(self, prompt: str) -> str:
+        score = next((line for line in prompt.splitlines() if line.startswith("Confidence Score")), "")
+        return f"[stub explanation] {score}".strip()
+
+
+class ChatCompletionsBackend(LLMBackend):
+    """Any server speaking the OpenAI chat-completions API (hosted, vLLM, llama.cpp, Ollama...)."""
+
+    name = "openai-compatible"
+
+    def complete(self, prompt: str) -> str:
+        if not self.url:
+            raise LLMError("DEEPFAKE_LLM_URL is not set")
+        body = json.dumps({
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0,
+        }).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        req = Request(self.url + "/chat/completions", data=body, headers=headers, method="POST")
+        try:
+            with urlopen(req, timeout=self.timeout_s) as resp:
+                payload = json.loads(resp.read())
+        except (HTTPError, URLError, OSError, ValueError) as e:
+            raise LLMError(f"{self.url}: {e}") from e
+        try:
+            return payload["choices"][0]["message"]["content"].strip()
+        except (KeyError, IndexError, TypeError, AttributeError):
+            raise LLMError(f"{self.url}: unexpected response {str(payload)[:200]}")
+
+
+BACKENDS = {
+    "stub": StubBackend,
+    "openai-compatible": ChatCompletionsBackend,
+}
+
+
+def create_backend(name: str):
+    """Backend for `name`, or None for "none"."""
+    if name in ("", "none"):
+        return None
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend: {name!r} (choose from none, {', '.join(BACKENDS)})")
+    return BACKENDS[name](
+        model=config.LLM_MODEL, url=config.LLM_URL, api_key=config.LLM_API_KEY, timeout_s=config.LLM_TIMEOUT_S
+    )
+
+# ----------------------- Response Cache -----------------------
+class ResponseCache:
+    """Responses keyed by sha256(backend id, prompt): SQLite on disk plus a small in-memory LRU."""
+
+    def __init__(self, db_path, memory_items: int = 1024):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.memory_items = memory_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, backend TEXT NOT NULL, response TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        db = sqlite3.connect(self.db_path, timeout=30)
+        db.execute("PRAGMA journal_mode=WAL")
+        return db
+
+    @staticmethod
+    def key(backend_id: str, prompt: str) -> str:
+        return hashlib.sha256(f"{backend_id}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        with self._connect() as db:
+            row = db.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._remember(key, row[0])
+            return row[0]
+        return None
+
+    def put(self, key: str, backend_id: str, response: str):
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, backend, response, created_at) VALUES (?, ?, ?, ?)",
+                (key, backend_id, response, time.time()),
+            )
+        self._remember(key, response)
+
+    def _remember(self, key: str, response: str):
+        with self._lock:
+            self._memory[key] = response
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+
+_BACKEND = None
+_CACHE = None
+
+
+def get_backend():
+    """The configured backend (None when DEEPFAKE_LLM_BACKEND is "none")."""
+    global _BACKEND
+    if _BACKEND is None:
+        _BACKEND = create_backend(config.LLM_BACKEND) or False
+    return _BACKEND or None
+
+
+def get_cache() -> ResponseCache:
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = ResponseCache(config.CACHE_ROOT / "llm_responses.sqlite3")
+    return _CACHE
+
+
+def complete_cached(prompt: str, backend: LLMBackend = None) -> str:
+    """backend.complete(prompt), answered from the cache when this backend has seen the prompt."""
+    backend = backend or get_backend()
+    if backend is None:
+        raise LLMError("no LLM backend configured (DEEPFAKE_LLM_BACKEND=none)")
+    cache = get_cache()
+    key = cache.key(backend.backend_id(), prompt)
+    response = cache.get(key)
+    if response is None:
+        response = backend.complete(prompt)
+        cache.put(key, backend.backend_id(), response)
+    return response
+
+# ----------------------- Result Explanations -----------------------
+def prompt_result(result: dict) -> dict:
+    """build_prompt() input for a predict_media()/scan result."""
+    from llm.explanation_llm import result_inputs
+
+    inputs = result_inputs(result)
+    artifacts = [
+        f"{inputs['media_type']} classified as {inputs['result']}",
+        f"FAKE probability {inputs['fake_prob']:.1f}%",
+    ]
+    if inputs["meta"]["voice_detected"]:
+        artifacts.append("speech present")
+    segments = result.get("segments") or []
+    fake_windows = sum(1 for s in segments if str(s.get("prediction")).lower() == "fake")
+    return {
+        "confidence": inputs["confidence"] / 100.0,
+        "artifacts": artifacts,
+        "frame_anomalies": {"analysis windows": fake_windows} if segments else {},
+    }
+
+
+def explain_with_llm(results, backend: LLMBackend = None) -> list:
+    """
+    LLM explanation per result, or None where the backend failed.
+
+    Results that produce the same prompt share one request.
+    """
+    backend = backend or get_backend()
+    prompts = [build_prompt(prompt_result(r)) for r in results]
+    answers = {}
+    for prompt in dict.fromkeys(prompts):
+        try:
+            answers[prompt] = complete_cached(prompt, backend)
+        except LLMError:
+            answers[prompt] = None
+    return [answers[p] for p in prompts]
@@ -1,77 +1,195 @@
-def generate_explanation(media_type, result, confidence, real_prob, fake_prob, meta):
-    explanation = []
-
-    # ======================
-    # VERDICT INTRO
-    # ======================
-    explanation.append(
-        f"The uploaded {media_type} was classified as {result} with a confidence "
-        f"of {confidence:.2f}%."
+"""
+Template explanations for detection results.
+
+    python -m llm.explanation_llm results.jsonl -o explained.jsonl
+    python -m llm.explanation_llm results.jsonl -o explained.jsonl --llm
+
+An explanation depends only on a small discrete key: media type, verdict,
+confidence as displayed (2 decimals), the meta flags that matter for that
+media type, and whether the fake probability is in the >= 90% bucket. The
+sentences are fixed strings and every key is composed once, so Streamlit
+reruns and bulk runs over scanner results are dictionary lookups.
+
+With --llm, results are also explained by the configured LLM backend
+(see `llm.backends`), whose responses are cached on disk by prompt.
+"""
+import argparse
+import json
+import mimetypes
+import sys
+from functools import lru_cache
+
+# ======================
+# TEMPLATES
+# ======================
+INTRO = "The uploaded {media_type} was classified as {result} with a confidence of {confidence}%."
+
+IMAGE_FACE = (
+    "Facial feature analysis revealed abnormal texture patterns and "
+    "inconsistent lighting around key regions such as the eyes and mouth. "
+    "These visual artifacts are commonly observed in AI-generated images."
+)
+IMAGE_NO_FACE = (
+    "The image lacks stable facial landmarks and exhibits unnatural visual "
+    "patterns, reducing the likelihood of it being an authentic photograph."
+)
+AUDIO_VOICE = (
+    "MFCC-based audio analysis detected irregular pitch transitions and "
+    "unnatural speech timing, which are strong indicators of synthetic or "
+    "voice-cloned audio."
+)
+AUDIO_NO_VOICE = (
+    "The audio signal contains abnormal frequency distributions that do not "
+    "align with natural human speech characteristics."
+)
+VIDEO_FACE = (
+    "Frame-by-frame inspection revealed temporal inconsistencies in facial "
+    "expressions and lip synchronization, suggesting manipulation at the "
+    "visual level."
+)
+VIDEO_AUDIO = (
+    "Cross-modal analysis between the audio and visual streams showed timing "
+    "mismatches, indicating that speech and facial movements were likely "
+    "generated or altered separately."
+)
+VIDEO_SHORT = (
+    "Short video duration combined with high manipulation confidence is "
+    "characteristic of deepfake samples generated for rapid dissemination."
+)
+HIGH_FAKE = (
+    "The extremely high fake probability indicates strong agreement across "
+    "multiple detection features and models."
+)
+
+SHORT_VIDEO_S = 10
+HIGH_FAKE_PERCENT = 90
+
+# Meta flags that change the text, per media type; others are dropped from the key
+_FLAGS = {
+    "image": ("face_detected",),
+    "audio": ("voice_detected",),
+    "video": ("face_detected", "audio_present", "short"),
+}
+
+
+# ======================
+# CACHED COMPOSITION
+# ======================
+def explanation_key(media_type, result, confidence, fake_prob, meta) -> tuple:
+    """Normalize the inputs to the discrete key the text depends on."""
+    meta = meta or {}
+    duration = meta.get("duration")
+    flags = {
+        "face_detected": bool(meta.get("face_detected")),
+        "voice_detected": bool(meta.get("voice_detected")),
+        "audio_present": bool(meta.get("audio_present")),
+        "short": bool(duration and duration < SHORT_VIDEO_S),
+    }
+    return (
+        str(media_type),
+        str(result),
+        f"{confidence:.2f}",
+        frozenset(name for name in _FLAGS.get(media_type, ()) if flags[name]),
+        fake_prob >= HIGH_FAKE_PERCENT,
     )
 
-    # ======================
-    # IMAGE LOGIC
-    # ======================
+
+@lru_cache(maxsize=4096)
+def _compose(media_type: str, result: str, confidence: str, flags: frozenset, high_fake: bool) -> str:
+    parts = [INTRO.format(media_type=media_type, result=result, confidence=confidence)]
     if media_type == "image":
-        if meta.get("face_detected"):
-            explanation.append(
-                "Facial feature analysis revealed abnormal texture patterns and "
-                "inconsistent lighting around key regions such as the eyes and mouth. "
-                "These visual artifacts are commonly observed in AI-generated images."
-            )
-        else:
-            explanation.append(
-                "The image lacks stable facial landmarks and exhibits unnatural visual "
-                "patterns, reducing the likelihood of it being an authentic photograph."
-            )
-
-    # ======================
-    # AUDIO LOGIC
-    # ======================
+        parts.append(IMAGE_FACE if "face_detected" in flags else IMAGE_NO_FACE)
     elif media_type == "audio":
-        if meta.get("voice_detected"):
-            explanation.append(
-                "MFCC-based audio analysis detected irregular pitch transitions and "
-                "unnatural speech timing, which are strong indicators of synthetic or "
-                "voice-cloned audio."
-            )
-        else:
-            explanation.append(
-                "The audio signal contains abnormal frequency distributions that do not "
-                "align with natural human speech characteristics."
-            )
-
-    # ======================
-    # VIDEO LOGIC
-    # ======================
+        parts.append(AUDIO_VOICE if "voice_detected" in flags else AUDIO_NO_VOICE)
     elif media_type == "video":
-        if meta.get("face_detected"):
-            explanation.append(
-                "Frame-by-frame inspection revealed temporal inconsistencies in facial "
-                "expressions and lip synchronization, suggesting manipulation at the "
-                "visual level."
-            )
-
-        if meta.get("audio_present"):
-            explanation.append(
-                "Cross-modal analysis between the audio and visual streams showed timing "
-                "mismatches, indicating that speech and facial movements were likely "
-                "generated or altered separately."
-            )
-
-        if meta.get("duration") and meta["duration"] < 10:
-            explanation.append(
-                "Short video duration combined with high manipulation confidence is "
-                "characteristic of deepfake samples generated for rapid dissemination."
-            )
-
-    # ======================
-    # CONFIDENCE REASONING
-    # ======================
-    if fake_prob >= 90:
-        explanation.append(
-            "The extremely high fake probability indicates strong agreement across "
-            "multiple detection features and models."
-        )
-
-    return " ".join(explanation)
+        parts.extend(text for flag, text in (
+            ("face_detected", VIDEO_FACE), ("audio_present", VIDEO_AUDIO), ("short", VIDEO_SHORT),
+        ) if flag in flags)
+    if high_fake:
+        parts.append(HIGH_FAKE)
+    return " ".join(parts)
+
+
+def generate_explanation(media_type, result, confidence, real_prob, fake_prob, meta):
+    """Explanation for one verdict; probabilities and confidence are in percent."""
+    return _compose(*explanation_key(media_type, result, confidence, fake_prob, meta))
+
+
+# ======================
+# SCANNER RESULTS
+# ======================
+def result_inputs(result: dict) -> dict:
+    """generate_explanation() arguments for a predict_media()/scan result (probabilities in 0-1)."""
+    path = result.get("media_path") or result.get("path")
+    media_type = result.get("media_type")
+    if not media_type:
+        mime_type = mimetypes.guess_type(str(path))[0] if path else None
+        media_type = mime_type.split("/")[0] if mime_type else "unknown"
+    media = result.get("media") or {}
+    vad = result.get("vad") or {}
+    if "speech_ratio" in vad:
+        voice = vad["speech_ratio"] > 0
+    else:
+        voice = bool((result.get("transcript") or "").strip())
+    return {
+        "media_type": media_type,
+        "result": str(result.get("prediction", "unknown")).upper(),
+        "confidence": float(result.get("confidence", 0.0)) * 100.0,
+        "real_prob": float(result.get("prob_real", 0.0)) * 100.0,
+        "fake_prob": float(result.get("prob_fake", 0.0)) * 100.0,
+        "meta": {
+            "face_detected": False,  # the pipeline has no face detector
+            "voice_detected": voice,
+            "audio_present": media.get("has_audio", media_type in ("audio", "video")),
+            "duration": result.get("duration"),
+        },
+    }
+
+
+def explain_results(results) -> list:
+    """One explanation per result; identical keys are composed once across the whole batch."""
+    return [generate_explanation(**result_inputs(r)) for r in results]
+
+
+def cache_info():
+    return _compose.cache_info()
+
+
+# ======================
+# CLI
+# ======================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Add explanations to scanner results (JSONL).")
+    parser.add_argument("results", help="JSONL written by src.scan")
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--llm", action="store_true", help="also ask the configured LLM backend")
+    args = parser.parse_args(argv)
+
+    with open(args.results, encoding="utf-8") as f:
+        rows = [row for row in map(_parse, f) if row is not None and "error" not in row]
+
+    explanations = explain_results(rows)
+    llm_texts = [None] * len(rows)
+    if args.llm:
+        from llm.backends import explain_with_llm
+        llm_texts = explain_with_llm(rows)
+
+    with open(args.output, "w", encoding="utf-8") as out:
+        for row, text, llm_text in zip(rows, explanations, llm_texts):
+            row = dict(row, explanation=text)
+            if llm_text is not None:
+                row["llm_explanation"] = llm_text
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+    info = cache_info()
+    print(f"[explain] {len(rows)} results, {info.currsize} distinct explanations", file=sys.stderr)
+
+
+def _parse(line: str):
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+if __name__ == "__main__":
+    main()
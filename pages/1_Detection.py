@@ -1,7 +1,11 @@
 import streamlit as st
-import tempfile
-from pathlib import Path
-from src.app_predict import predict_media  
+import time
+from datetime import datetime
+from src import config
+from src.history import get_history
+from src.jobs import DONE, FAILED, QueueFull, get_queue
+from src.service_client import ServiceBusy, ServiceClient, ServiceError
+from src.spool import SpoolEntry, get_spool
 
 # ======================
 # PAGE CONFIG
@@ -74,22 +78,47 @@ with colA:
         ]
     )
 
-    file_bytes = None
+    spooled = None
     file_type = None
+    previous = None
+    open_previous = False
 
     if uploaded:
-        file_bytes = uploaded.getvalue()
+        # Spool once per upload (not on every rerun); previews and the
+        # detection job both read the spooled file instead of in-memory bytes.
+        upload_id = getattr(uploaded, "file_id", None) or f"{uploaded.name}:{uploaded.size}"
+        cached = st.session_state.get("spooled_upload")
+        if cached and cached["upload_id"] == upload_id:
+            spooled = SpoolEntry.from_dict(cached["entry"])
+            if not get_spool().touch(spooled):
+                spooled = None
+        if spooled is None:
+            spooled = get_spool().add(uploaded, uploaded.name)
+            st.session_state.spooled_upload = {"upload_id": upload_id, "entry": spooled.to_dict()}
+
+        media_src = str(spooled.path)
         suffix = uploaded.name.split(".")[-1].lower()
 
         if suffix in ["mp4", "mov", "m4v", "avi", "mkv"]:
             file_type = "video"
-            st.video(file_bytes)
+            st.video(media_src)
         elif suffix in ["wav", "mp3"]:
             file_type = "audio"
-            st.audio(file_bytes)
+            st.audio(media_src)
         elif suffix in ["jpg", "jpeg", "png"]:
             file_type = "image"
-            st.image(file_bytes, width=700)
+            st.image(media_src, width=700)
+
+        # Have we analysed these exact bytes before? (no inference needed)
+        if config.HISTORY_ENABLED:
+            previous = get_history().seen(spooled.sha256)
+        if previous:
+            seen_at = datetime.fromtimestamp(previous["created_at"]).strftime("%Y-%m-%d %H:%M")
+            st.info(
+                f"Seen before: analysed on {seen_at} as "
+                f"**{str(previous['verdict']).upper()}** ({previous['confidence'] * 100:.1f}% confidence)."
+            )
+            open_previous = st.button("📂 Open previous result", use_container_width=True)
 
 # ======================
 # PIPELINE INFO
@@ -117,6 +146,21 @@ Short clips/images give the fastest results.
 # ======================
 # RUN BUTTON
 # ======================
+streaming = st.checkbox(
+    "Long media: analyze in segments (per-segment timeline, bounded memory)",
+    value=False,
+    disabled=(file_type == "image")
+)
+
+# Optional remote inference node (python -m src.service), so the models
+# do not share this process's cores and memory
+use_service = False
+if config.SERVICE_URL:
+    use_service = st.checkbox(
+        f"Run on inference service ({config.SERVICE_URL})",
+        value=True
+    )
+
 st.markdown('<div class="run-btn">', unsafe_allow_html=True)
 run = st.button(
     "🔍 Run Detection",
@@ -126,45 +170,108 @@ run = st.button(
 st.markdown('</div>', unsafe_allow_html=True)
 
 # ======================
-# RUN DETECTION
+# SUBMIT DETECTION JOB
 # ======================
+STAGE_PROGRESS = {
+    None: (0.05, "Queued..."),
+    "probing": (0.08, "Checking media..."),
+    "extracting": (0.15, "Extracting audio..."),
+    "features": (0.35, "Computing MFCC features..."),
+    "transcribing": (0.60, "Transcribing speech..."),
+    "scoring": (0.90, "Scoring..."),
+}
+
 if run and uploaded:
-    with tempfile.TemporaryDirectory() as td:
-        temp_path = Path(td) / uploaded.name
-        temp_path.write_bytes(file_bytes)
-
-        with st.spinner("Processing media..."):
-            result = predict_media(str(temp_path))
-
-        # ======================
-        # ✅ SAFE SAVE TO SESSION_STATE
-        # ======================
-        if not result or not isinstance(result, dict):
-            st.error(f"Prediction failed: invalid result returned -> {result}")
-            st.session_state.prediction = "Error"
-            st.session_state.confidence = 0.0
-            st.session_state.real_prob = 0.0
-            st.session_state.fake_prob = 0.0
-            st.session_state.media_type = file_type
-            st.session_state.meta = {}
+    # The job reads the spooled file, which outlives this script run
+    try:
+        if use_service:
+            st.session_state.job_id = ServiceClient(config.SERVICE_URL).submit_file(
+                spooled.path, filename=uploaded.name, streaming=streaming
+            )
         else:
-            st.session_state.prediction = result.get("label", "Unknown")
-            st.session_state.confidence = result.get("confidence", 0.0)
-            st.session_state.real_prob = result.get("real_prob", 0.0)
-            st.session_state.fake_prob = result.get("fake_prob", 0.0)
-            st.session_state.media_type = file_type
-
-            st.session_state.meta = {
-                "face_detected": file_type in ["image", "video"],
-                "audio_present": file_type in ["audio", "video"],
-                "voice_detected": file_type in ["audio", "video"],
-                "duration": result.get("duration", None)
-            }
-
-            st.session_state["result"] = result
-
-        # DEBUG: show result in Streamlit
-        st.write("Debug result:", result)
+            st.session_state.job_id = get_queue().submit(
+                str(spooled.path), name=uploaded.name, content_hash=spooled.sha256, streaming=streaming
+            )
+        st.session_state.job_remote = use_service
+        st.session_state.job_media_type = file_type
+        st.session_state.job_media_path = str(spooled.path)
+        st.session_state["result"] = None
+    except (QueueFull, ServiceBusy) as e:
+        st.error(f"Detection queue is busy: {e}")
+    except ServiceError as e:
+        st.error(f"Inference service unavailable: {e}")
+
+
+def save_result(result, file_type):
+    # ======================
+    # ✅ SAFE SAVE TO SESSION_STATE
+    # ======================
+    if not result or not isinstance(result, dict):
+        st.error(f"Prediction failed: invalid result returned -> {result}")
+        st.session_state.prediction = "Error"
+        st.session_state.confidence = 0.0
+        st.session_state.real_prob = 0.0
+        st.session_state.fake_prob = 0.0
+        st.session_state.media_type = file_type
+        st.session_state.meta = {}
+    else:
+        st.session_state.prediction = result.get("label", "Unknown")
+        st.session_state.confidence = result.get("confidence", 0.0)
+        st.session_state.real_prob = result.get("real_prob", 0.0)
+        st.session_state.fake_prob = result.get("fake_prob", 0.0)
+        st.session_state.media_type = file_type
+
+        st.session_state.meta = {
+            "face_detected": file_type in ["image", "video"],
+            "audio_present": file_type in ["audio", "video"],
+            "voice_detected": file_type in ["audio", "video"],
+            "duration": result.get("duration", None)
+        }
+
+        st.session_state["result"] = dict(
+            result,
+            media_type=file_type,
+            media_path=st.session_state.get("job_media_path"),
+        )
+
+    # DEBUG: show result in Streamlit
+    st.write("Debug result:", result)
+
+# ======================
+# REUSE A PREVIOUS RESULT
+# ======================
+if open_previous and previous:
+    entry = get_history().get(previous["id"])
+    st.session_state.job_media_path = str(spooled.path)
+    save_result(entry["result"], file_type)
+    st.switch_page("pages/2_Results.py")
+
+# ======================
+# POLL JOB STATUS
+# ======================
+job_id = st.session_state.get("job_id")
+if job_id:
+    if st.session_state.get("job_remote"):
+        try:
+            job = ServiceClient(config.SERVICE_URL).job(job_id)
+        except ServiceError as e:
+            job = {"status": FAILED, "error": str(e)}
+    else:
+        job = get_queue().get(job_id)
+    if job is None:
+        st.session_state.job_id = None
+    elif job["status"] == DONE:
+        st.session_state.job_id = None
+        save_result(job["result"], st.session_state.get("job_media_type"))
+    elif job["status"] == FAILED:
+        st.session_state.job_id = None
+        st.error(f"Prediction failed: {job['error']}")
+    else:
+        fraction, label = STAGE_PROGRESS.get(job["stage"], STAGE_PROGRESS[None])
+        st.progress(fraction, text=label)
+        st.caption("You can leave this page; the analysis keeps running.")
+        time.sleep(1.0)
+        st.rerun()
 
 # ======================
 # NAVIGATION
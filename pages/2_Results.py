@@ -1,8 +1,7 @@
 import streamlit as st
-from fpdf import FPDF
 from pathlib import Path
 from PIL import Image
-import tempfile
+from src.reports import EXPLANATION, cached_report, get_report
 
 st.set_page_config(page_title="Results", page_icon="📊", layout="wide")
 
@@ -61,12 +60,39 @@ st.markdown(f"""
   <div class="df-hr"></div>
   <b>Explanation</b><br>
   <span style="color: rgba(230,230,230,.78);">
-    Prediction is computed using your trained models.
-    {"For audio/video, features include transcription + MFCC; for images, a CNN/ViT model is applied."}
+    {EXPLANATION}
   </span>
 </div>
 """, unsafe_allow_html=True)
 
+# ======================
+# SEGMENT TIMELINE (streaming mode)
+# ======================
+segments = r.get("segments") or []
+if segments:
+    st.markdown("")
+    st.subheader("🕒 Segment Timeline")
+    st.caption("FAKE probability per analysis window (seconds from start).")
+    st.line_chart(
+        {
+            "start (s)": [s["start"] for s in segments],
+            "FAKE probability (%)": [s["prob_fake"] * 100.0 for s in segments],
+        },
+        x="start (s)"
+    )
+    st.dataframe(
+        [
+            {
+                "start (s)": s["start"],
+                "end (s)": s["end"],
+                "verdict": str(s["prediction"]).upper(),
+                "FAKE %": round(s["prob_fake"] * 100.0, 2),
+            }
+            for s in segments
+        ],
+        use_container_width=True
+    )
+
 # ======================
 # TRANSCRIPT
 # ======================
@@ -90,55 +116,19 @@ with col1:
 
 with col2:
     # ======================
-    # PDF REPORT GENERATION
+    # PDF REPORT (rendered on request, cached per result)
     # ======================
-    pdf_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-    pdf_path = Path(pdf_file.name)
-    
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", 'B', 16)
-    pdf.cell(0, 10, "Deepfake Detection Report", ln=True, align="C")
-    pdf.ln(10)
-    
-    # Prediction info
-    pdf.set_font("Arial", '', 12)
-    pdf.cell(0, 10, f"Prediction: {pred}", ln=True)
-    pdf.cell(0, 10, f"Confidence (predicted class): {conf:.2f}%", ln=True)
-    pdf.cell(0, 10, f"REAL probability: {p_real:.2f}%", ln=True)
-    pdf.cell(0, 10, f"FAKE probability: {p_fake:.2f}%", ln=True)
-    pdf.ln(5)
-    
-    # Explanation
-    pdf.multi_cell(0, 8, "Explanation:\n" +
-                   "Prediction is computed using your trained models. " +
-                   "For audio/video, features include transcription + MFCC; " +
-                   "for images, a CNN/ViT model is applied.")
-    pdf.ln(5)
-    
-    # Transcript
-    if transcript.strip():
-        pdf.multi_cell(0, 8, "Transcription:\n" + transcript)
-        pdf.ln(5)
-    
-    # Embed media in PDF
-    if media_type == "image" and media_path and Path(media_path).exists():
-        pdf.ln(5)
-        pdf.set_font("Arial", 'B', 12)
-        pdf.cell(0, 8, "Uploaded Image:", ln=True)
-        pdf.image(str(media_path), w=150)
-    elif media_type in ["video", "audio"] and media_path and Path(media_path).exists():
-        pdf.ln(5)
-        pdf.set_font("Arial", 'B', 12)
-        pdf.multi_cell(0, 8, f"Uploaded {media_type.capitalize()}: {Path(media_path).name}\n(Preview not embedded in PDF)")
-
-    # Save PDF
-    pdf.output(str(pdf_path))
-    
-    st.download_button(
-        label="⬇️ Download Report (PDF)",
-        data=pdf_path.read_bytes(),
-        file_name="deepfake_report.pdf",
-        mime="application/pdf",
-        use_container_width=True
-    )
+    pdf_bytes = cached_report(r)
+    if pdf_bytes is None:
+        if st.button("📄 Generate PDF Report", use_container_width=True):
+            with st.spinner("Rendering report..."):
+                get_report(r)
+            st.rerun()
+    else:
+        st.download_button(
+            label="⬇️ Download Report (PDF)",
+            data=pdf_bytes,
+            file_name="deepfake_report.pdf",
+            mime="application/pdf",
+            use_container_width=True
+        )
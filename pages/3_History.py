@@ -0,0 +1,98 @@
+import streamlit as st
+from datetime import datetime
+from src.history import get_history
+
+st.set_page_config(page_title="History", page_icon="🗂️", layout="wide")
+
+# ======================
+# LOAD CYBER CSS
+# ======================
+with open("assets/cyber.css") as f:
+    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+
+st.title("🗂️ Detection History")
+
+history = get_history()
+
+# ======================
+# FILTERS
+# ======================
+col1, col2, col3 = st.columns([1, 1, 1])
+with col1:
+    verdict = st.selectbox("Verdict", ["All"] + [v.upper() for v in history.verdicts()])
+with col2:
+    min_conf = st.slider("Minimum confidence (%)", 0, 100, 0, step=5)
+with col3:
+    page_size = st.selectbox("Rows per page", [25, 50, 100, 200], index=1)
+
+filters = {
+    "verdict": None if verdict == "All" else verdict.lower(),
+    "min_confidence": min_conf / 100.0 if min_conf else None,
+}
+
+# Keyset pagination: a stack of `before_id` cursors, reset when filters change
+filter_key = (filters["verdict"], filters["min_confidence"], page_size)
+if st.session_state.get("history_filters") != filter_key:
+    st.session_state.history_filters = filter_key
+    st.session_state.history_cursors = [None]
+
+cursors = st.session_state.history_cursors
+rows, next_before_id = history.query(before_id=cursors[-1], limit=page_size, **filters)
+
+# ======================
+# RESULTS TABLE
+# ======================
+st.caption(f"{history.count(**filters):,} matching detections • page {len(cursors)}")
+
+if not rows:
+    st.info("No detections recorded yet. Run an analysis on the Detection page.")
+    st.stop()
+
+st.dataframe(
+    [
+        {
+            "id": r["id"],
+            "analysed": datetime.fromtimestamp(r["created_at"]).strftime("%Y-%m-%d %H:%M:%S"),
+            "file": r["name"],
+            "type": r["media_type"],
+            "verdict": str(r["verdict"]).upper(),
+            "confidence %": round(r["confidence"] * 100.0, 2),
+            "FAKE %": round(r["prob_fake"] * 100.0, 2),
+            "sha256": r["content_hash"][:16],
+        }
+        for r in rows
+    ],
+    use_container_width=True,
+    hide_index=True
+)
+
+# ======================
+# PAGINATION
+# ======================
+nav1, nav2 = st.columns([1, 1])
+with nav1:
+    if st.button("⬅️ Newer", use_container_width=True, disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+with nav2:
+    if st.button("Older ➡️", use_container_width=True, disabled=next_before_id is None):
+        cursors.append(next_before_id)
+        st.rerun()
+
+# ======================
+# OPEN A RESULT
+# ======================
+st.markdown("")
+choice = st.selectbox(
+    "Open a detection",
+    [r["id"] for r in rows],
+    format_func=lambda i: next(f"#{r['id']} • {r['name']} • {str(r['verdict']).upper()}" for r in rows if r["id"] == i)
+)
+if st.button("📊 View in Results", use_container_width=True):
+    entry = history.get(choice)
+    st.session_state["result"] = dict(
+        entry["result"],
+        media_type=entry["media_type"],
+        media_path=entry["media_path"],
+    )
+    st.switch_page("pages/2_Results.py")
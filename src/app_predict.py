@@ -1,139 +1,678 @@
-import json
 import subprocess
-import tempfile
+import threading
 from pathlib import Path
 import mimetypes
 
 import numpy as np
-import librosa
-import joblib
-from scipy.sparse import hstack, csr_matrix
 
-import whisper  # Python API (reliable on Streamlit Cloud)
+# whisper (and torch), librosa, scipy and sklearn are imported on first use,
+# so importing this module stays cheap for Streamlit pages.
+from src import asr
+from src import cascade as cascade_mod
+from src import config
+from src import image_model
+from src import instrument
+from src import probe as probe_mod
+from src import stages
+from src import vad
+from src.fast_scorer import LinearScorer
+from src.mfcc import MfccEngine
+from src.model_registry import ModelRegistry
+from src.result_cache import ResultCache, cache_key, sha256_file
+from src.transcript_cache import TranscriptCache, fingerprint
 
 # Paths and model cache
-MODEL_DIR = Path("models/best_text_audio_mfcc")
-_WHISPER_MODEL = None
+MODEL_DIR = Path(config.MODEL_DIR)
+WHISPER_MODEL_NAME = config.WHISPER_MODEL
+WHISPER_ENGINE = asr.resolve_engine(config.WHISPER_BACKEND)
+_REGISTRY = ModelRegistry(
+    MODEL_DIR, optional_files=(cascade_mod.AUDIO_ONLY_FILE, image_model.IMAGE_MODEL_FILE)
+)
+_RESULT_CACHE = ResultCache(
+    config.CACHE_ROOT / "results",
+    memory_items=config.RESULT_CACHE_MEMORY_ITEMS,
+    max_bytes=config.RESULT_CACHE_MAX_MB * 1024 * 1024,
+)
+_TRANSCRIPT_CACHE = None  # created on first use; opening it creates the SQLite file
+_TRANSCRIPT_CACHE_LOCK = threading.Lock()
+_FAST_SCORER = (None, None)  # (bundle fingerprint, LinearScorer or None)
+_MFCC_ENGINES = {}  # (sr, n_mfcc) -> MfccEngine
+_WHISPER_BACKEND = None
+_WHISPER_LOCK = threading.Lock()
+_WARM_UP_THREAD = None
+_WARM_UP_LOCK = threading.Lock()
 
 # ----------------------- Load Models -----------------------
 def load_bundle():
-    vec = joblib.load(MODEL_DIR / "tfidf_vectorizer.joblib")
-    scaler = joblib.load(MODEL_DIR / "audio_scaler.joblib")
-    clf = joblib.load(MODEL_DIR / "logreg_model.joblib")
-    meta = json.loads((MODEL_DIR / "meta.json").read_text(encoding="utf-8"))
-    return vec, scaler, clf, meta
+    """Return the shared (vec, scaler, clf, meta) bundle, loaded once per process."""
+    with instrument.stage("bundle_load"):
+        return _REGISTRY.get()
+
+
+def load_whisper() -> asr.TranscriptionBackend:
+    """Load the configured transcription backend once per process."""
+    global _WHISPER_BACKEND
+    if _WHISPER_BACKEND is None:
+        with _WHISPER_LOCK, instrument.stage("whisper_load"):
+            if _WHISPER_BACKEND is None:
+                backend = asr.create_backend(WHISPER_ENGINE, WHISPER_MODEL_NAME, config.WHISPER_THREADS)
+                _WHISPER_BACKEND = backend.load()
+    return _WHISPER_BACKEND
+
+
+def asr_info() -> dict:
+    """Engine, model size and load time of the transcription backend."""
+    if _WHISPER_BACKEND is None:
+        return {"engine": WHISPER_ENGINE, "model": WHISPER_MODEL_NAME, "load_s": None}
+    return _WHISPER_BACKEND.info()
+
+
+def warm_up(include_whisper: bool = False) -> dict:
+    """Load models ahead of the first request and report load timings."""
+    load_bundle()
+    import librosa  # noqa: F401  (pays the import cost here instead of on the first request)
+    import scipy.sparse  # noqa: F401
+    if include_whisper:
+        load_whisper()
+    return model_stats()
+
+
+def warm_up_async(include_whisper: bool = False) -> threading.Thread:
+    """Start warm_up() on a background thread (once per process)."""
+    global _WARM_UP_THREAD
+    with _WARM_UP_LOCK:
+        if _WARM_UP_THREAD is None:
+            _WARM_UP_THREAD = threading.Thread(
+                target=warm_up, kwargs={"include_whisper": include_whisper},
+                name="deepfake-warm-up", daemon=True,
+            )
+            _WARM_UP_THREAD.start()
+    return _WARM_UP_THREAD
+
+
+def model_stats() -> dict:
+    stats = _REGISTRY.stats()
+    stats["whisper"] = dict(asr_info(), loaded=_WHISPER_BACKEND is not None)
+    stats["result_cache"] = _RESULT_CACHE.stats()
+    stats["transcript_cache"] = _TRANSCRIPT_CACHE.stats() if _TRANSCRIPT_CACHE is not None else None
+    return stats
+
+
+def result_cache_key(file_path, content_hash: str = None, variant: str = "") -> str:
+    """Cache key for a media file under the currently loaded models."""
+    content_hash = content_hash or sha256_file(file_path)
+    asr_id = f"{WHISPER_ENGINE}:{WHISPER_MODEL_NAME}"
+    return cache_key(content_hash, _REGISTRY.fingerprint(), asr_id, variant)
 
 # ----------------------- Audio Extraction -----------------------
-def run_ffmpeg_extract_audio(video_path: str, wav_out: str):
-    """Extract audio from video and convert to 16kHz mono WAV."""
-    cmd = ["ffmpeg", "-y", "-i", video_path, "-ac", "1", "-ar", "16000", wav_out]
-    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+WHISPER_SR = 16000  # Whisper always consumes 16 kHz mono float32
+
+
+def decode_audio(media_path: str, sr: int = WHISPER_SR) -> np.ndarray:
+    """
+    Decode any audio/video file to a mono float32 waveform in one ffmpeg pass.
+
+    Samples are piped from ffmpeg stdout as 16-bit PCM (the same format the
+    old WAV round-trip produced, and what Whisper's own loader uses), so no
+    temp file is written. Output is capped at DEEPFAKE_MAX_DURATION_S even
+    if the container misreports its length, and ffmpeg is killed when the
+    job deadline passes.
+    """
+    cmd = [
+        "ffmpeg", "-nostdin", "-i", str(media_path),
+        "-vn", "-ac", "1", "-ar", str(sr), "-t", str(config.MAX_DURATION_S),
+        "-f", "s16le", "-acodec", "pcm_s16le", "-",
+    ]
+    with instrument.stage("ffmpeg_extract"):
+        proc = probe_mod.run_limited(
+            cmd, "audio extraction", check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+    return np.frombuffer(proc.stdout, dtype=np.int16).astype(np.float32) / 32768.0
 
 # ----------------------- Whisper Transcription -----------------------
-def run_whisper_transcribe(wav_path: str) -> str:
-    """Transcribe audio using OpenAI Whisper."""
-    global _WHISPER_MODEL
-    if _WHISPER_MODEL is None:
-        _WHISPER_MODEL = whisper.load_model("base")  # Load once per process
+def run_whisper_transcribe(audio) -> str:
+    """
+    Transcribe audio with the configured Whisper backend (file path or 16 kHz float32 array).
+
+    A running Whisper call cannot be interrupted, so arrays longer than
+    DEEPFAKE_TRANSCRIBE_WINDOW_S are transcribed window by window and the
+    job deadline is checked before each one.
+    """
+    backend = load_whisper()
+    window = int(config.TRANSCRIBE_WINDOW_S * WHISPER_SR)
+    if isinstance(audio, (str, Path)) or window <= 0:
+        chunks = [audio]
+    else:
+        chunks = [audio[i:i + window] for i in range(0, max(len(audio), 1), window)]
+
+    texts = []
+    for chunk in chunks:
+        probe_mod.check_deadline("transcription")
+        try:
+            with instrument.stage("transcribe"):
+                texts.append(backend.transcribe(chunk))
+        except Exception:
+            return ""
+    return " ".join(t for t in texts if t)
+
+
+def transcribe_speech(y: np.ndarray, use_vad: bool = None):
+    """
+    Transcribe a 16 kHz waveform, passing only its speech regions to Whisper.
+
+    Returns (transcript, vad_info); vad_info is None when VAD is disabled.
+    Files with no detected speech skip Whisper entirely.
+    """
+    if use_vad is None:
+        use_vad = config.VAD_ENABLED
+    if not use_vad:
+        return run_whisper_transcribe(y), None
+
+    with instrument.stage("vad"):
+        segments = vad.detect_speech(y, WHISPER_SR, backend=config.VAD_BACKEND)
+    info = vad.summarize(segments, len(y) / WHISPER_SR)
+    if not segments:
+        return "", info
+    return run_whisper_transcribe(vad.speech_only(y, WHISPER_SR, segments)), info
+
+
+def get_transcript_cache() -> TranscriptCache:
+    """The process-wide transcript cache, opened on first use so importing this module stays disk-free."""
+    global _TRANSCRIPT_CACHE
+    with _TRANSCRIPT_CACHE_LOCK:
+        if _TRANSCRIPT_CACHE is None:
+            _TRANSCRIPT_CACHE = TranscriptCache(
+                config.CACHE_ROOT / "transcripts.sqlite3",
+                max_bytes=config.TRANSCRIPT_CACHE_MAX_MB * 1024 * 1024,
+                max_ber=config.TRANSCRIPT_CACHE_MAX_BER,
+            )
+        return _TRANSCRIPT_CACHE
+
+
+def transcript_source() -> str:
+    """Identifies what produced a transcript: engine, model and VAD setting."""
+    vad_id = f"{config.VAD_BACKEND}.v{vad.VAD_VERSION}" if config.VAD_ENABLED else "off"
+    return f"{WHISPER_ENGINE}:{WHISPER_MODEL_NAME}|vad={vad_id}|window={config.TRANSCRIBE_WINDOW_S:g}"
+
+
+def transcribe_cached(y: np.ndarray, use_cache: bool = None):
+    """
+    transcribe_speech() behind the fingerprint-keyed transcript cache.
+
+    Returns (transcript, vad_info, hit). The same audio re-encoded or
+    re-wrapped in another container reuses the stored transcript.
+    """
+    if use_cache is None:
+        use_cache = config.TRANSCRIPT_CACHE_ENABLED
+    if not use_cache:
+        return (*transcribe_speech(y), False)
+
+    asr_id = transcript_source()
+    duration = len(y) / WHISPER_SR
+    with instrument.stage("fingerprint"):
+        fp = fingerprint(y, WHISPER_SR)
+        hit = get_transcript_cache().get(fp, duration, asr_id)
+    if hit is not None:
+        transcript, stored = hit
+        return transcript, stored.get("vad"), True
+
+    transcript, vad_info = transcribe_speech(y)
+    get_transcript_cache().put(fp, duration, asr_id, transcript, {"vad": vad_info})
+    return transcript, vad_info, False
+
+# ----------------------- MFCC Feature Extraction -----------------------
+def mfcc_engine(sr: int, n_mfcc: int) -> MfccEngine:
+    """Shared MfccEngine for the bundle's `sr`/`n_mfcc` (mel filterbank and DCT built once)."""
+    key = (int(sr), int(n_mfcc))
+    engine = _MFCC_ENGINES.get(key)
+    if engine is None:
+        engine = _MFCC_ENGINES[key] = MfccEngine(*key, fft_workers=config.MFCC_FFT_WORKERS)
+    return engine
+
+
+def _resample(y: np.ndarray, audio_sr: int, sr: int) -> np.ndarray:
+    import librosa
+
+    if audio_sr == sr or not y.size:
+        return y
+    with instrument.stage("resample"):
+        return librosa.resample(y, orig_sr=audio_sr, target_sr=sr)
+
+
+def mfcc_stats(audio, sr: int, n_mfcc: int, audio_sr: int = WHISPER_SR) -> np.ndarray:
+    """
+    Extract MFCC features: mean + std per coefficient, as `librosa.feature.mfcc`.
+
+    `audio` is either a file path or a waveform already decoded at `audio_sr`.
+    """
+    if isinstance(audio, np.ndarray):
+        y = _resample(audio, audio_sr, sr)
+    else:
+        import librosa
+
+        with instrument.stage("librosa_decode"):
+            y, sr = librosa.load(audio, sr=sr, mono=True)
+    with instrument.stage("mfcc"):
+        return mfcc_engine(sr, n_mfcc).stats(y)
+
+
+def mfcc_stats_batch(waveforms, sr: int, n_mfcc: int, audio_sr: int = WHISPER_SR) -> np.ndarray:
+    """mfcc_stats() for many waveforms decoded at `audio_sr`, in one stacked pass: (n, 2 * n_mfcc)."""
+    ys = [_resample(y, audio_sr, sr) for y in waveforms]
+    with instrument.stage("mfcc"):
+        return mfcc_engine(sr, n_mfcc).stats_batch(ys)
+
+# ----------------------- Audio/Video Prediction -----------------------
+def cascade_decision(feat: np.ndarray):
+    """Stage-1 audio-only decision; always escalates when no companion model is installed."""
+    model = _REGISTRY.extra(cascade_mod.AUDIO_ONLY_FILE)
+    if model is None:
+        return {"path": "full", "stage1_prob_fake": None, "reason": "no audio-only model"}
+    scaler = load_bundle()[1]
+    prob_fake = cascade_mod.audio_only_prob_fake(model, scaler, feat)[0]
+    return cascade_mod.decide(prob_fake, config.CASCADE_LOW, config.CASCADE_HIGH)
+
+
+def extract_audio_features(media_path: str, meta: dict, cascade: bool = False):
+    """
+    Decode the audio track once and return (transcript, MFCC vector, extras).
+
+    `extras` holds the blocks to merge into the result (`cascade`, `vad`).
+    With `cascade=True` the MFCC vector is scored by the audio-only model
+    first; when that is confident, Whisper is skipped and transcript is None.
+    """
+    y, extras = decode_track(media_path)
+    stages.report("features")
+    feat = mfcc_stats(y, sr=int(meta["sr"]), n_mfcc=int(meta["n_mfcc"]))
+    return transcribe_track(y, feat, extras, cascade)
+
+
+def decode_track(media_path: str):
+    """Decode the audio track at Whisper's rate: (waveform, extras with `duration`)."""
+    stages.report("extracting")
+    y = decode_audio(media_path, sr=WHISPER_SR)
+    return y, {"duration": round(len(y) / WHISPER_SR, 3)}
+
+
+def transcribe_track(y: np.ndarray, feat: np.ndarray, extras: dict, cascade: bool = False):
+    """Second half of extract_audio_features(), once the MFCC vector is known."""
+    if cascade:
+        extras["cascade"] = cascade_decision(feat)
+        if extras["cascade"]["path"] == "audio_only":
+            return None, feat, extras
+
+    stages.report("transcribing")
+    transcript, vad_info, cache_hit = transcribe_cached(y)
+    extras["asr"] = dict(asr_info(), transcript_cached=cache_hit)
+    if vad_info is not None:
+        extras["vad"] = vad_info
+    return transcript, feat, extras
+
+
+def _finish_audio_result(result: dict, extras: dict, meta: dict) -> dict:
+    decision = extras.get("cascade")
+    if decision is not None and decision["path"] == "audio_only":
+        inv = {int(k): v for k, v in meta["inverse_label_map"].items()}
+        result = cascade_mod.audio_only_result(decision, inv)
+    result.update(extras)
+    return result
+
+
+def fast_scorer():
+    """LinearScorer for the current bundle (rebuilt after a reload), or None when not applicable."""
+    global _FAST_SCORER
+    bundle = load_bundle()
+    fingerprint = _REGISTRY.fingerprint()
+    if _FAST_SCORER[0] != fingerprint:
+        _FAST_SCORER = (fingerprint, LinearScorer.from_bundle(*bundle[:3]))
+    return _FAST_SCORER[1]
+
+
+def score_features(transcripts, audio_feats, fast: bool = None):
+    """
+    Score many (transcript, MFCC vector) pairs as one sparse batch.
+
+    With `fast=True` (default: DEEPFAKE_FAST_SCORER) a binary logistic
+    regression is scored by `LinearScorer` instead of stacking the features
+    and calling sklearn; other classifiers always take the sklearn path.
+    """
+    if fast is None:
+        fast = config.FAST_SCORER_ENABLED
+
+    stages.report("scoring")
+    vec, scaler, clf, meta = load_bundle()
+    inv = {int(k): v for k, v in meta["inverse_label_map"].items()}
+    scorer = fast_scorer() if fast else None
+
+    if scorer is not None:
+        with instrument.stage("vectorize"):
+            X_text = vec.transform(list(transcripts))
+        with instrument.stage("predict"):
+            proba = scorer.predict_proba(X_text, np.vstack(audio_feats))
+    else:
+        from scipy.sparse import hstack, csr_matrix
+
+        with instrument.stage("vectorize"):
+            X_text = vec.transform(list(transcripts))
+            x_audio_s = scaler.transform(np.vstack(audio_feats))
+            X = hstack([X_text, csr_matrix(x_audio_s)]).tocsr()
+        with instrument.stage("predict"):
+            proba = clf.predict_proba(X)
+    pred_idx = proba.argmax(axis=1)
+
+    results = []
+    for i, transcript in enumerate(transcripts):
+        idx = int(pred_idx[i])
+        results.append({
+            "prediction": inv[idx],
+            "confidence": float(proba[i, idx]),
+            "prob_real": float(proba[i, 0]),
+            "prob_fake": float(proba[i, 1]),
+            "transcript": transcript
+        })
+    return results
+
+
+def record_features(rows, meta: dict):
+    """Keep (content_hash, transcript, MFCC vector) rows in the feature store for later re-scoring."""
+    if not config.FEATURE_STORE_ENABLED:
+        return
+    from src.feature_store import get_store
 
     try:
-        res = _WHISPER_MODEL.transcribe(wav_path, fp16=False, language="en", task="transcribe")
-        return (res.get("text") or "").strip()
+        with instrument.stage("feature_store"):
+            get_store().record_many(rows, int(meta["sr"]), int(meta["n_mfcc"]), transcript_source())
     except Exception:
-        return ""
+        pass  # the store only serves re-scoring; never fail a prediction over it
+
+
+def predict_audio_track(media_path: str, cascade: bool = False, content_hash: str = None):
+    """Decode the audio track once and score transcript + MFCC features."""
+    meta = load_bundle()[3]
+    transcript, feat, extras = extract_audio_features(media_path, meta, cascade)
+    if config.FEATURE_STORE_ENABLED:
+        record_features([(content_hash or sha256_file(media_path), transcript, feat)], meta)
+    if transcript is None:
+        return _finish_audio_result(None, extras, meta)
+    result = score_features([transcript], [feat])[0]
+    return _finish_audio_result(result, extras, meta)
+
 
-# ----------------------- MFCC Feature Extraction -----------------------
-def mfcc_stats(wav_path: str, sr: int, n_mfcc: int) -> np.ndarray:
-    """Extract MFCC features: mean + std per coefficient."""
-    y, sr = librosa.load(wav_path, sr=sr, mono=True)
-    if y is None or y.size == 0:
-        return np.zeros(n_mfcc * 2, dtype=np.float32)
-    mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=n_mfcc)
-    feat = np.concatenate([mfcc.mean(axis=1), mfcc.std(axis=1)], axis=0)
-    return feat.astype(np.float32)
-
-# ----------------------- Video Prediction -----------------------
 def predict_video(video_file_path: str):
     """Predict fake/real for a video file."""
-    vec, scaler, clf, meta = load_bundle()
-    sr = int(meta["sr"])
-    n_mfcc = int(meta["n_mfcc"])
-    inv = {int(k): v for k, v in meta["inverse_label_map"].items()}
+    return predict_audio_track(video_file_path)
 
-    with tempfile.TemporaryDirectory() as td:
-        wav_path = str(Path(td) / "audio.wav")
-        run_ffmpeg_extract_audio(video_file_path, wav_path)
+# ----------------------- Image Prediction -----------------------
+def predict_images(paths):
+    """
+    Score image files as one batch with the frequency-domain image model.
 
-        transcript = run_whisper_transcribe(wav_path)
-        X_text = vec.transform([transcript])
+    Returns the placeholder "unknown" result for every path when no
+    image model is installed next to the bundle.
+    """
+    model = _REGISTRY.extra(image_model.IMAGE_MODEL_FILE)
+    if model is None:
+        return [_image_placeholder() for _ in paths]
+    inv = {int(k): v for k, v in load_bundle()[3]["inverse_label_map"].items()}
 
-        x_audio = mfcc_stats(wav_path, sr=sr, n_mfcc=n_mfcc).reshape(1, -1)
-        x_audio_s = scaler.transform(x_audio)
+    stages.report("features")
+    with instrument.stage("image_features"):
+        feats = image_model.image_features([str(p) for p in paths], model.get("size", image_model.IMAGE_SIZE))
+    stages.report("scoring")
+    with instrument.stage("predict"):
+        proba = model["pipeline"].predict_proba(feats)
+    return [image_model.image_result(float(p[1]), inv) for p in proba]
 
-        X = hstack([X_text, csr_matrix(x_audio_s)])
-        proba = clf.predict_proba(X)[0]
-        pred_idx = int(np.argmax(proba))
-        pred_label = inv[pred_idx]
 
-        return {
-            "prediction": pred_label,
-            "confidence": float(proba[pred_idx]),
-            "prob_real": float(proba[0]),
-            "prob_fake": float(proba[1]),
-            "transcript": transcript
-        }
+def predict_image(image_path: str):
+    return predict_images([image_path])[0]
 
 # ----------------------- Generic Media Prediction -----------------------
-def predict_media(file_path: str):
+def media_kind(file_path) -> str:
+    """Map a file name to 'video', 'audio' or 'image' via its MIME type."""
+    mime_type, _ = mimetypes.guess_type(str(file_path))
+
+    if mime_type is None:
+        raise ValueError(f"Could not determine MIME type of {file_path}")
+
+    for kind in ("video", "audio", "image"):
+        if mime_type.startswith(kind):
+            return kind
+    raise ValueError(f"Unsupported file type: {mime_type}")
+
+
+def _image_placeholder():
+    # Returned for images when no image model is installed
+    return {
+        "prediction": "unknown",
+        "confidence": 0.0,
+        "prob_real": 0.0,
+        "prob_fake": 0.0,
+        "transcript": ""
+    }
+
+
+def predict_media(file_path: str, use_cache: bool = None, content_hash: str = None,
+                  streaming: bool = False, cascade: bool = None, timings: bool = None):
     """
     Detects media type and runs appropriate prediction:
     - video: extract audio + transcribe + audio features
     - audio: transcribe + audio features
-    - image: placeholder (extend with image model if available)
+    - image: frequency-domain image model ("unknown" if none is installed)
+
+    With `streaming=True`, audio/video is analysed in fixed windows with
+    bounded memory and the result gains per-window `segments`.
+
+    With `cascade=True` (default: DEEPFAKE_CASCADE), an audio-only model
+    scores the MFCC features first and Whisper runs only when that score is
+    uncertain; the result's `cascade` block records the path taken.
+
+    Results are cached on the SHA-256 of the file bytes plus the model
+    fingerprint; pass `content_hash` if the caller already hashed the upload.
+
+    With `timings=True` (default: DEEPFAKE_TIMINGS), the result gains a
+    `timings` block with wall time, CPU time and peak RSS per
+    stage. The process-wide stage totals behind /metrics are kept either way.
     """
-    file_path = Path(file_path)
-    mime_type, _ = mimetypes.guess_type(file_path)
-    
-    if mime_type is None:
-        raise ValueError(f"Could not determine MIME type of {file_path}")
+    if timings is None:
+        timings = config.TIMINGS_ENABLED
+    if not timings:
+        return _predict_media(file_path, use_cache, content_hash, streaming, cascade)
 
-    if mime_type.startswith("video"):
-        return predict_video(str(file_path))
+    with instrument.tracing() as trace:
+        with instrument.stage("total"):
+            result = _predict_media(file_path, use_cache, content_hash, streaming, cascade)
+    summary = trace.summary()
+    result["timings"] = summary
+    if config.TRACE_FILE:
+        instrument.append_trace(config.TRACE_FILE, summary, path=str(file_path),
+                                cached=result.get("cached", False))
+    return result
 
-    elif mime_type.startswith("audio"):
-        vec, scaler, clf, meta = load_bundle()
-        sr = int(meta["sr"])
-        n_mfcc = int(meta["n_mfcc"])
-        inv = {int(k): v for k, v in meta["inverse_label_map"].items()}
 
-        transcript = run_whisper_transcribe(str(file_path))
-        X_text = vec.transform([transcript])
+def _predict_media(file_path, use_cache, content_hash, streaming, cascade):
+    if use_cache is None:
+        use_cache = config.RESULT_CACHE_ENABLED
+    if cascade is None:
+        cascade = config.CASCADE_ENABLED
+    if not use_cache:
+        return _predict_media_uncached(file_path, streaming, cascade, content_hash)
 
-        x_audio = mfcc_stats(str(file_path), sr=sr, n_mfcc=n_mfcc).reshape(1, -1)
-        x_audio_s = scaler.transform(x_audio)
+    variant = _cache_variant(streaming, cascade)
+    with instrument.stage("cache_lookup"):
+        content_hash = content_hash or sha256_file(file_path)
+        key = result_cache_key(file_path, content_hash, variant)
+        cached = _RESULT_CACHE.get(key)
+    if cached is not None:
+        cached["cached"] = True
+        return cached
 
-        X = hstack([X_text, csr_matrix(x_audio_s)])
-        proba = clf.predict_proba(X)[0]
-        pred_idx = int(np.argmax(proba))
-        pred_label = inv[pred_idx]
+    result = _predict_media_uncached(file_path, streaming, cascade, content_hash)
+    return _store_result(key, content_hash, result)
 
-        return {
-            "prediction": pred_label,
-            "confidence": float(proba[pred_idx]),
-            "prob_real": float(proba[0]),
-            "prob_fake": float(proba[1]),
-            "transcript": transcript
-        }
-
-    elif mime_type.startswith("image"):
-        # Placeholder for image predictions
-        return {
-            "prediction": "unknown",
-            "confidence": 0.0,
-            "prob_real": 0.0,
-            "prob_fake": 0.0,
-            "transcript": ""
-        }
 
-    else:
-        raise ValueError(f"Unsupported file type: {mime_type}")
+def _cache_variant(streaming: bool, cascade: bool) -> str:
+    parts = [f"vad:{config.VAD_BACKEND}.v{vad.VAD_VERSION}" if config.VAD_ENABLED else "vad:off"]
+    parts.append(f"window:{config.TRANSCRIBE_WINDOW_S:g}")
+    if streaming:
+        parts.append(f"stream:{config.STREAM_WINDOW_S}")
+    elif cascade:
+        parts.append(f"cascade:{config.CASCADE_LOW}-{config.CASCADE_HIGH}")
+    return ";".join(parts)
+
+
+def _store_result(key: str, content_hash: str, result: dict) -> dict:
+    result["content_hash"] = content_hash
+    _RESULT_CACHE.put(key, result)
+    result = dict(result)
+    result["cached"] = False
+    return result
+
+
+def admit_media(file_path, kind: str) -> dict:
+    """Probe container metadata and apply the admission limits (raises probe.MediaRejected)."""
+    stages.report("probing")
+    with instrument.stage("probe"):
+        return probe_mod.admit(str(file_path), kind)
+
+
+def _with_media(result: dict, info: dict) -> dict:
+    if info.get("duration") is not None:
+        result.setdefault("duration", round(info["duration"], 3))
+    if info.get("probed"):
+        result["media"] = probe_mod.media_summary(info)
+    return result
+
+
+def _predict_media_uncached(file_path: str, streaming: bool = False, cascade: bool = False,
+                            content_hash: str = None):
+    kind = media_kind(file_path)
+    with probe_mod.deadline(config.JOB_TIMEOUT_S):
+        info = admit_media(file_path, kind)
+        if kind == "image":
+            result = predict_image(str(file_path))
+        elif not info["has_audio"]:
+            result = probe_mod.no_audio_result()  # nothing to decode or transcribe
+        elif streaming:
+            from src.streaming import analyze_stream
+            result = analyze_stream(str(file_path), window_s=config.STREAM_WINDOW_S)
+        else:
+            result = predict_audio_track(str(file_path), cascade=cascade, content_hash=content_hash)
+    return _with_media(result, info)
+
+# ----------------------- Batch Prediction -----------------------
+def predict_media_batch(paths, use_cache: bool = None, cascade: bool = None):
+    """
+    Predict many files at once, returning one dict per path in input order.
+
+    Decoding and transcription still run per file, but MFCC extraction
+    runs over all decoded tracks at once (in groups of up to
+    DEEPFAKE_MFCC_BATCH_S seconds of audio), and TF-IDF, scaling and the
+    classifier run once over the whole batch; images are decoded into
+    one array and scored together. A file that fails yields
+    {"error": ..., "path": ...} instead of aborting the batch.
+    """
+    if use_cache is None:
+        use_cache = config.RESULT_CACHE_ENABLED
+    if cascade is None:
+        cascade = config.CASCADE_ENABLED
+    variant = _cache_variant(False, cascade)
+
+    results = [None] * len(paths)
+    pending = []  # (index, cache key, content hash, path, transcript, feat, extras)
+    images = []   # (index, cache key, content hash, path, probe info)
+    decoded = []  # (index, cache key, content hash, path, probe info, waveform, extras, deadline)
+    features = []  # (content hash, transcript, feat) for the feature store
+    meta = load_bundle()[3]
+
+    def finish(i, key, content_hash, result):
+        results[i] = _store_result(key, content_hash, result) if use_cache else result
+
+    def flush_decoded():
+        # MFCCs for every decoded track in one stacked pass, then cascade/Whisper per file
+        stages.report("features")
+        sr, n_mfcc = int(meta["sr"]), int(meta["n_mfcc"])
+        try:
+            feats = mfcc_stats_batch([d[5] for d in decoded], sr, n_mfcc)
+        except Exception:
+            feats = [None] * len(decoded)  # one bad track: fall back to one at a time
+        for (i, key, content_hash, path, info, y, extras, end), feat in zip(decoded, feats):
+            try:
+                if feat is None:
+                    feat = mfcc_stats(y, sr, n_mfcc)
+                with probe_mod.resume_deadline(end):
+                    transcript, feat, extras = transcribe_track(y, feat, extras, cascade)
+                if config.FEATURE_STORE_ENABLED:
+                    features.append((content_hash or sha256_file(path), transcript, feat))
+                if transcript is None:
+                    finish(i, key, content_hash, _with_media(_finish_audio_result(None, extras, meta), info))
+                    continue
+                extras["media_info"] = info
+                pending.append((i, key, content_hash, path, transcript, feat, extras))
+            except Exception as e:
+                results[i] = {"error": f"{type(e).__name__}: {e}", "path": path}
+        decoded.clear()
+
+    decoded_samples = 0
+    for i, path in enumerate(paths):
+        try:
+            kind = media_kind(path)
+            key = content_hash = None
+            if use_cache:
+                content_hash = sha256_file(path)
+                key = result_cache_key(path, content_hash, variant)
+                cached = _RESULT_CACHE.get(key)
+                if cached is not None:
+                    cached["cached"] = True
+                    results[i] = cached
+                    continue
+
+            with probe_mod.deadline(config.JOB_TIMEOUT_S):
+                info = admit_media(path, kind)
+                if kind == "image":
+                    images.append((i, key, content_hash, str(path), info))
+                    continue
+                if not info["has_audio"]:
+                    finish(i, key, content_hash, _with_media(probe_mod.no_audio_result(), info))
+                    continue
+                y, extras = decode_track(str(path))
+                decoded.append((i, key, content_hash, str(path), info, y, extras, probe_mod.current_deadline()))
+        except Exception as e:
+            results[i] = {"error": f"{type(e).__name__}: {e}", "path": str(path)}
+            continue
+
+        # Bound the decoded audio held at once; long files flush early
+        decoded_samples += len(decoded[-1][5])
+        if decoded_samples >= config.MFCC_BATCH_S * WHISPER_SR:
+            flush_decoded()
+            decoded_samples = 0
+    if decoded:
+        flush_decoded()
+
+    record_features(features, meta)
+
+    if images:
+        try:
+            scored = predict_images([p[3] for p in images])
+        except Exception:
+            scored = [None] * len(images)  # one unreadable image: fall back to one at a time
+        for (i, key, content_hash, path, info), result in zip(images, scored):
+            try:
+                finish(i, key, content_hash, _with_media(result or predict_image(path), info))
+            except Exception as e:
+                results[i] = {"error": f"{type(e).__name__}: {e}", "path": path}
+
+    if pending:
+        try:
+            scored = score_features([p[4] for p in pending], [p[5] for p in pending])
+        except Exception:
+            scored = [None] * len(pending)  # one bad transcript/vector: fall back to one at a time
+        for (i, key, content_hash, path, transcript, feat, extras), result in zip(pending, scored):
+            try:
+                result = result or score_features([transcript], [feat])[0]
+                info = extras.pop("media_info")
+                finish(i, key, content_hash, _with_media(_finish_audio_result(result, extras, meta), info))
+            except Exception as e:
+                results[i] = {"error": f"{type(e).__name__}: {e}", "path": path}
+
+    return results
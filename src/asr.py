@@ -0,0 +1,116 @@
+import importlib.util
+import time
+
+# ----------------------- Transcription Backends -----------------------
+class TranscriptionBackend:
+    """Loads a speech model once and turns 16 kHz mono float32 audio into text."""
+
+    engine = "base"
+
+    def __init__(self, model_size: str = "base", threads: int = 0):
+        self.model_size = model_size
+        self.threads = threads
+        self.load_s = None
+        self._model = None
+
+    def load(self):
+        if self._model is None:
+            t0 = time.perf_counter()
+            self._model = self._load()
+            self.load_s = time.perf_counter() - t0
+        return self
+
+    def _load(self):
+        raise NotImplementedError
+
+    def transcribe(self, audio) -> str:
+        raise NotImplementedError
+
+    def info(self) -> dict:
+        return {"engine": self.engine, "model": self.model_size, "load_s": self.load_s}
+
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    """Reference openai-whisper path (fp32 on CPU)."""
+
+    engine = "openai"
+
+    def _load(self):
+        import torch
+        import whisper  # Python API (reliable on Streamlit Cloud)
+
+        if self.threads:
+            torch.set_num_threads(self.threads)
+        return whisper.load_model(self.model_size, device="cpu")
+
+    def transcribe(self, audio) -> str:
+        res = self._model.transcribe(audio, fp16=False, language="en", task="transcribe")
+        return (res.get("text") or "").strip()
+
+
+class OpenAIWhisperInt8Backend(OpenAIWhisperBackend):
+    """openai-whisper with Linear layers dynamically quantized to int8."""
+
+    engine = "openai-int8"
+
+    def _load(self):
+        import torch
+
+        model = super()._load()
+        # whisper's Linear subclass only adds dtype casting for fp16; quantize_dynamic
+        # matches exact types, so present them as plain nn.Linear first.
+        for module in model.modules():
+            if isinstance(module, torch.nn.Linear):
+                module.__class__ = torch.nn.Linear
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    """CTranslate2 engine from the `faster-whisper` package, int8 on CPU."""
+
+    engine = "faster-whisper"
+
+    def _load(self):
+        from faster_whisper import WhisperModel
+
+        return WhisperModel(self.model_size, device="cpu", compute_type="int8", cpu_threads=self.threads)
+
+    def transcribe(self, audio) -> str:
+        # beam_size=1 matches openai-whisper's default greedy decoding
+        segments, _ = self._model.transcribe(audio, language="en", task="transcribe", beam_size=1)
+        return "".join(seg.text for seg in segments).strip()
+
+
+class StubBackend(TranscriptionBackend):
+    """Fixed transcript, no model; for benchmarks and offline runs."""
+
+    engine = "stub"
+
+    def _load(self):
+        return object()
+
+    def transcribe(self, audio) -> str:
+        return "this is a synthetic benchmark clip"
+
+
+BACKENDS = {
+    "openai": OpenAIWhisperBackend,
+    "openai-int8": OpenAIWhisperInt8Backend,
+    "faster-whisper": FasterWhisperBackend,
+    "stub": StubBackend,
+}
+
+
+def resolve_engine(name: str) -> str:
+    """Map "auto" to the fastest installed engine."""
+    if name != "auto":
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown transcription backend: {name!r} (choose from {', '.join(BACKENDS)}, auto)")
+        return name
+    if importlib.util.find_spec("faster_whisper") is not None:
+        return "faster-whisper"
+    return "openai"
+
+
+def create_backend(name: str, model_size: str, threads: int = 0) -> TranscriptionBackend:
+    return BACKENDS[resolve_engine(name)](model_size=model_size, threads=threads)
@@ -0,0 +1,83 @@
+"""
+Cheap-first cascade: score MFCC features with an audio-only model and only
+run Whisper when that score is inside the uncertainty band.
+
+The companion model lives next to the main bundle as `audio_only_model.joblib`
+and takes the same scaled MFCC features (`audio_scaler.joblib`). Train it from
+an .npz with `X` (raw mean/std MFCC rows) and `y` (0 = real, 1 = fake):
+
+    python -m src.cascade fit features.npz
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+AUDIO_ONLY_FILE = "audio_only_model.joblib"
+
+
+# ----------------------- Stage 1 -----------------------
+def audio_only_prob_fake(model, scaler, feats) -> np.ndarray:
+    """P(fake) from MFCC features alone, one value per row."""
+    x = scaler.transform(np.atleast_2d(np.asarray(feats, dtype=np.float32)))
+    return model.predict_proba(x)[:, 1]
+
+
+def decide(prob_fake: float, low: float, high: float) -> dict:
+    """Take the audio-only verdict if it is outside [low, high], else escalate."""
+    confident = prob_fake < low or prob_fake > high
+    return {
+        "path": "audio_only" if confident else "full",
+        "stage1_prob_fake": float(prob_fake),
+        "band": [low, high],
+    }
+
+
+def audio_only_result(decision: dict, inverse_label_map: dict) -> dict:
+    """Result dict for a file settled by the audio-only stage (no transcript)."""
+    prob_fake = decision["stage1_prob_fake"]
+    proba = np.array([1.0 - prob_fake, prob_fake])
+    pred_idx = int(np.argmax(proba))
+    return {
+        "prediction": inverse_label_map[pred_idx],
+        "confidence": float(proba[pred_idx]),
+        "prob_real": float(proba[0]),
+        "prob_fake": float(proba[1]),
+        "transcript": "",
+        "cascade": decision,
+    }
+
+# ----------------------- Training -----------------------
+def fit_audio_only(features_npz: str, model_dir, C: float = 1.0):
+    """Fit the companion logistic regression on scaled MFCC features and save it."""
+    import joblib
+    from sklearn.linear_model import LogisticRegression
+
+    model_dir = Path(model_dir)
+    data = np.load(features_npz)
+    X, y = data["X"].astype(np.float32), data["y"].astype(int)
+
+    scaler = joblib.load(model_dir / "audio_scaler.joblib")
+    model = LogisticRegression(C=C, max_iter=1000)
+    model.fit(scaler.transform(X), y)
+
+    out = model_dir / AUDIO_ONLY_FILE
+    joblib.dump(model, out)
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the audio-only cascade model.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    fit = sub.add_parser("fit", help="fit audio_only_model.joblib from an .npz with X and y")
+    fit.add_argument("features")
+    fit.add_argument("--model-dir", default="models/best_text_audio_mfcc")
+    fit.add_argument("-C", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    out = fit_audio_only(args.features, args.model_dir, C=args.C)
+    print(f"saved {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""
+Compact, memory-mappable export of the text+audio bundle.
+
+    python -m src.compact_model export models/best_text_audio_mfcc models/best_text_audio_mfcc_compact
+    python -m src.compact_model verify models/best_text_audio_mfcc_compact
+
+The pickled vectorizer, scaler and classifier become plain `.npy` arrays
+(the vocabulary as a sorted byte-string array plus column ids) that are
+opened with `mmap_mode="r"`, so every worker on a node shares the same
+pages through the OS cache instead of unpickling a private copy. The
+analyzer settings, a format version and per-file SHA-256 checksums are
+recorded in the export's `meta.json`.
+
+Point DEEPFAKE_MODEL_DIR at the export to use it; `ModelRegistry` loads
+either layout and hands out duck-typed objects with the same methods the
+pipeline calls on the sklearn ones.
+"""
+import argparse
+import hashlib
+import json
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+
+import numpy as np
+
+FORMAT_NAME = "compact"
+FORMAT_VERSION = 1
+
+# Array files of the compact layout, besides meta.json
+ARRAY_FILES = (
+    "vocab_terms.npy",      # sorted UTF-8 terms, fixed-width bytes
+    "vocab_columns.npy",    # TF-IDF column of each sorted term
+    "idf.npy",
+    "scaler_mean.npy",
+    "scaler_scale.npy",
+    "coef.npy",
+    "intercept.npy",
+    "classes.npy",
+)
+COMPACT_FILES = ARRAY_FILES + ("meta.json",)
+
+# Vectorizer parameters that define the analyzer (must be plain values)
+_ANALYZER_PARAMS = (
+    "input", "encoding", "decode_error", "strip_accents", "lowercase",
+    "stop_words", "token_pattern", "ngram_range", "analyzer",
+)
+
+
+def is_compact(model_dir) -> bool:
+    meta_path = Path(model_dir) / "meta.json"
+    if not meta_path.exists():
+        return False
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    return meta.get("format", {}).get("name") == FORMAT_NAME
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _checksum(file_hashes: dict) -> str:
+    h = hashlib.sha256()
+    for name in sorted(file_hashes):
+        h.update(f"{name}:{file_hashes[name]}\n".encode("utf-8"))
+    return h.hexdigest()
+
+# ----------------------- Duck-Typed Bundle -----------------------
+class _VocabularyView(Mapping):
+    """Read-only term -> column mapping backed by the sorted term array."""
+
+    def __init__(self, terms: np.ndarray, columns: np.ndarray):
+        self._terms = terms
+        self._columns = columns
+
+    def __len__(self):
+        return len(self._terms)
+
+    def __iter__(self):
+        for term in self._terms:
+            yield term.decode("utf-8")
+
+    def __getitem__(self, term):
+        key = term.encode("utf-8")
+        pos = int(np.searchsorted(self._terms, key))
+        if pos < len(self._terms) and self._terms[pos] == key:
+            return int(self._columns[pos])
+        raise KeyError(term)
+
+
+class CompactTfidfVectorizer:
+    """`transform()` of a fitted TfidfVectorizer, from memory-mapped arrays."""
+
+    def __init__(self, terms, columns, idf, params: dict, norm, sublinear_tf: bool, binary: bool):
+        self.terms = terms
+        self.columns = columns
+        self.idf_ = idf
+        self.params = params
+        self.norm = norm
+        self.sublinear_tf = sublinear_tf
+        self.binary = binary
+        self.vocabulary_ = _VocabularyView(terms, columns)
+        self._analyzer = None
+
+    def build_analyzer(self):
+        if self._analyzer is None:
+            from sklearn.feature_extraction.text import CountVectorizer
+
+            params = dict(self.params)
+            params["ngram_range"] = tuple(params["ngram_range"])
+            self._analyzer = CountVectorizer(**params).build_analyzer()
+        return self._analyzer
+
+    def _lookup(self, tokens):
+        """TF-IDF columns of `tokens`, and a mask of the ones in the vocabulary."""
+        width = self.terms.dtype.itemsize
+        encoded = [t.encode("utf-8") for t in tokens]
+        fits = np.fromiter((len(t) <= width for t in encoded), dtype=bool, count=len(encoded))
+        keys = np.array([t if ok else b"" for t, ok in zip(encoded, fits)], dtype=self.terms.dtype)
+        pos = np.minimum(np.searchsorted(self.terms, keys), len(self.terms) - 1)
+        found = fits & (self.terms[pos] == keys)
+        return self.columns[pos[found]], found
+
+    def transform(self, raw_documents):
+        from scipy.sparse import csr_matrix
+
+        analyze = self.build_analyzer()
+        tokens, rows = [], []
+        n_docs = 0
+        for i, doc in enumerate(raw_documents):
+            doc_tokens = analyze(doc)
+            tokens.extend(doc_tokens)
+            rows.extend([i] * len(doc_tokens))
+            n_docs = i + 1
+
+        shape = (n_docs, len(self.terms))
+        if not tokens:
+            return csr_matrix(shape, dtype=np.float64)
+        cols, found = self._lookup(tokens)
+        rows = np.asarray(rows, dtype=np.int64)[found]
+        X = csr_matrix((np.ones(len(cols), dtype=np.float64), (rows, cols)), shape=shape)
+        X.sum_duplicates()  # also sorts indices, like CountVectorizer
+
+        if self.binary:
+            X.data.fill(1.0)
+        if self.sublinear_tf:
+            np.log(X.data, X.data)
+            X.data += 1.0
+        X.data *= self.idf_[X.indices]
+        if self.norm in ("l1", "l2") and X.nnz:
+            counts = np.diff(X.indptr)
+            row_ids = np.repeat(np.arange(n_docs), counts)
+            if self.norm == "l2":
+                norms = np.sqrt(np.bincount(row_ids, weights=X.data ** 2, minlength=n_docs))
+            else:
+                norms = np.bincount(row_ids, weights=np.abs(X.data), minlength=n_docs)
+            norms[norms == 0.0] = 1.0
+            X.data /= np.repeat(norms, counts)
+        return X
+
+
+class CompactStandardScaler:
+    """`transform()` of a fitted StandardScaler (identity mean/scale when disabled)."""
+
+    def __init__(self, mean, scale):
+        self.mean_ = mean
+        self.scale_ = scale
+        self.n_features_in_ = len(mean)
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+
+
+class CompactLinearClassifier:
+    """`predict_proba()` of a fitted LogisticRegression."""
+
+    def __init__(self, coef, intercept, classes, multi_class: str):
+        self.coef_ = coef
+        self.intercept_ = intercept
+        self.classes_ = classes
+        self.multi_class = multi_class
+
+    def decision_function(self, X):
+        z = X @ self.coef_.T
+        z = np.asarray(z) + self.intercept_
+        return z.ravel() if z.shape[1] == 1 else z
+
+    def predict_proba(self, X):
+        from scipy.special import expit, softmax
+
+        z = self.decision_function(X)
+        if z.ndim == 1:
+            p = expit(2.0 * z if self.multi_class == "multinomial" else z)
+            return np.column_stack([1.0 - p, p])
+        if self.multi_class == "multinomial":
+            return softmax(z, axis=1)
+        p = expit(z)
+        return p / p.sum(axis=1, keepdims=True)
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+# ----------------------- Export / Load -----------------------
+def export_bundle(vec, scaler, clf, meta: dict, out_dir) -> dict:
+    """Write the compact layout of a loaded bundle to `out_dir`; returns the new meta."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    params = vec.get_params()
+    for name in ("preprocessor", "tokenizer"):
+        if params.get(name) is not None:
+            raise ValueError(f"cannot export a vectorizer with a custom {name}")
+    if callable(params.get("analyzer")):
+        raise ValueError("cannot export a vectorizer with a custom analyzer")
+    if not hasattr(clf, "coef_"):
+        raise ValueError(f"cannot export {type(clf).__name__}: not a linear model")
+
+    analyzer_params = {k: params[k] for k in _ANALYZER_PARAMS}
+    analyzer_params["ngram_range"] = list(analyzer_params["ngram_range"])
+    if isinstance(analyzer_params["stop_words"], (set, frozenset, tuple)):
+        analyzer_params["stop_words"] = sorted(analyzer_params["stop_words"])
+
+    items = sorted((t.encode("utf-8"), col) for t, col in vec.vocabulary_.items())
+    width = max((len(t) for t, _ in items), default=1)
+    n_audio = scaler.n_features_in_
+    mean = getattr(scaler, "mean_", None)
+    scale = getattr(scaler, "scale_", None)
+    classes = np.asarray(clf.classes_)
+    if classes.dtype == object:
+        classes = classes.astype(str)  # .npy files are written without pickle
+
+    arrays = {
+        "vocab_terms.npy": np.array([t for t, _ in items], dtype=f"S{width}"),
+        "vocab_columns.npy": np.array([c for _, c in items], dtype=np.int32),
+        "idf.npy": np.asarray(vec.idf_, dtype=np.float64),
+        "scaler_mean.npy": np.zeros(n_audio) if mean is None else np.asarray(mean, dtype=np.float64),
+        "scaler_scale.npy": np.ones(n_audio) if scale is None else np.asarray(scale, dtype=np.float64),
+        "coef.npy": np.asarray(clf.coef_, dtype=np.float64),
+        "intercept.npy": np.asarray(clf.intercept_, dtype=np.float64),
+        "classes.npy": classes,
+    }
+    file_hashes = {}
+    for name in ARRAY_FILES:
+        np.save(out_dir / name, arrays[name], allow_pickle=False)
+        file_hashes[name] = _sha256(out_dir / name)
+
+    meta = dict(meta)
+    meta["format"] = {
+        "name": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "files": file_hashes,
+        "checksum": _checksum(file_hashes),
+        "vectorizer": {
+            "params": analyzer_params,
+            "norm": vec.norm,
+            "sublinear_tf": bool(vec.sublinear_tf),
+            "binary": bool(vec.binary),
+        },
+        "classifier": {
+            "type": type(clf).__name__,
+            "multi_class": str(getattr(clf, "multi_class", "auto")),
+        },
+    }
+    (out_dir / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return meta
+
+
+def verify(model_dir, meta: dict = None):
+    """Raise ValueError if the format is unknown or any array file fails its checksum."""
+    model_dir = Path(model_dir)
+    if meta is None:
+        meta = json.loads((model_dir / "meta.json").read_text(encoding="utf-8"))
+    fmt = meta.get("format", {})
+    if fmt.get("name") != FORMAT_NAME:
+        raise ValueError(f"{model_dir} is not a compact bundle")
+    if fmt.get("version") != FORMAT_VERSION:
+        raise ValueError(f"unsupported compact format version {fmt.get('version')} (expected {FORMAT_VERSION})")
+    if _checksum(fmt["files"]) != fmt.get("checksum"):
+        raise ValueError("meta.json checksum does not match its file list")
+    for name, expected in fmt["files"].items():
+        if _sha256(model_dir / name) != expected:
+            raise ValueError(f"checksum mismatch for {name}")
+
+
+def load_compact(model_dir, check: bool = True):
+    """Return (vec, scaler, clf, meta) with every array memory-mapped read-only."""
+    model_dir = Path(model_dir)
+    meta = json.loads((model_dir / "meta.json").read_text(encoding="utf-8"))
+    if check:
+        verify(model_dir, meta)
+    fmt = meta["format"]
+
+    def arr(name):
+        return np.load(model_dir / name, mmap_mode="r", allow_pickle=False)
+
+    v = fmt["vectorizer"]
+    vec = CompactTfidfVectorizer(
+        arr("vocab_terms.npy"), arr("vocab_columns.npy"), arr("idf.npy"),
+        v["params"], v["norm"], v["sublinear_tf"], v["binary"],
+    )
+    scaler = CompactStandardScaler(arr("scaler_mean.npy"), arr("scaler_scale.npy"))
+    clf = CompactLinearClassifier(
+        arr("coef.npy"), arr("intercept.npy"), arr("classes.npy"), fmt["classifier"]["multi_class"],
+    )
+    return vec, scaler, clf, meta
+
+# ----------------------- CLI -----------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export or verify the compact model format.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_export = sub.add_parser("export", help="convert a joblib bundle to the compact layout")
+    p_export.add_argument("src", help="directory with the joblib bundle")
+    p_export.add_argument("dst", help="output directory")
+    p_verify = sub.add_parser("verify", help="check the format version and checksums")
+    p_verify.add_argument("model_dir")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        from src.model_registry import ModelRegistry
+
+        vec, scaler, clf, meta = ModelRegistry(args.src).get()
+        meta = export_bundle(vec, scaler, clf, meta, args.dst)
+        print(f"[compact] wrote {args.dst} (checksum {meta['format']['checksum'][:16]})", file=sys.stderr)
+    else:
+        try:
+            verify(args.model_dir)
+        except ValueError as e:
+            print(f"[compact] FAIL: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"[compact] {args.model_dir} OK", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import os
+from pathlib import Path
+
+# ----------------------- Environment Helpers -----------------------
+def env_str(name: str, default: str) -> str:
+    return os.environ.get(name, default)
+
+
+def env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+def env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value not in (None, "") else default
+
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+# ----------------------- Shared Settings -----------------------
+# Root for every on-disk cache/store the app writes (results, spool, ...)
+CACHE_ROOT = Path(env_str("DEEPFAKE_CACHE_DIR", ".cache"))
+
+# Model bundle: joblib pickles, or the memory-mappable export from src.compact_model
+MODEL_DIR = env_str("DEEPFAKE_MODEL_DIR", "models/best_text_audio_mfcc")
+
+# Result cache
+RESULT_CACHE_ENABLED = env_bool("DEEPFAKE_RESULT_CACHE", True)
+RESULT_CACHE_MEMORY_ITEMS = env_int("DEEPFAKE_RESULT_CACHE_MEMORY_ITEMS", 256)
+RESULT_CACHE_MAX_MB = env_int("DEEPFAKE_RESULT_CACHE_MAX_MB", 256)
+
+# Streaming (windowed) analysis for long media
+STREAM_WINDOW_S = env_float("DEEPFAKE_STREAM_WINDOW_S", 30.0)
+
+# Cheap-first cascade: skip Whisper when the audio-only score is outside [low, high]
+CASCADE_ENABLED = env_bool("DEEPFAKE_CASCADE", False)
+CASCADE_LOW = env_float("DEEPFAKE_CASCADE_LOW", 0.15)
+CASCADE_HIGH = env_float("DEEPFAKE_CASCADE_HIGH", 0.85)
+
+# Voice-activity trimming before Whisper ("energy" or "webrtc")
+VAD_ENABLED = env_bool("DEEPFAKE_VAD", True)
+VAD_BACKEND = env_str("DEEPFAKE_VAD_BACKEND", "energy")
+
+# Background inference jobs for the Streamlit UI
+JOB_WORKERS = env_int("DEEPFAKE_JOB_WORKERS", 2)
+JOB_MAX_PENDING = env_int("DEEPFAKE_JOB_MAX_PENDING", 16)
+JOB_RETENTION_S = env_int("DEEPFAKE_JOB_RETENTION_S", 24 * 3600)
+
+# Stage-level timing/resource instrumentation
+TIMINGS_ENABLED = env_bool("DEEPFAKE_TIMINGS", False)
+TRACE_FILE = env_str("DEEPFAKE_TRACE_FILE", "")  # append one JSON line per traced prediction
+
+# Upload spool (uploads are streamed here instead of held in session memory)
+SPOOL_TTL_S = env_int("DEEPFAKE_SPOOL_TTL_S", 6 * 3600)
+SPOOL_MAX_MB = env_int("DEEPFAKE_SPOOL_MAX_MB", 2048)
+
+# Transcription backend: "openai", "openai-int8", "faster-whisper", "auto" or "stub"
+WHISPER_BACKEND = env_str("DEEPFAKE_WHISPER_BACKEND", "openai")
+WHISPER_MODEL = env_str("DEEPFAKE_WHISPER_MODEL", "base")
+WHISPER_THREADS = env_int("DEEPFAKE_WHISPER_THREADS", 0)  # 0 = library default
+# Long audio is transcribed in windows of this many seconds, checking the job deadline between them (0 = one call)
+TRANSCRIBE_WINDOW_S = env_float("DEEPFAKE_TRANSCRIBE_WINDOW_S", 300)
+
+# Transcript cache keyed on a spectral fingerprint of the decoded audio
+TRANSCRIPT_CACHE_ENABLED = env_bool("DEEPFAKE_TRANSCRIPT_CACHE", True)
+TRANSCRIPT_CACHE_MAX_MB = env_int("DEEPFAKE_TRANSCRIPT_CACHE_MAX_MB", 128)
+TRANSCRIPT_CACHE_MAX_BER = env_float("DEEPFAKE_TRANSCRIPT_CACHE_MAX_BER", 0.15)
+
+# Standalone HTTP inference service (python -m src.service)
+SERVICE_HOST = env_str("DEEPFAKE_SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = env_int("DEEPFAKE_SERVICE_PORT", 8600)
+SERVICE_WORKERS = env_int("DEEPFAKE_SERVICE_WORKERS", 2)
+SERVICE_MAX_PENDING = env_int("DEEPFAKE_SERVICE_MAX_PENDING", 32)
+SERVICE_MAX_UPLOAD_MB = env_int("DEEPFAKE_SERVICE_MAX_UPLOAD_MB", 1024)
+SERVICE_MAX_WAIT_S = env_float("DEEPFAKE_SERVICE_MAX_WAIT_S", 300)  # longest ?wait= a request may block for
+SERVICE_PATH_ROOTS = env_str("DEEPFAKE_SERVICE_PATH_ROOTS", "")  # os.pathsep-separated; empty disables path submission
+SERVICE_URL = env_str("DEEPFAKE_SERVICE_URL", "")  # when set, the Detection page can send work here
+
+# Persistent detection history (SQLite under CACHE_ROOT)
+HISTORY_ENABLED = env_bool("DEEPFAKE_HISTORY", True)
+
+# Score binary logistic regressions directly instead of via hstack + predict_proba
+FAST_SCORER_ENABLED = env_bool("DEEPFAKE_FAST_SCORER", True)
+
+# Rendered PDF reports (cached per result, LRU-bounded on disk)
+REPORT_CACHE_MAX_MB = env_int("DEEPFAKE_REPORT_CACHE_MAX_MB", 256)
+
+# Admission control: probed before any decoding; the timeout covers a whole prediction.
+# The duration cap is half the timeout, so an admitted file finishes within it as long
+# as decoding plus transcription run at least 2x faster than real time.
+MAX_MEDIA_MB = env_int("DEEPFAKE_MAX_MEDIA_MB", 1024)
+MAX_DURATION_S = env_float("DEEPFAKE_MAX_DURATION_S", 1800)
+JOB_TIMEOUT_S = env_float("DEEPFAKE_JOB_TIMEOUT_S", 3600)  # 0 disables
+PROBE_TIMEOUT_S = env_float("DEEPFAKE_PROBE_TIMEOUT_S", 15)
+
+# Feature store: transcript + MFCC vector per content hash, for re-scoring with new bundles
+FEATURE_STORE_ENABLED = env_bool("DEEPFAKE_FEATURE_STORE", True)
+
+# MFCC extraction: FFT threads per process, and seconds of decoded audio featurized per batch pass
+MFCC_FFT_WORKERS = env_int("DEEPFAKE_MFCC_FFT_WORKERS", 1)
+MFCC_BATCH_S = env_float("DEEPFAKE_MFCC_BATCH_S", 600)
+
+# Optional LLM explanations ("none", "stub" or "openai-compatible"); responses are cached by prompt
+LLM_BACKEND = env_str("DEEPFAKE_LLM_BACKEND", "none")
+LLM_URL = env_str("DEEPFAKE_LLM_URL", "")  # e.g. http://localhost:11434/v1
+LLM_MODEL = env_str("DEEPFAKE_LLM_MODEL", "")
+LLM_API_KEY = env_str("DEEPFAKE_LLM_API_KEY", "")
+LLM_TIMEOUT_S = env_float("DEEPFAKE_LLM_TIMEOUT_S", 60)
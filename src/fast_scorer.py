@@ -0,0 +1,60 @@
+import numpy as np
+
+
+# ----------------------- Linear Scorer -----------------------
+class LinearScorer:
+    """
+    Direct scorer for a binary logistic regression over [TF-IDF | scaled MFCC].
+
+    The coefficients are split into a text block and an audio block, and the
+    StandardScaler is folded into the audio block (w / scale, with the mean
+    term moved into the intercept). Scoring is then one sparse mat-vec on
+    the TF-IDF rows plus one dense mat-vec on the raw MFCC vectors, with no
+    stacked matrix and no sklearn validation per call. Probabilities match
+    `clf.predict_proba` up to float rounding.
+    """
+
+    def __init__(self, w_text: np.ndarray, w_audio: np.ndarray, intercept: float, logit_scale: float = 1.0):
+        self.w_text = w_text
+        self.w_audio = w_audio
+        self.intercept = intercept
+        self.logit_scale = logit_scale
+
+    @classmethod
+    def from_bundle(cls, vec, scaler, clf):
+        """Build from the loaded bundle, or return None if the model is not a binary linear one."""
+        coef = getattr(clf, "coef_", None)
+        intercept = getattr(clf, "intercept_", None)
+        if coef is None or intercept is None or coef.shape[0] != 1 or len(getattr(clf, "classes_", ())) != 2:
+            return None
+        n_text = len(vec.vocabulary_)
+        n_audio = scaler.n_features_in_
+        coef = np.asarray(coef[0], dtype=np.float64)
+        if coef.shape[0] != n_text + n_audio:
+            return None
+
+        w_text = np.ascontiguousarray(coef[:n_text])
+        w_audio = coef[n_text:].copy()
+        bias = float(intercept[0])
+        if getattr(scaler, "scale_", None) is not None:
+            w_audio /= scaler.scale_
+        if getattr(scaler, "mean_", None) is not None:
+            bias -= float(w_audio @ scaler.mean_)
+
+        # Binary "multinomial" logreg takes softmax([-z, z]), i.e. sigmoid(2z)
+        logit_scale = 2.0 if getattr(clf, "multi_class", None) == "multinomial" else 1.0
+        return cls(w_text, w_audio, bias, logit_scale)
+
+    def decision(self, X_text, audio_feats: np.ndarray) -> np.ndarray:
+        """Logits for a CSR batch of TF-IDF rows and an (n, n_audio) MFCC array."""
+        z = X_text @ self.w_text
+        z += np.asarray(audio_feats, dtype=np.float64) @ self.w_audio
+        z += self.intercept
+        return z
+
+    def predict_proba(self, X_text, audio_feats: np.ndarray) -> np.ndarray:
+        """(n, 2) probabilities in `clf.classes_` order, like `predict_proba`."""
+        from scipy.special import expit
+
+        p = expit(self.logit_scale * self.decision(X_text, audio_feats))
+        return np.column_stack([1.0 - p, p])
@@ -0,0 +1,290 @@
+"""
+Persistent store of the model inputs (transcript + MFCC vector) per file,
+so a new bundle can be applied to the archive without ffmpeg or Whisper.
+
+    python -m src.feature_store stats
+    python -m src.feature_store rescore --model-dir models/new_bundle -o rescored.jsonl
+    python -m src.feature_store export -o features.npz
+
+MFCC vectors are appended as float32 rows to one raw file (`mfcc.f32`)
+that is read back through `np.memmap`; transcripts and the row number of
+each content hash live in SQLite next to it. Re-scoring streams the rows
+in storage order in large batches, so the cost is one TF-IDF transform and one
+mat-vec per batch.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src import config
+
+MFCC_FILE = "mfcc.f32"
+INDEX_FILE = "index.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS features (
+    content_hash  TEXT PRIMARY KEY,
+    row           INTEGER NOT NULL UNIQUE,
+    transcript    TEXT,
+    asr_id        TEXT,
+    created_at    REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS spec (
+    key    TEXT PRIMARY KEY,
+    value  TEXT NOT NULL
+);
+"""
+
+
+# ----------------------- Feature Store -----------------------
+class FeatureStore:
+    """
+    Content-hash indexed (transcript, MFCC) rows.
+
+    Every row has the same MFCC spec (`sr`, `n_mfcc`), fixed by the first
+    write; vectors computed with another spec are refused, since a bundle
+    trained on one cannot score the other. Writers serialize on the SQLite
+    write lock, so several processes can append safely. Re-recording a
+    hash overwrites its row in place; a missing transcript (cascade
+    audio-only path) never replaces a stored one.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.mfcc_path = self.root / MFCC_FILE
+        self.mfcc_path.touch(exist_ok=True)
+        self._lock = threading.Lock()
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+
+    def _connect(self):
+        db = sqlite3.connect(self.root / INDEX_FILE, timeout=30)
+        db.execute("PRAGMA journal_mode=WAL")
+        return db
+
+    def spec(self):
+        """{"sr", "n_mfcc", "dim"} of the stored vectors, or None while the store is empty."""
+        with self._connect() as db:
+            rows = dict(db.execute("SELECT key, value FROM spec"))
+        return {k: int(v) for k, v in rows.items()} or None
+
+    def record(self, content_hash: str, transcript, feat: np.ndarray, sr: int, n_mfcc: int, asr_id: str = None):
+        self.record_many([(content_hash, transcript, feat)], sr, n_mfcc, asr_id)
+
+    def record_many(self, rows, sr: int, n_mfcc: int, asr_id: str = None):
+        """Store (content_hash, transcript or None, MFCC vector) rows computed with one spec."""
+        rows = list(rows)
+        if not rows:
+            return
+        feats = np.vstack([np.asarray(f, dtype=np.float32).ravel() for _, _, f in rows])
+        row_bytes = feats.shape[1] * 4
+        now = time.time()
+
+        with self._lock, self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            self._check_spec(db, sr, n_mfcc, feats.shape[1])
+            next_row = db.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM features").fetchone()[0]
+            fd = os.open(self.mfcc_path, os.O_WRONLY)
+            try:
+                for (content_hash, transcript, _), feat in zip(rows, feats):
+                    found = db.execute("SELECT row FROM features WHERE content_hash = ?", (content_hash,)).fetchone()
+                    if found is None:
+                        row, next_row = next_row, next_row + 1
+                    else:
+                        row = found[0]
+                    # Vector first: a crash before commit leaves an unreferenced row that the next write reuses
+                    os.pwrite(fd, feat.tobytes(), row * row_bytes)
+                    db.execute(
+                        "INSERT INTO features (content_hash, row, transcript, asr_id, created_at) "
+                        "VALUES (?, ?, ?, ?, ?) ON CONFLICT (content_hash) DO UPDATE SET "
+                        "transcript = COALESCE(excluded.transcript, transcript), "
+                        "asr_id = CASE WHEN excluded.transcript IS NULL THEN asr_id ELSE excluded.asr_id END, "
+                        "created_at = excluded.created_at",
+                        (content_hash, row, transcript, asr_id if transcript is not None else None, now),
+                    )
+            finally:
+                os.close(fd)
+
+    @staticmethod
+    def _check_spec(db, sr: int, n_mfcc: int, dim: int):
+        wanted = {"sr": int(sr), "n_mfcc": int(n_mfcc), "dim": int(dim)}
+        stored = {k: int(v) for k, v in db.execute("SELECT key, value FROM spec")}
+        if not stored:
+            db.executemany("INSERT INTO spec (key, value) VALUES (?, ?)", [(k, str(v)) for k, v in wanted.items()])
+        elif stored != wanted:
+            raise ValueError(f"feature store holds {stored}, cannot add vectors computed with {wanted}")
+
+    def _matrix(self, dim: int) -> np.ndarray:
+        n = self.mfcc_path.stat().st_size // (dim * 4)
+        if n == 0:
+            return np.zeros((0, dim), dtype=np.float32)
+        return np.memmap(self.mfcc_path, dtype=np.float32, mode="r", shape=(n, dim))
+
+    def get(self, content_hash: str):
+        """(transcript, MFCC vector) for a hash, or None."""
+        spec = self.spec()
+        with self._connect() as db:
+            found = db.execute(
+                "SELECT row, transcript FROM features WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+        if found is None or spec is None:
+            return None
+        return found[1], np.array(self._matrix(spec["dim"])[found[0]])
+
+    def iter_batches(self, batch_size: int = 8192, with_transcript: bool = True):
+        """
+        Yield (hashes, transcripts, feats) batches in storage order.
+
+        `feats` is gathered from the memory map into an (n, dim) float32
+        array; rows without a transcript are skipped unless
+        `with_transcript=False`.
+        """
+        spec = self.spec()
+        if spec is None:
+            return
+        mfcc = self._matrix(spec["dim"])
+        where = "AND transcript IS NOT NULL" if with_transcript else ""
+        last = -1
+        with self._connect() as db:
+            while True:
+                batch = db.execute(
+                    f"SELECT row, content_hash, transcript FROM features WHERE row > ? {where} "
+                    "ORDER BY row LIMIT ?", (last, batch_size),
+                ).fetchall()
+                if not batch:
+                    return
+                rows = np.fromiter((r[0] for r in batch), dtype=np.int64, count=len(batch))
+                last = int(rows[-1])
+                if last >= len(mfcc):  # another process appended since the map was opened
+                    mfcc = self._matrix(spec["dim"])
+                yield [r[1] for r in batch], [r[2] for r in batch], np.asarray(mfcc[rows])
+
+    def stats(self) -> dict:
+        with self._connect() as db:
+            total, with_text = db.execute(
+                "SELECT COUNT(*), COUNT(transcript) FROM features"
+            ).fetchone()
+        return {
+            "items": total,
+            "with_transcript": with_text,
+            "spec": self.spec(),
+            "mfcc_bytes": self.mfcc_path.stat().st_size,
+        }
+
+
+_STORE = None
+
+
+def get_store() -> FeatureStore:
+    global _STORE
+    if _STORE is None:
+        _STORE = FeatureStore(config.CACHE_ROOT / "features")
+    return _STORE
+
+# ----------------------- Re-scoring -----------------------
+def bundle_proba(bundle, transcripts, feats: np.ndarray, scorer=None) -> np.ndarray:
+    """(n, 2) probabilities for a batch under `bundle` (vec, scaler, clf, meta)."""
+    vec, scaler, clf, _ = bundle
+    X_text = vec.transform(list(transcripts))
+    if scorer is not None:
+        return scorer.predict_proba(X_text, feats)
+    from scipy.sparse import hstack, csr_matrix
+
+    X = hstack([X_text, csr_matrix(scaler.transform(feats))]).tocsr()
+    return clf.predict_proba(X)
+
+
+def rescore(store: FeatureStore, model_dir, batch_size: int = 8192):
+    """
+    Score every stored (transcript, MFCC) row with the bundle in `model_dir`.
+
+    Yields one {"content_hash", "prediction", "confidence", "prob_real",
+    "prob_fake"} dict per row; rows stored without a transcript (cascade
+    audio-only path) are skipped. Raises ValueError when the bundle expects
+    MFCCs computed with another sample rate or coefficient count.
+    """
+    from src.fast_scorer import LinearScorer
+    from src.model_registry import ModelRegistry
+
+    bundle = ModelRegistry(Path(model_dir)).get()
+    meta = bundle[3]
+    spec = store.spec()
+    if spec is None:
+        return
+    if (int(meta["sr"]), int(meta["n_mfcc"])) != (spec["sr"], spec["n_mfcc"]):
+        raise ValueError(
+            f"bundle expects sr={meta['sr']}, n_mfcc={meta['n_mfcc']}; "
+            f"stored features use sr={spec['sr']}, n_mfcc={spec['n_mfcc']}"
+        )
+    inv = {int(k): v for k, v in meta["inverse_label_map"].items()}
+    scorer = LinearScorer.from_bundle(*bundle[:3]) if config.FAST_SCORER_ENABLED else None
+
+    for hashes, transcripts, feats in store.iter_batches(batch_size):
+        proba = bundle_proba(bundle, transcripts, feats, scorer)
+        pred_idx = proba.argmax(axis=1)
+        for i, content_hash in enumerate(hashes):
+            idx = int(pred_idx[i])
+            yield {
+                "content_hash": content_hash,
+                "prediction": inv[idx],
+                "confidence": float(proba[i, idx]),
+                "prob_real": float(proba[i, 0]),
+                "prob_fake": float(proba[i, 1]),
+            }
+
+# ----------------------- CLI -----------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect, export and re-score stored model inputs.")
+    parser.add_argument("--root", help="store directory (default: CACHE_ROOT/features)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("stats", help="number of stored items and their MFCC spec")
+    p_rescore = sub.add_parser("rescore", help="apply a model bundle to every stored item")
+    p_rescore.add_argument("--model-dir", default=config.MODEL_DIR)
+    p_rescore.add_argument("-o", "--output", required=True, help="JSONL file with one score per item")
+    p_rescore.add_argument("--batch-size", type=int, default=8192)
+    p_export = sub.add_parser("export", help="write hashes, transcripts and MFCCs to an .npz for retraining "
+                                                   "(transcripts are an object array: np.load(..., allow_pickle=True))")
+    p_export.add_argument("-o", "--output", required=True)
+    args = parser.parse_args(argv)
+
+    store = FeatureStore(args.root) if args.root else get_store()
+
+    if args.cmd == "stats":
+        print(json.dumps(store.stats(), indent=2))
+    elif args.cmd == "rescore":
+        t0 = time.perf_counter()
+        counts = {}
+        with open(args.output, "w", encoding="utf-8") as out:
+            for row in rescore(store, args.model_dir, args.batch_size):
+                out.write(json.dumps(row) + "\n")
+                counts[row["prediction"]] = counts.get(row["prediction"], 0) + 1
+        elapsed = time.perf_counter() - t0
+        total = sum(counts.values())
+        print(f"[features] rescored {total} items in {elapsed:.1f} s "
+              f"({total / max(elapsed, 1e-9):.0f}/s): {counts}", file=sys.stderr)
+    else:
+        hashes, transcripts, feats = [], [], []
+        for h, t, f in store.iter_batches(with_transcript=False):
+            hashes.extend(h)
+            transcripts.extend("" if x is None else x for x in t)
+            feats.append(f)
+        spec = store.spec() or {"dim": 0}
+        np.savez(
+            args.output,
+            content_hash=np.asarray(hashes, dtype=str),
+            transcript=np.asarray(transcripts, dtype=object),
+            mfcc=np.vstack(feats) if feats else np.zeros((0, spec["dim"]), dtype=np.float32),
+        )
+        print(f"[features] exported {len(hashes)} items to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from src import config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS detections (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    content_hash  TEXT NOT NULL,
+    name          TEXT,
+    media_type    TEXT,
+    media_path    TEXT,
+    verdict       TEXT NOT NULL,
+    confidence    REAL NOT NULL,
+    prob_fake     REAL NOT NULL,
+    created_at    REAL NOT NULL,
+    result        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS detections_hash ON detections (content_hash);
+CREATE INDEX IF NOT EXISTS detections_verdict ON detections (verdict);
+CREATE INDEX IF NOT EXISTS detections_created ON detections (created_at);
+CREATE INDEX IF NOT EXISTS detections_confidence ON detections (confidence);
+"""
+
+# Columns returned by list queries; the full result JSON is only read by get()
+_SUMMARY_COLUMNS = "id, content_hash, name, media_type, verdict, confidence, prob_fake, created_at"
+
+
+# ----------------------- History Store -----------------------
+class HistoryStore:
+    """
+    Persistent, indexed log of detection results.
+
+    Lists are paginated by keyset (`before_id`) rather than OFFSET, so
+    every page costs the same however deep it is and however many rows the
+    table holds. Rows only carry summary columns; the full result is loaded
+    by `get()`.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+
+    def _connect(self):
+        db = sqlite3.connect(self.db_path, timeout=30)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.row_factory = sqlite3.Row
+        return db
+
+    @staticmethod
+    def _row(result: dict, content_hash: str, name=None, media_type=None, media_path=None):
+        return (
+            content_hash,
+            name,
+            media_type,
+            None if media_path is None else str(media_path),
+            str(result.get("prediction", "unknown")),
+            float(result.get("confidence", 0.0)),
+            float(result.get("prob_fake", 0.0)),
+            time.time(),
+            json.dumps(result, ensure_ascii=False),
+        )
+
+    def record(self, result: dict, content_hash: str, name: str = None,
+               media_type: str = None, media_path=None) -> int:
+        """Store one result and return its id."""
+        with self._connect() as db:
+            cur = db.execute(
+                "INSERT INTO detections (content_hash, name, media_type, media_path, verdict, "
+                "confidence, prob_fake, created_at, result) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._row(result, content_hash, name, media_type, media_path),
+            )
+            return cur.lastrowid
+
+    def record_many(self, rows):
+        """Store many (result, content_hash, name, media_type, media_path) tuples in one transaction."""
+        with self._connect() as db:
+            db.executemany(
+                "INSERT INTO detections (content_hash, name, media_type, media_path, verdict, "
+                "confidence, prob_fake, created_at, result) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [self._row(*row) for row in rows],
+            )
+
+    def seen(self, content_hash: str):
+        """Most recent summary row for these file bytes, or None if never analysed."""
+        with self._connect() as db:
+            row = db.execute(
+                f"SELECT {_SUMMARY_COLUMNS} FROM detections WHERE content_hash = ? ORDER BY id DESC LIMIT 1",
+                (content_hash,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get(self, detection_id: int):
+        """Full row including the stored result dict, or None."""
+        with self._connect() as db:
+            row = db.execute("SELECT * FROM detections WHERE id = ?", (detection_id,)).fetchone()
+        if row is None:
+            return None
+        row = dict(row)
+        row["result"] = json.loads(row["result"])
+        return row
+
+    @staticmethod
+    def _where(verdict=None, min_confidence=None, since=None, until=None, before_id=None):
+        clauses, params = [], []
+        if verdict:
+            clauses.append("verdict = ?")
+            params.append(verdict)
+        if min_confidence is not None:
+            clauses.append("confidence >= ?")
+            params.append(float(min_confidence))
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(float(since))
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(float(until))
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(int(before_id))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, verdict: str = None, min_confidence: float = None, since: float = None,
+              until: float = None, before_id: int = None, limit: int = 50):
+        """
+        One page of summary rows, newest first.
+
+        Returns (rows, next_before_id); pass `next_before_id` back as
+        `before_id` for the next page. It is None on the last page.
+        """
+        where, params = self._where(verdict, min_confidence, since, until, before_id)
+        with self._connect() as db:
+            rows = db.execute(
+                f"SELECT {_SUMMARY_COLUMNS} FROM detections{where} ORDER BY id DESC LIMIT ?",
+                (*params, int(limit) + 1),
+            ).fetchall()
+        rows = [dict(r) for r in rows]
+        next_before_id = rows[limit - 1]["id"] if len(rows) > limit else None
+        return rows[:limit], next_before_id
+
+    def count(self, verdict: str = None, min_confidence: float = None,
+              since: float = None, until: float = None) -> int:
+        where, params = self._where(verdict, min_confidence, since, until)
+        with self._connect() as db:
+            return db.execute(f"SELECT COUNT(*) FROM detections{where}", params).fetchone()[0]
+
+    def verdicts(self):
+        with self._connect() as db:
+            return [r[0] for r in db.execute("SELECT DISTINCT verdict FROM detections ORDER BY verdict")]
+
+
+_HISTORY = None
+_HISTORY_LOCK = threading.Lock()
+
+
+def get_history() -> HistoryStore:
+    """Process-wide history store, created on first use."""
+    global _HISTORY
+    with _HISTORY_LOCK:
+        if _HISTORY is None:
+            _HISTORY = HistoryStore(config.CACHE_ROOT / "history.sqlite3")
+        return _HISTORY
@@ -0,0 +1,194 @@
+"""
+CPU-only image detector: handcrafted frequency-domain and artifact features
+plus a linear classifier saved next to the text+audio bundle.
+
+    python -m src.image_model fit --real data/real --fake data/fake
+    python -m src.image_model fit --real data/real --fake data/fake --model-dir models/best_text_audio_mfcc
+
+Images are decoded to grayscale, resized so the short side is IMAGE_SIZE,
+center-cropped and normalized into one (n, IMAGE_SIZE, IMAGE_SIZE) float32
+batch; every feature is then computed on the whole batch at once with
+NumPy FFTs and array ops. Generated and heavily re-synthesized images tend
+to show it in the high-frequency end of the spectrum (upsampling
+artifacts, missing sensor noise), which these features summarize.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+IMAGE_MODEL_FILE = "image_model.joblib"
+IMAGE_SIZE = 256
+N_RADIAL_BINS = 32
+BLOCK = 8  # JPEG block size
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+_RADIAL_INDEX = {}
+
+
+# ----------------------- Preprocessing -----------------------
+def _decode(path, size: int) -> np.ndarray:
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img = img.convert("L")
+        w, h = img.size
+        scale = size / min(w, h)
+        if scale != 1.0:
+            img = img.resize((max(size, round(w * scale)), max(size, round(h * scale))), Image.BILINEAR)
+        w, h = img.size
+        left, top = (w - size) // 2, (h - size) // 2
+        img = img.crop((left, top, left + size, top + size))
+        return np.asarray(img, dtype=np.uint8)
+
+
+def load_images(paths, size: int = IMAGE_SIZE) -> np.ndarray:
+    """Decode `paths` into one (n, size, size) float32 batch, normalized per image."""
+    batch = np.empty((len(paths), size, size), dtype=np.uint8)
+    for i, path in enumerate(paths):
+        batch[i] = _decode(path, size)
+    return normalize(batch)
+
+
+def normalize(batch: np.ndarray) -> np.ndarray:
+    """Zero mean, unit variance per image."""
+    x = batch.astype(np.float32) / 255.0
+    x -= x.mean(axis=(1, 2), keepdims=True)
+    x /= x.std(axis=(1, 2), keepdims=True) + 1e-6
+    return x
+
+# ----------------------- Features -----------------------
+def _radial_index(size: int):
+    """Radial frequency bin of every rfft2 coefficient, and the bin counts."""
+    if size not in _RADIAL_INDEX:
+        fy = np.fft.fftfreq(size)[:, None]
+        fx = np.fft.rfftfreq(size)[None, :]
+        radius = np.sqrt(fx ** 2 + fy ** 2) / 0.5  # 1.0 = Nyquist along an axis
+        bins = np.minimum((radius * N_RADIAL_BINS).astype(np.int64), N_RADIAL_BINS - 1).ravel()
+        _RADIAL_INDEX[size] = (bins, np.bincount(bins, minlength=N_RADIAL_BINS))
+    return _RADIAL_INDEX[size]
+
+
+def radial_spectrum(x: np.ndarray) -> np.ndarray:
+    """Azimuthally averaged log power spectrum, (n, N_RADIAL_BINS)."""
+    n, size, _ = x.shape
+    bins, counts = _radial_index(size)
+    window = np.hanning(size).astype(np.float32)
+    spec = np.fft.rfft2(x * np.outer(window, window), axes=(1, 2))
+    log_power = np.log1p(spec.real ** 2 + spec.imag ** 2).reshape(n, -1)
+
+    # One bincount over (image, bin) pairs instead of a loop per image
+    flat = (np.arange(n)[:, None] * N_RADIAL_BINS + bins[None, :]).ravel()
+    sums = np.bincount(flat, weights=log_power.ravel(), minlength=n * N_RADIAL_BINS)
+    return sums.reshape(n, N_RADIAL_BINS) / counts
+
+
+def residual_stats(x: np.ndarray) -> np.ndarray:
+    """Variance, kurtosis and mean |.| of the high-pass residual (x minus 3x3 box blur), (n, 3)."""
+    padded = np.pad(x, ((0, 0), (1, 1), (1, 1)), mode="reflect")
+    blur = sum(
+        padded[:, 1 + dy: 1 + dy + x.shape[1], 1 + dx: 1 + dx + x.shape[2]]
+        for dy in (-1, 0, 1) for dx in (-1, 0, 1)
+    ) / 9.0
+    r = (x - blur).reshape(len(x), -1)
+    var = r.var(axis=1)
+    kurt = ((r - r.mean(axis=1, keepdims=True)) ** 4).mean(axis=1) / (var ** 2 + 1e-12)
+    return np.column_stack([np.log(var + 1e-12), np.log(kurt + 1e-12), np.abs(r).mean(axis=1)])
+
+
+def blockiness(x: np.ndarray) -> np.ndarray:
+    """Ratio of gradient energy across 8-pixel block edges to inside blocks, (n, 2) for rows/cols."""
+    out = []
+    for axis in (1, 2):
+        grad = np.abs(np.diff(x, axis=axis))
+        pos = np.arange(grad.shape[axis]) % BLOCK == BLOCK - 1
+        edge = np.compress(pos, grad, axis=axis).mean(axis=(1, 2))
+        inner = np.compress(~pos, grad, axis=axis).mean(axis=(1, 2))
+        out.append(edge / (inner + 1e-6))
+    return np.column_stack(out)
+
+
+def extract_features(x: np.ndarray) -> np.ndarray:
+    """Feature matrix for a normalized (n, size, size) batch."""
+    spectrum = radial_spectrum(x)
+    # Spectrum slope relative to the low band, so overall contrast cancels out
+    rel = spectrum - spectrum[:, 1:4].mean(axis=1, keepdims=True)
+    high_ratio = spectrum[:, -8:].mean(axis=1) - spectrum[:, 8:16].mean(axis=1)
+    return np.column_stack([rel, high_ratio, residual_stats(x), blockiness(x)]).astype(np.float32)
+
+
+def image_features(paths, size: int = IMAGE_SIZE) -> np.ndarray:
+    return extract_features(load_images(paths, size))
+
+# ----------------------- Prediction -----------------------
+def image_result(prob_fake: float, inv: dict) -> dict:
+    proba = [1.0 - prob_fake, prob_fake]
+    idx = int(prob_fake >= 0.5)
+    return {
+        "prediction": inv[idx],
+        "confidence": float(proba[idx]),
+        "prob_real": float(proba[0]),
+        "prob_fake": float(proba[1]),
+        "transcript": "",
+        "image_model": True,
+    }
+
+# ----------------------- Training -----------------------
+def list_images(directory) -> list:
+    return sorted(str(p) for p in Path(directory).rglob("*") if p.suffix.lower() in IMAGE_SUFFIXES)
+
+
+def fit_image_model(real_dir, fake_dir, model_dir, C: float = 1.0, batch_size: int = 64,
+                    holdout: float = 0.2, seed: int = 0, log=sys.stderr):
+    """Extract features in batches, fit scaler + logistic regression and save it in `model_dir`."""
+    import joblib
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    real, fake = list_images(real_dir), list_images(fake_dir)
+    paths = real + fake
+    y = np.array([0] * len(real) + [1] * len(fake))
+    if not real or not fake:
+        raise ValueError("need at least one real and one fake image")
+
+    X = np.vstack([
+        image_features(paths[i:i + batch_size])
+        for i in range(0, len(paths), batch_size)
+    ])
+    print(f"[image] {len(real)} real / {len(fake)} fake images, {X.shape[1]} features", file=log)
+
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(paths))
+    n_test = int(len(paths) * holdout)
+    if n_test:
+        test, train = order[:n_test], order[n_test:]
+        probe = make_pipeline(StandardScaler(), LogisticRegression(C=C, max_iter=2000))
+        probe.fit(X[train], y[train])
+        print(f"[image] holdout accuracy {probe.score(X[test], y[test]):.3f} on {n_test} images", file=log)
+
+    pipeline = make_pipeline(StandardScaler(), LogisticRegression(C=C, max_iter=2000))
+    pipeline.fit(X, y)
+    out = Path(model_dir) / IMAGE_MODEL_FILE
+    joblib.dump({"pipeline": pipeline, "size": IMAGE_SIZE, "n_features": X.shape[1]}, out)
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the image detector.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    fit = sub.add_parser("fit", help=f"fit {IMAGE_MODEL_FILE} from folders of real and fake images")
+    fit.add_argument("--real", required=True, help="directory of authentic images (searched recursively)")
+    fit.add_argument("--fake", required=True, help="directory of generated/manipulated images")
+    fit.add_argument("--model-dir", default="models/best_text_audio_mfcc")
+    fit.add_argument("-C", type=float, default=1.0)
+    fit.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    out = fit_image_model(args.real, args.fake, args.model_dir, C=args.C, batch_size=args.batch_size)
+    print(f"saved {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+import contextvars
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+_TRACE = contextvars.ContextVar("trace", default=None)
+
+# Process-wide call count, wall and CPU time per stage, kept whether or not tracing is on
+_TOTALS = {}
+_TOTALS_LOCK = threading.Lock()
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # KiB on Linux
+
+
+def _cpu_seconds() -> float:
+    """
+    CPU time of every thread in this process (torch/BLAS pools included)
+    plus finished child processes such as ffmpeg. Other jobs running in
+    the same process at the same time are counted too.
+    """
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+def _rss_bytes():
+    """Current resident set size, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _hwm_bytes():
+    """Resident high-water mark since start or the last reset (VmHWM), or None without /proc."""
+    try:
+        with open("/proc/self/status", "rb") as f:
+            for line in f:
+                if line.startswith(b"VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _reset_hwm() -> bool:
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")  # resets VmHWM to the current RSS (Linux >= 4.0)
+        return True
+    except OSError:
+        return False
+
+
+class _Peak:
+    __slots__ = ("bytes",)
+
+    def __init__(self, n_bytes: int):
+        self.bytes = n_bytes
+
+
+# Peaks of the stages currently open. Resetting VmHWM is process-wide, so every
+# reset first folds the high-water mark so far into all open stages.
+_OPEN_PEAKS = set()
+_PEAK_LOCK = threading.Lock()
+_PEAK_RESETTABLE = _hwm_bytes() is not None and _reset_hwm()
+
+
+def _peak_begin():
+    """Start tracking the peak RSS of a stage; None where VmHWM cannot be reset."""
+    if not _PEAK_RESETTABLE:
+        return None
+    with _PEAK_LOCK:
+        hwm = _hwm_bytes() or 0
+        for peak in _OPEN_PEAKS:
+            peak.bytes = max(peak.bytes, hwm)
+        _reset_hwm()
+        peak = _Peak(_hwm_bytes() or 0)
+        _OPEN_PEAKS.add(peak)
+        return peak
+
+
+def _peak_end(peak):
+    """Peak RSS in bytes since `_peak_begin()` returned `peak`."""
+    if peak is None:
+        return None
+    with _PEAK_LOCK:
+        _OPEN_PEAKS.discard(peak)
+        return max(peak.bytes, _hwm_bytes() or 0)
+
+
+def _mb(n_bytes):
+    return None if n_bytes is None else round(n_bytes / (1024 * 1024), 1)
+
+
+class _Counted:
+    """Stage context used without a trace: only feeds the process-wide totals."""
+
+    __slots__ = ("name", "wall0", "cpu0")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.wall0 = time.perf_counter()
+        self.cpu0 = _cpu_seconds()
+
+    def __exit__(self, *exc):
+        _add_totals(self.name, time.perf_counter() - self.wall0, _cpu_seconds() - self.cpu0)
+        return False
+
+# ----------------------- Trace -----------------------
+class Trace:
+    """
+    Wall time, CPU time and memory for each pipeline stage of one request.
+
+    Per stage: `cpu_s` is process CPU time including worker threads and
+    ffmpeg children (exact when one job runs per process at a time, as in
+    scan workers); `peak_rss_mb` is the process's resident high-water mark
+    while the stage ran (VmHWM, reset at stage entry; None where the
+    kernel does not allow resetting it), `end_rss_mb` the RSS at exit and
+    `rss_delta_mb` the change from entry to exit.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._depth = 0
+
+    @contextmanager
+    def stage(self, name: str):
+        depth = self._depth
+        self._depth += 1
+        rss0 = _rss_bytes()
+        peak = _peak_begin()
+        wall0 = time.perf_counter()
+        cpu0 = _cpu_seconds()
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            wall_s = time.perf_counter() - wall0
+            cpu_s = _cpu_seconds() - cpu0
+            rss1 = _rss_bytes()
+            record = {
+                "stage": name,
+                "depth": depth,
+                "wall_s": round(wall_s, 6),
+                "cpu_s": round(cpu_s, 6),
+                "peak_rss_mb": _mb(_peak_end(peak)),
+                "end_rss_mb": _mb(rss1),
+                "rss_delta_mb": _mb(rss1 - rss0) if rss0 is not None and rss1 is not None else None,
+            }
+            self.records.append(record)
+            _add_totals(name, wall_s, cpu_s)
+
+    def summary(self) -> dict:
+        """`timings` block for a result dict."""
+        total = sum(r["wall_s"] for r in self.records if r["depth"] == 0)
+        peaks = [r["peak_rss_mb"] for r in self.records if r["peak_rss_mb"] is not None]
+        return {
+            "stages": list(self.records),
+            "total_wall_s": round(total, 6),
+            "peak_rss_mb": max(peaks, default=None),
+        }
+
+
+def stage(name: str):
+    """Time a stage into the active trace, or only into the process-wide totals without one."""
+    trace = _TRACE.get()
+    if trace is None:
+        return _Counted(name)
+    return trace.stage(name)
+
+
+@contextmanager
+def tracing():
+    """Collect stage timings for everything run inside this block."""
+    trace = Trace()
+    token = _TRACE.set(trace)
+    try:
+        yield trace
+    finally:
+        _TRACE.reset(token)
+
+# ----------------------- Export -----------------------
+def _add_totals(name: str, wall_s: float, cpu_s: float):
+    with _TOTALS_LOCK:
+        t = _TOTALS.setdefault(name, {"count": 0, "wall_s": 0.0, "cpu_s": 0.0})
+        t["count"] += 1
+        t["wall_s"] += wall_s
+        t["cpu_s"] += cpu_s
+
+
+def totals() -> dict:
+    with _TOTALS_LOCK:
+        return {k: dict(v) for k, v in _TOTALS.items()}
+
+
+def prometheus_text(extra_gauges: dict = None) -> str:
+    """Stage totals in the Prometheus text exposition format."""
+    lines = [
+        "# HELP deepfake_stage_calls_total Pipeline stage executions.",
+        "# TYPE deepfake_stage_calls_total counter",
+    ]
+    snapshot = totals()
+    for name, t in sorted(snapshot.items()):
+        lines.append(f'deepfake_stage_calls_total{{stage="{name}"}} {t["count"]}')
+    lines += [
+        "# HELP deepfake_stage_wall_seconds_total Wall-clock time spent per stage.",
+        "# TYPE deepfake_stage_wall_seconds_total counter",
+    ]
+    for name, t in sorted(snapshot.items()):
+        lines.append(f'deepfake_stage_wall_seconds_total{{stage="{name}"}} {t["wall_s"]:.6f}')
+    lines += [
+        "# HELP deepfake_stage_cpu_seconds_total Process and child-process CPU time spent per stage.",
+        "# TYPE deepfake_stage_cpu_seconds_total counter",
+    ]
+    for name, t in sorted(snapshot.items()):
+        lines.append(f'deepfake_stage_cpu_seconds_total{{stage="{name}"}} {t["cpu_s"]:.6f}')
+    lines += [
+        "# HELP deepfake_peak_rss_bytes Peak resident set size of this process.",
+        "# TYPE deepfake_peak_rss_bytes gauge",
+        f"deepfake_peak_rss_bytes {_peak_rss_bytes()}",
+    ]
+    for name, value in (extra_gauges or {}).items():
+        lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+_TRACE_FILE_LOCK = threading.Lock()
+
+
+def append_trace(path: str, summary: dict, **labels):
+    """Append one traced request as a JSON line."""
+    row = {"ts": time.time(), **labels, **summary}
+    with _TRACE_FILE_LOCK, open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(row) + "\n")
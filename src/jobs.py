@@ -0,0 +1,245 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from src import config
+from src import stages
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+# Job databases under CACHE_ROOT: the UI queue and the HTTP service's queue
+JOBS_DB = "jobs.sqlite3"
+SERVICE_JOBS_DB = "service_jobs.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          TEXT PRIMARY KEY,
+    status      TEXT NOT NULL,
+    stage       TEXT,
+    media_path  TEXT NOT NULL,
+    options     TEXT NOT NULL,
+    result      TEXT,
+    error       TEXT,
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL,
+    owner       TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+"""
+
+
+@lru_cache(maxsize=1)
+def _boot_id() -> str:
+    try:
+        with open("/proc/sys/kernel/random/boot_id", encoding="ascii") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name != "posix":
+        return True  # no cheap probe (os.kill would terminate it on Windows); assume alive
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass  # e.g. EPERM: exists but belongs to another user
+    return True
+
+
+def owner_id() -> str:
+    """Identifies the calling process: host, boot and pid (evaluated per call, so forks get their own)."""
+    return f"{socket.gethostname()}:{_boot_id()}:{os.getpid()}"
+
+
+def owner_alive(owner) -> bool:
+    """
+    False when `owner`'s process is known to be gone: a previous boot of
+    this host, or a pid that no longer exists. Jobs from other hosts, and
+    owners this process cannot check, count as alive.
+    """
+    parts = (owner or "").rsplit(":", 2)
+    if len(parts) != 3 or not parts[2].isdigit():
+        return False  # written before jobs recorded an owner
+    host, boot, pid = parts
+    if host != socket.gethostname():
+        return True
+    if boot != _boot_id():
+        return False
+    return int(pid) == os.getpid() or _pid_alive(int(pid))
+
+
+class QueueFull(RuntimeError):
+    """Raised when too many jobs are already queued or running."""
+
+
+# ----------------------- Job Store -----------------------
+class JobStore:
+    """SQLite table of jobs, so status survives reruns and page navigation."""
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+            columns = {row["name"] for row in db.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:
+                db.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+
+    def _connect(self):
+        db = sqlite3.connect(self.db_path, timeout=30)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.row_factory = sqlite3.Row
+        return db
+
+    def create(self, media_path: str, options: dict, owner: str = None) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as db:
+            db.execute(
+                "INSERT INTO jobs (id, status, stage, media_path, options, created_at, updated_at, owner) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, None, str(media_path), json.dumps(options), now, now, owner or owner_id()),
+            )
+        return job_id
+
+    def update(self, job_id: str, **fields):
+        fields["updated_at"] = time.time()
+        if "result" in fields and fields["result"] is not None:
+            fields["result"] = json.dumps(fields["result"], ensure_ascii=False)
+        cols = ", ".join(f"{k} = ?" for k in fields)
+        with self._connect() as db:
+            db.execute(f"UPDATE jobs SET {cols} WHERE id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id: str):
+        with self._connect() as db:
+            row = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["options"] = json.loads(job["options"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def active_media_paths(self) -> set:
+        """Input files of jobs that are queued or running."""
+        with self._connect() as db:
+            rows = db.execute("SELECT media_path FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)).fetchall()
+        return {row[0] for row in rows}
+
+    def fail_interrupted(self):
+        """
+        Fail jobs left queued/running by processes that have exited; they
+        will never finish. Jobs of other live processes sharing this
+        database are left alone.
+        """
+        with self._connect() as db:
+            rows = db.execute("SELECT id, owner FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)).fetchall()
+            now = time.time()
+            db.executemany(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ? AND status IN (?, ?)",
+                [
+                    (FAILED, "interrupted by restart", now, row["id"], QUEUED, RUNNING)
+                    for row in rows if not owner_alive(row["owner"])
+                ],
+            )
+
+    def prune(self, older_than_s: float):
+        with self._connect() as db:
+            db.execute("DELETE FROM jobs WHERE updated_at < ?", (time.time() - older_than_s,))
+
+# ----------------------- Job Queue -----------------------
+class JobQueue:
+    """
+    Bounded pool of inference workers fed from the job store.
+
+    `submit()` returns a job id immediately; callers poll `get()` for the
+    status and current pipeline stage. At most `max_workers` predictions run
+    at once, and no more than `max_pending` jobs may be queued or running.
+    Finished results are also written to the detection history.
+    """
+
+    def __init__(self, store: JobStore, max_workers: int = 2, max_pending: int = 16):
+        self.store = store
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.owner = owner_id()  # the workers below run in this process
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="deepfake-job")
+        self._lock = threading.Lock()
+        self._active = 0
+
+    def submit(self, media_path: str, name: str = None, **options) -> str:
+        with self._lock:
+            if self._active >= self.max_pending:
+                raise QueueFull(f"{self._active} jobs already in progress; try again shortly")
+            self._active += 1
+        job_id = self.store.create(media_path, options, owner=self.owner)
+        self._pool.submit(self._run, job_id, media_path, options, name)
+        return job_id
+
+    def get(self, job_id: str):
+        return self.store.get(job_id)
+
+    def pending(self) -> int:
+        return self._active
+
+    def _run(self, job_id: str, media_path: str, options: dict, name: str = None):
+        def on_stage(stage):
+            self.store.update(job_id, stage=stage)
+
+        try:
+            from src.app_predict import predict_media
+            self.store.update(job_id, status=RUNNING)
+            with stages.listening(on_stage):
+                result = predict_media(media_path, **options)
+            self.store.update(job_id, status=DONE, stage=None, result=result)
+            self._record_history(media_path, result, options, name)
+        except Exception as e:
+            self.store.update(job_id, status=FAILED, error=f"{type(e).__name__}: {e}")
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    @staticmethod
+    def _record_history(media_path: str, result: dict, options: dict, name: str = None):
+        if not config.HISTORY_ENABLED:
+            return
+        from src.app_predict import media_kind
+        from src.history import get_history
+        from src.result_cache import sha256_file
+
+        try:
+            content_hash = result.get("content_hash") or options.get("content_hash") or sha256_file(media_path)
+            get_history().record(
+                result, content_hash,
+                name=name or Path(media_path).name,
+                media_type=media_kind(media_path),
+                media_path=media_path,
+            )
+        except Exception:
+            pass  # the history is a convenience; never fail a finished job over it
+
+
+_QUEUE = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def get_queue() -> JobQueue:
+    """Process-wide job queue, created on first use."""
+    global _QUEUE
+    with _QUEUE_LOCK:
+        if _QUEUE is None:
+            store = JobStore(config.CACHE_ROOT / JOBS_DB)
+            store.fail_interrupted()
+            store.prune(config.JOB_RETENTION_S)
+            _QUEUE = JobQueue(store, max_workers=config.JOB_WORKERS, max_pending=config.JOB_MAX_PENDING)
+        return _QUEUE
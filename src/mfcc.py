@@ -0,0 +1,198 @@
+import numpy as np
+
+# librosa.feature.mfcc defaults used when the bundle was trained
+N_FFT = 2048
+HOP_LENGTH = 512
+N_MELS = 128
+TOP_DB = 80.0
+AMIN = 1e-10
+
+
+# ----------------------- MFCC Engine -----------------------
+class MfccEngine:
+    """
+    NumPy re-implementation of `librosa.feature.mfcc` with its default settings.
+
+    The mel filterbank, Hann window and DCT-II matrix are built once, so the
+    same engine can be reused across frames, windows and files. Frames are
+    centred with zero padding, like librosa >= 0.10 (`pad_mode="constant"`).
+    """
+
+    def __init__(self, sr: int, n_mfcc: int, n_fft: int = N_FFT, hop_length: int = HOP_LENGTH,
+                 n_mels: int = N_MELS, top_db: float = TOP_DB, fft_workers: int = 1):
+        import librosa
+
+        self.sr = sr
+        self.n_mfcc = n_mfcc
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.n_mels = n_mels
+        self.top_db = top_db
+        self.fft_workers = fft_workers
+
+        self.window = librosa.filters.get_window("hann", n_fft, fftbins=True).astype(np.float32)
+        self.mel_basis = librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=n_mels)  # (n_mels, 1 + n_fft//2)
+        self.dct = _dct2_ortho(n_mels)[:n_mfcc]  # (n_mfcc, n_mels)
+
+    # ---- frame-level pieces ----
+    def frames(self, y: np.ndarray) -> np.ndarray:
+        """Centred, zero-padded frames of a whole clip: (n_frames, n_fft)."""
+        pad = self.n_fft // 2
+        y = np.pad(y.astype(np.float32, copy=False), (pad, pad))
+        return _frame(y, self.n_fft, self.hop_length)
+
+    def mel_power(self, frames: np.ndarray) -> np.ndarray:
+        """Mel power spectrogram for a block of frames: (n_frames, n_mels)."""
+        import scipy.fft
+
+        # scipy's pocketfft stays in single precision for float32 input and can split rows across threads
+        spec = scipy.fft.rfft(frames * self.window, n=self.n_fft, axis=-1, workers=self.fft_workers)
+        power = (spec.real ** 2 + spec.imag ** 2).astype(np.float32)
+        return power @ self.mel_basis.T
+
+    def floor_db(self, max_mel_power: float) -> float:
+        """dB floor that `power_to_db(top_db=80)` applies for a clip with this peak."""
+        return 10.0 * np.log10(max(AMIN, max_mel_power)) - self.top_db
+
+    def mfcc_frames(self, mel_power: np.ndarray, floor_db: float) -> np.ndarray:
+        """MFCC per frame given the clip-wide dB floor: (n_frames, n_mfcc)."""
+        log_mel = 10.0 * np.log10(np.maximum(AMIN, mel_power))
+        log_mel = np.maximum(log_mel, floor_db)
+        return log_mel @ self.dct.T
+
+    # ---- whole-clip features ----
+    def stats(self, y: np.ndarray) -> np.ndarray:
+        """Mean + std per coefficient for one clip, like `app_predict.mfcc_stats`."""
+        if y is None or y.size == 0:
+            return np.zeros(self.n_mfcc * 2, dtype=np.float32)
+        mel = self.mel_power(self.frames(y))
+        mfcc = self.mfcc_frames(mel, self.floor_db(float(mel.max())))
+        feat = np.concatenate([mfcc.mean(axis=0), mfcc.std(axis=0)], axis=0)
+        return feat.astype(np.float32)
+
+    def stats_batch(self, ys, block_frames: int = 256) -> np.ndarray:
+        """
+        `stats()` for many clips at once: (len(ys), 2 * n_mfcc).
+
+        Frames of all clips are packed back to back (no padding to the
+        longest clip) into blocks of `block_frames`, so the FFT and the mel
+        projection run once per block rather than once per clip. The dB
+        floor, DCT and mean/std are then applied per clip through segment
+        reductions over the stacked frames.
+        """
+        out = np.zeros((len(ys), self.n_mfcc * 2), dtype=np.float32)
+        clips = [(i, self.frames(y)) for i, y in enumerate(ys) if y is not None and y.size]
+        clips = [(i, f) for i, f in clips if len(f)]
+        if not clips:
+            return out
+        counts = np.array([len(f) for _, f in clips])
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+        mel = np.empty((int(counts.sum()), self.n_mels), dtype=np.float32)
+        block = np.empty((min(block_frames, len(mel)), self.n_fft), dtype=np.float32)
+        filled = done = 0
+        for _, frames in clips:
+            pos = 0
+            while pos < len(frames):
+                take = min(len(frames) - pos, len(block) - filled)
+                block[filled:filled + take] = frames[pos:pos + take]
+                filled += take
+                pos += take
+                if filled == len(block):
+                    mel[done:done + filled] = self.mel_power(block)
+                    done += filled
+                    filled = 0
+        if filled:
+            mel[done:done + filled] = self.mel_power(block[:filled])
+
+        peaks = np.maximum.reduceat(mel.max(axis=1), starts)
+        floors = 10.0 * np.log10(np.maximum(AMIN, peaks)) - self.top_db
+        log_mel = 10.0 * np.log10(np.maximum(AMIN, mel))
+        np.maximum(log_mel, np.repeat(floors, counts)[:, None].astype(np.float32), out=log_mel)
+        mfcc = log_mel @ self.dct.T
+
+        # reduceat sums sequentially, so accumulate in float64 to stay at np.mean's precision
+        mfcc = mfcc.astype(np.float64)
+        mean = np.add.reduceat(mfcc, starts, axis=0) / counts[:, None]
+        centred = mfcc - np.repeat(mean, counts, axis=0)
+        std = np.sqrt(np.add.reduceat(centred * centred, starts, axis=0) / counts[:, None])
+        out[[i for i, _ in clips]] = np.concatenate([mean, std], axis=1)
+        return out
+
+
+def _frame(y: np.ndarray, n_fft: int, hop_length: int) -> np.ndarray:
+    n_frames = 1 + (len(y) - n_fft) // hop_length
+    if n_frames <= 0:
+        return np.zeros((0, n_fft), dtype=y.dtype)
+    return np.lib.stride_tricks.as_strided(
+        y,
+        shape=(n_frames, n_fft),
+        strides=(y.strides[0] * hop_length, y.strides[0]),
+        writeable=False,
+    )
+
+
+def _dct2_ortho(n: int) -> np.ndarray:
+    """Orthonormal DCT-II matrix, equivalent to scipy.fft.dct(type=2, norm='ortho')."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    m = np.cos(np.pi * k * (2 * i + 1) / (2 * n)) * np.sqrt(2.0 / n)
+    m[0] /= np.sqrt(2.0)
+    return m.astype(np.float32)
+
+# ----------------------- Streaming Helpers -----------------------
+class StreamFramer:
+    """
+    Turns consecutive waveform chunks into the same frames `MfccEngine.frames`
+    would produce for the concatenated clip, keeping only one frame of overlap.
+    """
+
+    def __init__(self, n_fft: int = N_FFT, hop_length: int = HOP_LENGTH):
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self._buf = np.zeros(n_fft // 2, dtype=np.float32)  # left centre padding
+
+    def push(self, chunk: np.ndarray) -> np.ndarray:
+        self._buf = np.concatenate([self._buf, chunk.astype(np.float32, copy=False)])
+        return self._drain()
+
+    def finish(self) -> np.ndarray:
+        self._buf = np.concatenate([self._buf, np.zeros(self.n_fft // 2, dtype=np.float32)])
+        return self._drain()
+
+    def _drain(self) -> np.ndarray:
+        frames = _frame(self._buf, self.n_fft, self.hop_length)
+        if len(frames):
+            out = frames.copy()
+            self._buf = self._buf[len(frames) * self.hop_length:]
+            return out
+        return frames
+
+
+class RunningStats:
+    """Mean/std over rows, merged chunk by chunk (Chan et al.) in float64."""
+
+    def __init__(self, dim: int):
+        self.n = 0
+        self.mean = np.zeros(dim, dtype=np.float64)
+        self.m2 = np.zeros(dim, dtype=np.float64)
+
+    def update(self, rows: np.ndarray):
+        if len(rows) == 0:
+            return
+        rows = rows.astype(np.float64, copy=False)
+        n_b = len(rows)
+        mean_b = rows.mean(axis=0)
+        m2_b = ((rows - mean_b) ** 2).sum(axis=0)
+
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean = self.mean + delta * (n_b / n)
+        self.m2 = self.m2 + m2_b + delta ** 2 * (self.n * n_b / n)
+        self.n = n
+
+    def features(self) -> np.ndarray:
+        if self.n == 0:
+            return np.zeros(self.mean.size * 2, dtype=np.float32)
+        std = np.sqrt(self.m2 / self.n)
+        return np.concatenate([self.mean, std]).astype(np.float32)
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Files that make up the text+audio bundle, in load order
+BUNDLE_FILES = (
+    "tfidf_vectorizer.joblib",
+    "audio_scaler.joblib",
+    "logreg_model.joblib",
+    "meta.json",
+)
+
+
+# ----------------------- Model Registry -----------------------
+class ModelRegistry:
+    """
+    Process-wide cache for the model bundle.
+
+    The bundle is unpickled once and shared by every caller. The files in
+    `model_dir` are re-stat'ed at most every `check_interval` seconds; when
+    their mtime/size changes and the content hash differs, the bundle is
+    reloaded in place. If a reload fails (a half-copied or broken bundle),
+    the error is logged and the previous bundle keeps being served until
+    the files change again.
+
+    `optional_files` are companion artifacts that may or may not exist next
+    to the bundle; they are loaded and reloaded with it and read via `extra()`.
+
+    `model_dir` may also hold the memory-mappable export written by
+    `src.compact_model`, which is used when the pickles are absent.
+    """
+
+    def __init__(self, model_dir, check_interval: float = 2.0, optional_files=()):
+        self.model_dir = Path(model_dir)
+        self.check_interval = check_interval
+        self.optional_files = tuple(optional_files)
+        self._lock = threading.RLock()
+        self._bundle = None
+        self._extras = {}
+        self._stamp = None
+        self._fingerprint = None
+        self._last_check = 0.0
+        self.load_count = 0
+        self.timings = {}
+        self.last_error = None
+
+    def _bundle_files(self):
+        # A directory without the pickles is taken to hold the compact export
+        if (self.model_dir / BUNDLE_FILES[0]).exists():
+            return BUNDLE_FILES
+        from src.compact_model import COMPACT_FILES
+        return COMPACT_FILES
+
+    def _present_files(self):
+        optional = [n for n in self.optional_files if (self.model_dir / n).exists()]
+        return list(self._bundle_files()) + optional
+
+    def _file_stamp(self):
+        stamp = []
+        for name in self._present_files():
+            st = (self.model_dir / name).stat()
+            stamp.append((name, st.st_mtime_ns, st.st_size))
+        return tuple(stamp)
+
+    def _content_hash(self) -> str:
+        h = hashlib.sha256()
+        for name in self._present_files():
+            h.update(name.encode("utf-8"))
+            with open(self.model_dir / name, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+        return h.hexdigest()
+
+    def _load(self):
+        import joblib  # pulls in numpy/scipy/sklearn pickles; keep it off the import path
+
+        timings = {}
+        t_all = time.perf_counter()
+        loaded = {}
+        compact_files = ()
+        if self._bundle_files() != BUNDLE_FILES:
+            from src.compact_model import COMPACT_FILES, load_compact
+
+            t0 = time.perf_counter()
+            loaded.update(zip(BUNDLE_FILES, load_compact(self.model_dir)))  # arrays are memory-mapped
+            timings["compact"] = time.perf_counter() - t0
+            compact_files = COMPACT_FILES
+        for name in self._present_files():
+            if name in compact_files:
+                continue
+            t0 = time.perf_counter()
+            path = self.model_dir / name
+            if name.endswith(".json"):
+                loaded[name] = json.loads(path.read_text(encoding="utf-8"))
+            else:
+                loaded[name] = joblib.load(path)
+            timings[name] = time.perf_counter() - t0
+        timings["total"] = time.perf_counter() - t_all
+        bundle = tuple(loaded.pop(name) for name in BUNDLE_FILES)
+        return bundle, loaded, timings
+
+    def get(self):
+        """Return (vec, scaler, clf, meta), loading or reloading if needed."""
+        now = time.monotonic()
+        bundle = self._bundle
+        if bundle is not None and now - self._last_check < self.check_interval:
+            return bundle
+
+        with self._lock:
+            self._last_check = now
+            if self._bundle is None:
+                return self._reload(self._file_stamp())
+            try:
+                stamp = self._file_stamp()
+                if stamp == self._stamp:
+                    return self._bundle
+                return self._reload(stamp)
+            except Exception as e:
+                # Keep serving the last good bundle; a new stamp retries on a later check
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"[models] reload from {self.model_dir} failed, keeping the loaded bundle: "
+                      f"{self.last_error}", file=sys.stderr)
+                return self._bundle
+
+    def _reload(self, stamp):
+        fingerprint = self._content_hash()
+        if self._bundle is not None and fingerprint == self._fingerprint:
+            # Files were touched but not changed
+            self._stamp = stamp
+            self.last_error = None
+            return self._bundle
+
+        try:
+            bundle, extras, timings = self._load()
+        except Exception:
+            self._stamp = stamp  # don't re-read the same broken files until they change again
+            raise
+        self._bundle = bundle
+        self._extras = extras
+        self._stamp = stamp
+        self._fingerprint = fingerprint
+        self.timings = timings
+        self.load_count += 1
+        self.last_error = None
+        return bundle
+
+    def extra(self, name: str):
+        """A loaded optional artifact, or None if it is not present."""
+        self.get()
+        return self._extras.get(name)
+
+    def fingerprint(self) -> str:
+        """SHA-256 over the bundle files currently loaded."""
+        self.get()
+        return self._fingerprint
+
+    def stats(self) -> dict:
+        return {
+            "model_dir": str(self.model_dir),
+            "loaded": self._bundle is not None,
+            "load_count": self.load_count,
+            "last_error": self.last_error,
+            "extras": sorted(self._extras),
+            "fingerprint": self._fingerprint,
+            "timings": dict(self.timings),
+        }
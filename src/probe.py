@@ -0,0 +1,184 @@
+import contextvars
+import json
+import math
+import os
+import subprocess
+import time
+from contextlib import contextmanager
+
+from src import config
+
+_DEADLINE = contextvars.ContextVar("job_deadline", default=None)
+
+
+class MediaRejected(ValueError):
+    """A file refused by admission control; `reason` is a short machine-readable code."""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+# ----------------------- Job Deadline -----------------------
+@contextmanager
+def deadline(seconds: float):
+    """Give the work in this context a wall-clock budget (<= 0 means none)."""
+    token = _DEADLINE.set(time.monotonic() + seconds if seconds and seconds > 0 else None)
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def current_deadline():
+    """Monotonic end time of the current deadline, or None."""
+    return _DEADLINE.get()
+
+
+@contextmanager
+def resume_deadline(end):
+    """Re-enter a deadline saved with current_deadline(), e.g. for a later phase of the same job."""
+    token = _DEADLINE.set(end)
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def remaining():
+    """Seconds left before the current deadline, or None without one."""
+    end = _DEADLINE.get()
+    return None if end is None else max(0.0, end - time.monotonic())
+
+
+def check_deadline(stage: str):
+    left = remaining()
+    if left is not None and left <= 0.0:
+        raise MediaRejected("timeout", f"job exceeded {config.JOB_TIMEOUT_S:g} s before {stage}")
+
+
+def run_limited(cmd, stage: str, **kwargs):
+    """subprocess.run() that kills the process when the job deadline passes."""
+    check_deadline(stage)
+    try:
+        return subprocess.run(cmd, timeout=remaining(), **kwargs)
+    except subprocess.TimeoutExpired:
+        raise MediaRejected("timeout", f"{stage} killed after exceeding the {config.JOB_TIMEOUT_S:g} s job limit")
+
+# ----------------------- Probing -----------------------
+def _float(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) and value >= 0 else None
+
+
+def _rate(value):
+    try:
+        num, den = str(value).split("/")
+        return round(int(num) / int(den), 3) if int(den) else None
+    except ValueError:
+        return _float(value)
+
+
+def probe(media_path: str, timeout_s: float = None) -> dict:
+    """
+    Container and stream metadata from one ffprobe call (no decoding).
+
+    Raises MediaRejected("corrupt") when ffprobe cannot parse the file,
+    and MediaRejected("timeout") when it does not finish in time.
+    If ffprobe is not installed, returns {"probed": False, ...} and the
+    caller proceeds without the checks that need it.
+    """
+    size = os.path.getsize(media_path)
+    cmd = [
+        "ffprobe", "-v", "error", "-print_format", "json",
+        "-show_format", "-show_streams", str(media_path),
+    ]
+    timeout_s = config.PROBE_TIMEOUT_S if timeout_s is None else timeout_s
+    try:
+        proc = subprocess.run(cmd, capture_output=True, timeout=timeout_s)
+    except FileNotFoundError:
+        return {"probed": False, "size": size, "duration": None, "has_audio": True, "has_video": None}
+    except subprocess.TimeoutExpired:
+        raise MediaRejected("timeout", f"ffprobe did not finish within {timeout_s:g} s")
+    if proc.returncode != 0:
+        message = proc.stderr.decode("utf-8", "replace").strip().splitlines()
+        raise MediaRejected("corrupt", f"unreadable container: {message[-1] if message else 'ffprobe failed'}")
+
+    data = json.loads(proc.stdout or b"{}")
+    fmt = data.get("format", {})
+    audio = [s for s in data.get("streams", []) if s.get("codec_type") == "audio"]
+    video = [
+        s for s in data.get("streams", [])
+        if s.get("codec_type") == "video" and not s.get("disposition", {}).get("attached_pic")
+    ]
+    if not audio and not video:
+        raise MediaRejected("corrupt", "no audio or video streams")
+
+    durations = [_float(fmt.get("duration"))] + [_float(s.get("duration")) for s in audio + video]
+    info = {
+        "probed": True,
+        "size": size,
+        "container": fmt.get("format_name"),
+        "duration": max((d for d in durations if d is not None), default=None),
+        "bit_rate": int(fmt["bit_rate"]) if str(fmt.get("bit_rate", "")).isdigit() else None,
+        "has_audio": bool(audio),
+        "has_video": bool(video),
+    }
+    if audio:
+        a = audio[0]
+        info["audio"] = {
+            "codec": a.get("codec_name"),
+            "sample_rate": int(a["sample_rate"]) if str(a.get("sample_rate", "")).isdigit() else None,
+            "channels": a.get("channels"),
+        }
+    if video:
+        v = video[0]
+        info["video"] = {
+            "codec": v.get("codec_name"),
+            "width": v.get("width"),
+            "height": v.get("height"),
+            "fps": _rate(v.get("avg_frame_rate")),
+        }
+    return info
+
+# ----------------------- Admission Control -----------------------
+def admit(media_path: str, kind: str) -> dict:
+    """
+    Probe a file and enforce the per-job limits before any decoding.
+
+    Returns the probe info, or raises MediaRejected for files that are too
+    large, too long or unreadable. Images are only size-checked.
+    """
+    size = os.path.getsize(media_path)
+    if size > config.MAX_MEDIA_MB * 1024 * 1024:
+        raise MediaRejected("too_large", f"{size / 1e6:.0f} MB exceeds the {config.MAX_MEDIA_MB} MB limit")
+    if kind == "image":
+        return {"probed": False, "size": size, "duration": None, "has_audio": False, "has_video": False}
+
+    info = probe(media_path)
+    duration = info["duration"]
+    if duration is not None and duration > config.MAX_DURATION_S:
+        raise MediaRejected(
+            "too_long", f"{duration / 60:.1f} min exceeds the {config.MAX_DURATION_S / 60:g} min limit"
+        )
+    return info
+
+
+def no_audio_result() -> dict:
+    """Result for media without an audio track: nothing for the audio/text model to score."""
+    return {
+        "prediction": "unknown",
+        "confidence": 0.0,
+        "prob_real": 0.0,
+        "prob_fake": 0.0,
+        "transcript": "",
+        "reason": "no audio stream",
+    }
+
+
+def media_summary(info: dict) -> dict:
+    """The probe fields worth keeping in a result."""
+    return {k: v for k, v in info.items() if k not in ("probed", "duration")}
@@ -0,0 +1,299 @@
+"""
+PDF reports for detection results, rendered on demand and cached on disk.
+
+    python -m src.reports scan results.jsonl -o reports/
+    python -m src.reports history -o reports/ --verdict fake --limit 200
+
+Reports are rendered straight to bytes (no temp files) and cached under
+CACHE_ROOT/reports as `<key>.pdf`, where the key hashes the fields the
+report shows plus REPORT_VERSION, including the identity of the media file
+it embeds (its content hash, else path, size and mtime). The cache directory is bounded: least
+recently used reports are removed once it grows past its byte budget.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+from src import config
+
+REPORT_VERSION = 2  # bump when the layout changes to invalidate cached reports
+
+EXPLANATION = (
+    "Prediction is computed using your trained models. "
+    "For audio/video, features include transcription + MFCC; "
+    "for images, frequency-domain artifact features are scored."
+)
+
+
+def _latin1(text: str) -> str:
+    # The core PDF fonts only cover latin-1
+    return str(text).encode("latin-1", "replace").decode("latin-1")
+
+
+def _media_identity(media_path, content_hash):
+    """What identifies the embedded media: None if the file is gone, else its hash or (path, size, mtime)."""
+    if not media_path:
+        return None
+    try:
+        st = Path(media_path).stat()
+    except OSError:
+        return None
+    if content_hash:
+        return content_hash
+    return [str(Path(media_path).resolve()), st.st_size, st.st_mtime_ns]
+
+
+def report_fields(result: dict) -> dict:
+    """The parts of a result that appear in its report."""
+    media_path = result.get("media_path")
+    media_id = _media_identity(media_path, result.get("content_hash"))
+    return {
+        "content_hash": result.get("content_hash"),
+        "has_media": media_id is not None,
+        "media_id": media_id,
+        "prediction": str(result.get("prediction", "UNKNOWN")).upper(),
+        "confidence": float(result.get("confidence", 0.0)),
+        "prob_real": float(result.get("prob_real", 0.0)),
+        "prob_fake": float(result.get("prob_fake", 0.0)),
+        "transcript": result.get("transcript", "") or "",
+        "media_type": result.get("media_type", "unknown"),
+        "media_name": Path(media_path).name if media_path else None,
+        "segments": [
+            [s["start"], s["end"], str(s["prediction"]).upper(), s["prob_fake"]]
+            for s in result.get("segments") or []
+        ],
+    }
+
+
+def report_key(result: dict) -> str:
+    payload = json.dumps([REPORT_VERSION, report_fields(result)], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+# ----------------------- Rendering -----------------------
+def render_pdf(result: dict) -> bytes:
+    """Render one result as a PDF document in memory."""
+    from fpdf import FPDF
+
+    f = report_fields(result)
+    media_path = result.get("media_path")
+    has_media = f["has_media"]
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", 'B', 16)
+    pdf.cell(0, 10, "Deepfake Detection Report", ln=True, align="C")
+    pdf.ln(10)
+
+    # Prediction info
+    pdf.set_font("Arial", '', 12)
+    pdf.cell(0, 10, f"Prediction: {f['prediction']}", ln=True)
+    pdf.cell(0, 10, f"Confidence (predicted class): {f['confidence'] * 100.0:.2f}%", ln=True)
+    pdf.cell(0, 10, f"REAL probability: {f['prob_real'] * 100.0:.2f}%", ln=True)
+    pdf.cell(0, 10, f"FAKE probability: {f['prob_fake'] * 100.0:.2f}%", ln=True)
+    if f["content_hash"]:
+        pdf.set_font("Arial", '', 9)
+        pdf.cell(0, 8, f"SHA-256: {f['content_hash']}", ln=True)
+        pdf.set_font("Arial", '', 12)
+    pdf.ln(5)
+
+    pdf.multi_cell(0, 8, "Explanation:\n" + EXPLANATION)
+    pdf.ln(5)
+
+    if f["segments"]:
+        pdf.multi_cell(0, 8, "Segments (start-end s: verdict, FAKE probability):\n" + "\n".join(
+            f"{s:.1f}-{e:.1f}: {verdict} ({prob * 100.0:.1f}%)" for s, e, verdict, prob in f["segments"]
+        ))
+        pdf.ln(5)
+
+    if f["transcript"].strip():
+        pdf.multi_cell(0, 8, _latin1("Transcription:\n" + f["transcript"]))
+        pdf.ln(5)
+
+    # Embed media in PDF
+    if f["media_type"] == "image" and has_media:
+        pdf.ln(5)
+        pdf.set_font("Arial", 'B', 12)
+        pdf.cell(0, 8, "Uploaded Image:", ln=True)
+        pdf.image(str(media_path), w=150)
+    elif f["media_type"] in ["video", "audio"] and has_media:
+        pdf.ln(5)
+        pdf.set_font("Arial", 'B', 12)
+        pdf.multi_cell(0, 8, _latin1(
+            f"Uploaded {f['media_type'].capitalize()}: {f['media_name']}\n(Preview not embedded in PDF)"
+        ))
+
+    out = pdf.output(dest="S")
+    # PyFPDF returns a latin-1 str, fpdf2 a bytearray
+    return out.encode("latin-1") if isinstance(out, str) else bytes(out)
+
+# ----------------------- Report Cache -----------------------
+class ReportCache:
+    """Rendered PDFs as `<key>.pdf` files, evicted least recently used first past `max_bytes`."""
+
+    def __init__(self, cache_dir, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "renders": 0, "evictions": 0}
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pdf"
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # mark as recently used
+        except OSError:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return data
+
+    def put(self, key: str, data: bytes):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            for p in self.cache_dir.glob("*.pdf"):
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, p))
+            total = sum(size for _, size, _ in entries)
+            if total <= self.max_bytes:
+                return
+            target = int(self.max_bytes * 0.9)
+            for _, size, p in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    p.unlink()
+                except OSError:
+                    continue
+                total -= size
+                self.counters["evictions"] += 1
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self.counters)
+
+
+_CACHE = None
+
+
+def get_cache() -> ReportCache:
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = ReportCache(config.CACHE_ROOT / "reports", max_bytes=config.REPORT_CACHE_MAX_MB * 1024 * 1024)
+    return _CACHE
+
+
+def cached_report(result: dict):
+    """The cached PDF for `result`, or None if it has not been rendered yet."""
+    return get_cache().get(report_key(result))
+
+
+def get_report(result: dict) -> bytes:
+    """The PDF for `result`, rendering and caching it on first request."""
+    cache = get_cache()
+    key = report_key(result)
+    data = cache.get(key)
+    if data is None:
+        data = render_pdf(result)
+        cache._count("renders")
+        cache.put(key, data)
+    return data
+
+
+def render_batch(results, out_dir=None, names=None):
+    """
+    Reports for many results, through the same cache.
+
+    With `out_dir`, each PDF is also written there (as `names[i]` or
+    `<key>.pdf`) and the paths are returned; otherwise the bytes are.
+    """
+    outputs = []
+    if out_dir is not None:
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+    for i, result in enumerate(results):
+        data = get_report(result)
+        if out_dir is None:
+            outputs.append(data)
+            continue
+        name = names[i] if names else f"{report_key(result)}.pdf"
+        path = out_dir / name
+        path.write_bytes(data)
+        outputs.append(path)
+    return outputs
+
+# ----------------------- CLI -----------------------
+def _scan_results(jsonl_path):
+    with open(jsonl_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            if "error" not in row:
+                yield dict(row, media_path=row.get("path")), Path(row["path"]).stem + ".pdf"
+
+
+def _history_results(verdict=None, min_confidence=None, limit: int = 100):
+    from src.history import get_history
+
+    store = get_history()
+    rows, before_id = [], None
+    while len(rows) < limit:
+        page, before_id = store.query(verdict=verdict, min_confidence=min_confidence,
+                                      before_id=before_id, limit=min(200, limit - len(rows)))
+        rows.extend(page)
+        if before_id is None:
+            break
+    for row in rows:
+        entry = store.get(row["id"])
+        result = dict(entry["result"], media_type=entry["media_type"], media_path=entry["media_path"])
+        yield result, f"{row['id']}_{Path(row['name'] or 'media').stem}.pdf"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render PDF reports for many results.")
+    sub = parser.add_subparsers(dest="source", required=True)
+    p_scan = sub.add_parser("scan", help="results JSONL written by src.scan")
+    p_scan.add_argument("results")
+    p_hist = sub.add_parser("history", help="entries of the detection history, newest first")
+    p_hist.add_argument("--verdict")
+    p_hist.add_argument("--min-confidence", type=float)
+    p_hist.add_argument("--limit", type=int, default=100)
+    for p in (p_scan, p_hist):
+        p.add_argument("-o", "--out-dir", required=True)
+    args = parser.parse_args(argv)
+
+    if args.source == "scan":
+        items = list(_scan_results(args.results))
+    else:
+        items = list(_history_results(args.verdict, args.min_confidence, args.limit))
+    paths = render_batch([r for r, _ in items], args.out_dir, names=[n for _, n in items])
+    stats = get_cache().stats()
+    print(f"[reports] wrote {len(paths)} reports to {args.out_dir} "
+          f"({stats['renders']} rendered, {stats['hits']} from cache)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
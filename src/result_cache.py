@@ -0,0 +1,141 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+
+# ----------------------- Hashing -----------------------
+def sha256_file(path, chunk_size: int = 1 << 20) -> str:
+    """Streaming SHA-256 of a file's bytes."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cache_key(content_hash: str, model_fingerprint: str, whisper_model: str, variant: str = "") -> str:
+    """Key a result on the media bytes plus everything that can change the verdict."""
+    raw = "\n".join([content_hash, model_fingerprint or "", whisper_model, variant])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+# ----------------------- Result Cache -----------------------
+class ResultCache:
+    """
+    Two-tier cache for `predict_media` results.
+
+    Front tier: in-memory LRU of `memory_items` dicts. Values are deep-copied
+    in and out, so callers may modify nested blocks (`timings`, `segments`,
+    ...) of what they get or put without changing the cached entry.
+    Back tier: one JSON file per key under `cache_dir`, evicted least
+    recently used first (by mtime, refreshed on every hit) once the
+    directory grows past `max_bytes`.
+    """
+
+    def __init__(self, cache_dir, memory_items: int = 256, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.memory_items = memory_items
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = None
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "puts": 0, "evictions": 0}
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _remember(self, key: str, value: dict):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str):
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                return copy.deepcopy(value)
+
+            path = self._path(key)
+            try:
+                value = json.loads(path.read_text(encoding="utf-8"))
+                os.utime(path)  # mark as recently used
+            except (OSError, ValueError):
+                self.counters["misses"] += 1
+                return None
+
+            self._remember(key, value)
+            self.counters["disk_hits"] += 1
+            return copy.deepcopy(value)
+
+    def put(self, key: str, value: dict):
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        with self._lock:
+            self._remember(key, copy.deepcopy(value))
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            try:
+                old_size = path.stat().st_size
+            except OSError:
+                old_size = 0
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+            self.counters["puts"] += 1
+
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_size()
+            else:
+                self._disk_bytes += len(data) - old_size
+            if self._disk_bytes > self.max_bytes:
+                self._evict()
+
+    def _scan_size(self) -> int:
+        return sum(p.stat().st_size for p in self.cache_dir.glob("*.json"))
+
+    def _evict(self):
+        entries = []
+        for p in self.cache_dir.glob("*.json"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)  # leave headroom so we don't evict on every put
+        for _, size, p in entries:
+            if total <= target:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            self._memory.pop(p.stem, None)
+            total -= size
+            self.counters["evictions"] += 1
+        self._disk_bytes = total
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            for p in self.cache_dir.glob("*.json"):
+                p.unlink(missing_ok=True)
+            self._disk_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.counters["memory_hits"] + self.counters["disk_hits"]
+            lookups = hits + self.counters["misses"]
+            return {
+                **self.counters,
+                "hit_rate": (hits / lookups) if lookups else 0.0,
+                "memory_items": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+            }
@@ -0,0 +1,211 @@
+"""
+Batch scanner: run the detector over a directory or manifest of media files.
+
+    python -m src.scan /data/archive -o results.jsonl --workers 4 --torch-threads 2
+    python -m src.scan manifest.txt -o results.jsonl
+
+Each worker process loads its own transcription backend once (see
+`app_predict.load_whisper`) and scores its files in small batches via
+`predict_media_batch`. Results are appended to the output as JSON lines as
+soon as a batch finishes, so an interrupted run can be resumed by
+re-running the same command: files that already have a successful line in
+the output are skipped. A batch whose worker fails is written as one
+error line per file, so the next run retries those files. Successful
+results are also written to the detection history (see `src.history`)
+unless --no-history is given.
+"""
+import argparse
+import json
+import mimetypes
+import multiprocessing as mp
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+MEDIA_PREFIXES = ("video", "audio", "image")
+
+
+# ----------------------- Input Discovery -----------------------
+def is_media(path: Path) -> bool:
+    mime_type, _ = mimetypes.guess_type(str(path))
+    return bool(mime_type) and mime_type.startswith(MEDIA_PREFIXES)
+
+
+def iter_inputs(source: str, recursive: bool = True):
+    """
+    Yield media paths from a directory, or from a manifest with one path
+    per line; relative manifest entries are taken relative to the manifest.
+    """
+    source = Path(source)
+    if source.is_dir():
+        pattern = "**/*" if recursive else "*"
+        for p in sorted(source.glob(pattern)):
+            if p.is_file() and is_media(p):
+                yield str(p.resolve())
+        return
+
+    for line in source.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield str((source.parent / line).resolve())
+
+
+def load_done(output: Path) -> set:
+    """Paths that already have a successful result in `output`."""
+    done = set()
+    if not output.exists():
+        return done
+    with open(output, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue  # partial line from an interrupted run
+            if "error" not in row and row.get("path"):
+                done.add(row["path"])
+    return done
+
+
+def chunked(items, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+# ----------------------- Worker -----------------------
+def _init_worker(torch_threads: int):
+    # Must run before torch is imported in this process
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(torch_threads)
+    os.environ["DEEPFAKE_WHISPER_THREADS"] = str(torch_threads)
+
+
+def _scan_batch(paths):
+    from src.app_predict import predict_media_batch
+    from src.result_cache import sha256_file
+
+    t0 = time.perf_counter()
+    results = predict_media_batch(paths)
+    per_file = (time.perf_counter() - t0) / max(len(paths), 1)
+
+    rows = []
+    for path, result in zip(paths, results):
+        row = dict(result)
+        row["path"] = path
+        row["elapsed_s"] = round(per_file, 4)
+        if "error" not in row and not row.get("content_hash"):
+            try:
+                row["content_hash"] = sha256_file(path)  # history is keyed on it
+            except OSError as e:
+                row = _error_row(path, e)
+        rows.append(row)
+    return rows
+
+
+def _error_row(path: str, e: BaseException) -> dict:
+    return {"error": f"{type(e).__name__}: {e}", "path": path}
+
+
+def _history_rows(rows):
+    for row in rows:
+        if "error" in row:
+            continue
+        mime_type, _ = mimetypes.guess_type(row["path"])
+        result = {k: v for k, v in row.items() if k not in ("path", "elapsed_s")}
+        yield result, row["content_hash"], Path(row["path"]).name, mime_type.split("/")[0], row["path"]
+
+# ----------------------- Driver -----------------------
+def run_scan(source, output, workers: int = 1, torch_threads: int = 1,
+             batch_size: int = 8, recursive: bool = True, history: bool = True, log=sys.stderr):
+    output = Path(output)
+    store = None
+    if history:
+        from src import config
+        from src.history import get_history
+        store = get_history() if config.HISTORY_ENABLED else None
+    done = load_done(output)
+    todo = [p for p in iter_inputs(source, recursive=recursive) if p not in done]
+    print(f"[scan] {len(todo)} files to process ({len(done)} already done)", file=log)
+    if not todo:
+        return 0
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    ctx = mp.get_context("spawn")  # fresh interpreters, so thread limits apply before torch loads
+    batches = list(chunked(todo, batch_size))
+    max_in_flight = workers * 2
+    processed = 0
+    t_start = time.perf_counter()
+
+    with open(output, "a", encoding="utf-8") as out, ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(torch_threads,),
+    ) as pool:
+        pending = {}  # future -> its batch of paths
+        next_batch = 0
+        while next_batch < len(batches) or pending:
+            while next_batch < len(batches) and len(pending) < max_in_flight:
+                try:
+                    pending[pool.submit(_scan_batch, batches[next_batch])] = batches[next_batch]
+                except BrokenProcessPool as e:
+                    # A worker died and took the pool with it; the rest are retried on the next run
+                    for paths in batches[next_batch:]:
+                        pending[_failed_future(e)] = paths
+                    next_batch = len(batches)
+                    break
+                next_batch += 1
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                paths = pending.pop(fut)
+                try:
+                    rows = fut.result()
+                except Exception as e:
+                    rows = [_error_row(path, e) for path in paths]
+                for row in rows:
+                    out.write(json.dumps(row, ensure_ascii=False) + "\n")
+                out.flush()
+                if store is not None:
+                    store.record_many(_history_rows(rows))
+                processed += len(rows)
+
+            elapsed = time.perf_counter() - t_start
+            rate = processed / elapsed * 60 if elapsed > 0 else 0.0
+            print(f"[scan] {processed}/{len(todo)} files ({rate:.1f}/min)", file=log)
+
+    return processed
+
+
+def _failed_future(e: BaseException) -> Future:
+    fut = Future()
+    fut.set_exception(e)
+    return fut
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scan media files for deepfakes and write JSONL results.")
+    parser.add_argument("source", help="directory to walk, or a manifest file with one path per line")
+    parser.add_argument("-o", "--output", required=True, help="JSONL file to append results to")
+    parser.add_argument("-w", "--workers", type=int, default=max(1, (os.cpu_count() or 1) // 2))
+    parser.add_argument("--torch-threads", type=int, default=1,
+                        help="torch/BLAS threads per worker (workers x threads should not exceed cores)")
+    parser.add_argument("--batch-size", type=int, default=8, help="files per worker task")
+    parser.add_argument("--no-recursive", action="store_true", help="only scan the top level of a directory")
+    parser.add_argument("--no-history", action="store_true", help="do not write results to the detection history")
+    args = parser.parse_args(argv)
+
+    run_scan(
+        args.source,
+        args.output,
+        workers=args.workers,
+        torch_threads=args.torch_threads,
+        batch_size=args.batch_size,
+        recursive=not args.no_recursive,
+        history=not args.no_history,
+    )
+
+
+if __name__ == "__main__":
+    main()
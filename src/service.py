@@ -0,0 +1,403 @@
+"""
+Standalone HTTP inference service, so detection can run apart from the UI.
+
+    python -m src.service --host 127.0.0.1 --port 8600
+
+Models are loaded once at startup and stay resident. Work goes through a
+bounded job queue; when it is full, submissions get 429 with Retry-After.
+
+    GET  /healthz          process is up
+    GET  /readyz           models are loaded and the queue has room (503 otherwise)
+    GET  /metrics          Prometheus text: stage totals, queue depth, request counts
+    POST /predict          multipart/form-data with a `file` part, or JSON {"path": ...}
+    GET  /jobs/<id>        job status, stage and result
+    GET  /seen/<sha256>    latest history entry for these file bytes (404 if never analysed)
+
+`/predict` returns 202 with a job id; add `?wait=SECONDS` to block until
+the result is ready (200) or the wait runs out (202); waits are capped at
+DEEPFAKE_SERVICE_MAX_WAIT_S. Options `streaming`
+and `cascade` may be given in the query string or the JSON body. Path
+submission is only accepted for files under DEEPFAKE_SERVICE_PATH_ROOTS.
+"""
+import argparse
+import email.message
+import json
+import math
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from src import config
+from src import instrument
+from src.jobs import DONE, FAILED, SERVICE_JOBS_DB, JobQueue, JobStore, QueueFull
+from src.spool import CHUNK_SIZE, get_spool
+
+_MAX_HEADER_BYTES = 16 * 1024
+_MAX_JSON_BYTES = 64 * 1024
+_WAIT_POLL_S = 0.1
+
+
+class RequestError(Exception):
+    """A client error with the HTTP status to answer with."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+# ----------------------- Multipart Upload -----------------------
+class MultipartReader:
+    """
+    Streaming reader for a multipart/form-data body.
+
+    `next_part()` advances to the next part and returns its headers;
+    `read()` then returns that part's bytes without buffering the whole
+    body, so uploads can be spooled straight to disk.
+    """
+
+    def __init__(self, rfile, length: int, boundary: bytes):
+        self._rfile = rfile
+        self._remaining = length
+        self._delim = b"\r\n--" + boundary
+        self._buf = bytearray(b"\r\n")  # lets the first boundary match the same delimiter
+        self._in_part = False
+        self._done = False
+
+    def _fill(self) -> bool:
+        if self._remaining <= 0:
+            return False
+        chunk = self._rfile.read(min(CHUNK_SIZE, self._remaining))
+        if not chunk:
+            self._remaining = 0
+            return False
+        self._remaining -= len(chunk)
+        self._buf += chunk
+        return True
+
+    def _find(self, pattern: bytes, limit: int = None) -> int:
+        while True:
+            idx = self._buf.find(pattern)
+            if idx != -1:
+                return idx
+            if limit is not None and len(self._buf) > limit:
+                raise RequestError(400, "multipart headers too large")
+            if not self._fill():
+                raise RequestError(400, "truncated multipart body")
+
+    def next_part(self):
+        """Headers (lower-cased names) of the next part, or None after the last one."""
+        if self._done:
+            return None
+        while self._in_part and self.read(CHUNK_SIZE):
+            pass
+        idx = self._find(self._delim)
+        del self._buf[:idx + len(self._delim)]
+        while len(self._buf) < 2 and self._fill():
+            pass
+        if self._buf[:2] == b"--":
+            self._done = True
+            return None
+
+        end = self._find(b"\r\n\r\n", limit=_MAX_HEADER_BYTES)
+        block = bytes(self._buf[:end]).decode("utf-8", errors="replace")
+        del self._buf[:end + 4]
+        headers = {}
+        for line in block.split("\r\n"):
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        self._in_part = True
+        return headers
+
+    def read(self, n: int = -1) -> bytes:
+        if not self._in_part:
+            return b""
+        if n is None or n < 0:
+            n = CHUNK_SIZE
+        while True:
+            idx = self._buf.find(self._delim)
+            if idx == 0:
+                self._in_part = False
+                return b""
+            # Without a delimiter in sight, hold back a tail that could be its start
+            avail = idx if idx != -1 else len(self._buf) - len(self._delim) + 1
+            if idx != -1 or avail >= n:
+                take = min(n, avail)
+                data = bytes(self._buf[:take])
+                del self._buf[:take]
+                return data
+            if not self._fill():
+                raise RequestError(400, "truncated multipart body")
+
+
+def _disposition(headers: dict):
+    """(field name, filename) from a part's Content-Disposition header."""
+    msg = email.message.Message()
+    msg["content-disposition"] = headers.get("content-disposition", "")
+    return msg.get_param("name", header="content-disposition"), msg.get_filename()
+
+
+def _boundary(content_type: str) -> bytes:
+    msg = email.message.Message()
+    msg["content-type"] = content_type
+    boundary = msg.get_param("boundary")
+    if not boundary:
+        raise RequestError(400, "multipart body without a boundary")
+    return boundary.encode("latin-1")
+
+# ----------------------- Service -----------------------
+class InferenceService:
+    """Resident models, the bounded job queue and the request counters behind the HTTP handler."""
+
+    def __init__(self, workers: int, max_pending: int, path_roots=()):
+        store = JobStore(config.CACHE_ROOT / SERVICE_JOBS_DB)
+        store.fail_interrupted()
+        store.prune(config.JOB_RETENTION_S)
+        self.queue = JobQueue(store, max_workers=workers, max_pending=max_pending)
+        self.path_roots = [Path(p).resolve() for p in path_roots if p]
+        self.ready = threading.Event()
+        self.warm_up_error = None
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self.counters = {"accepted": 0, "rejected_busy": 0, "client_errors": 0}
+
+    def warm_up(self):
+        """Load the bundle and the transcription backend before reporting ready."""
+        try:
+            from src.app_predict import warm_up
+            warm_up(include_whisper=True)
+            self.ready.set()
+        except Exception as e:
+            self.warm_up_error = f"{type(e).__name__}: {e}"
+
+    def count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def readiness(self):
+        if self.warm_up_error:
+            return False, f"warm-up failed: {self.warm_up_error}"
+        if not self.ready.is_set():
+            return False, "loading models"
+        if self.queue.pending() >= self.queue.max_pending:
+            return False, "queue full"
+        return True, "ready"
+
+    def resolve_path(self, raw: str) -> str:
+        if not self.path_roots:
+            raise RequestError(403, "path submission is disabled (set DEEPFAKE_SERVICE_PATH_ROOTS)")
+        path = Path(raw).resolve()
+        if not any(path == root or root in path.parents for root in self.path_roots):
+            raise RequestError(403, "path is outside the allowed roots")
+        if not path.is_file():
+            raise RequestError(404, "no such file")
+        return str(path)
+
+    def submit(self, media_path: str, options: dict, content_hash: str = None, name: str = None) -> str:
+        if content_hash:
+            options = dict(options, content_hash=content_hash)
+        return self.queue.submit(media_path, name=name, **options)
+
+    def wait(self, job_id: str, timeout_s: float):
+        deadline = time.monotonic() + timeout_s
+        while True:
+            job = self.queue.get(job_id)
+            if job is None or job["status"] in (DONE, FAILED) or time.monotonic() >= deadline:
+                return job
+            time.sleep(_WAIT_POLL_S)
+
+    def metrics(self) -> str:
+        with self._lock:
+            counters = dict(self.counters)
+        gauges = {
+            "deepfake_service_ready": int(self.ready.is_set()),
+            "deepfake_service_queue_pending": self.queue.pending(),
+            "deepfake_service_queue_capacity": self.queue.max_pending,
+            "deepfake_service_uptime_seconds": round(time.time() - self.started_at, 3),
+        }
+        for name, value in counters.items():
+            gauges[f"deepfake_service_requests_{name}"] = value
+        return instrument.prometheus_text(extra_gauges=gauges)
+
+# ----------------------- HTTP Handler -----------------------
+def _flag(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+def _wait_seconds(value) -> float:
+    """`?wait=` as seconds clamped to [0, DEEPFAKE_SERVICE_MAX_WAIT_S]; RequestError(400) if not a number."""
+    if value in (None, ""):
+        return 0.0
+    try:
+        wait_s = float(value)
+    except ValueError:
+        raise RequestError(400, f"`wait` must be a number of seconds, got {value!r}")
+    if math.isnan(wait_s):
+        raise RequestError(400, "`wait` must be a number of seconds, got NaN")
+    return min(max(wait_s, 0.0), config.SERVICE_MAX_WAIT_S)
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    server_version = "DeepfakeService/1.0"
+    service: InferenceService = None  # set by make_server()
+
+    def log_message(self, fmt, *args):
+        sys.stderr.write(f"[service] {self.address_string()} {fmt % args}\n")
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_text(self, status: int, text: str, content_type: str = "text/plain; version=0.0.4"):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/healthz":
+            self._send_json(200, {"status": "ok"})
+        elif url.path == "/readyz":
+            ok, reason = self.service.readiness()
+            self._send_json(200 if ok else 503, {"ready": ok, "reason": reason})
+        elif url.path == "/metrics":
+            self._send_text(200, self.service.metrics())
+        elif url.path.startswith("/jobs/"):
+            job = self.service.queue.get(url.path[len("/jobs/"):])
+            if job is None:
+                self._send_json(404, {"error": "unknown job"})
+            else:
+                self._send_json(200, _job_payload(job))
+        elif url.path.startswith("/seen/"):
+            from src.history import get_history
+
+            row = get_history().seen(url.path[len("/seen/"):])
+            if row is None:
+                self._send_json(404, {"error": "not seen before"})
+            else:
+                self._send_json(200, row)
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/predict":
+            self._send_json(404, {"error": "not found"})
+            return
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            wait_s = _wait_seconds(query.get("wait"))
+            job_id = self._submit(query)
+        except RequestError as e:
+            self.service.count("client_errors")
+            self.close_connection = True  # the body may be only partly read
+            self._send_json(e.status, {"error": str(e)})
+            return
+        except QueueFull as e:
+            self.service.count("rejected_busy")
+            self.close_connection = True
+            self._send_json(429, {"error": str(e)}, headers={"Retry-After": "5"})
+            return
+
+        self.service.count("accepted")
+        job = self.service.wait(job_id, wait_s) if wait_s > 0 else self.service.queue.get(job_id)
+        status = 200 if job["status"] in (DONE, FAILED) else 202
+        self._send_json(status, _job_payload(job), headers={"Location": f"/jobs/{job_id}"})
+
+    def _submit(self, query: dict) -> str:
+        length = int(self.headers.get("Content-Length") or 0)
+        content_type = self.headers.get("Content-Type", "")
+        options = {k: _flag(query[k]) for k in ("streaming", "cascade") if k in query}
+
+        # Refuse early when busy, before reading a large upload
+        if self.service.queue.pending() >= self.service.queue.max_pending:
+            raise QueueFull(f"{self.service.queue.pending()} jobs already in progress; try again shortly")
+
+        if content_type.startswith("application/json"):
+            if length > _MAX_JSON_BYTES:
+                raise RequestError(413, "JSON body too large")
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                raise RequestError(400, "invalid JSON body")
+            if not body.get("path"):
+                raise RequestError(400, "JSON body needs a `path`")
+            options.update({k: _flag(body[k]) for k in ("streaming", "cascade") if k in body})
+            return self.service.submit(self.service.resolve_path(body["path"]), options)
+
+        if content_type.startswith("multipart/form-data"):
+            if length > config.SERVICE_MAX_UPLOAD_MB * 1024 * 1024:
+                raise RequestError(413, f"upload larger than {config.SERVICE_MAX_UPLOAD_MB} MB")
+            reader = MultipartReader(self.rfile, length, _boundary(content_type))
+            while True:
+                headers = reader.next_part()
+                if headers is None:
+                    raise RequestError(400, "multipart body has no `file` part")
+                name, filename = _disposition(headers)
+                if name == "file" and filename:
+                    entry = get_spool().add(reader, os.path.basename(filename))
+                    return self.service.submit(str(entry.path), options, content_hash=entry.sha256, name=entry.name)
+
+        raise RequestError(415, "send multipart/form-data with a `file` part, or JSON with a `path`")
+
+
+def _job_payload(job: dict) -> dict:
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "result": job["result"],
+        "error": job["error"],
+    }
+
+# ----------------------- Entry Point -----------------------
+def make_server(host: str, port: int, service: InferenceService) -> ThreadingHTTPServer:
+    handler = type("BoundServiceHandler", (ServiceHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve deepfake detection over HTTP.")
+    parser.add_argument("--host", default=config.SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=config.SERVICE_PORT)
+    parser.add_argument("--workers", type=int, default=config.SERVICE_WORKERS,
+                        help="predictions run concurrently")
+    parser.add_argument("--max-pending", type=int, default=config.SERVICE_MAX_PENDING,
+                        help="queued + running jobs before answering 429")
+    args = parser.parse_args(argv)
+
+    service = InferenceService(
+        workers=args.workers,
+        max_pending=args.max_pending,
+        path_roots=config.SERVICE_PATH_ROOTS.split(os.pathsep),
+    )
+    threading.Thread(target=service.warm_up, name="deepfake-warm-up", daemon=True).start()
+
+    server = make_server(args.host, args.port, service)
+    print(f"[service] listening on http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
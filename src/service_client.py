@@ -0,0 +1,85 @@
+"""
+Minimal client for `src.service`, using only the standard library so the UI
+can talk to a remote inference node without importing the model code.
+"""
+import json
+import os
+import uuid
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from src.spool import CHUNK_SIZE
+
+
+class ServiceBusy(RuntimeError):
+    """The service answered 429: its job queue is full."""
+
+
+class ServiceError(RuntimeError):
+    """The service could not be reached or rejected the request."""
+
+
+class ServiceClient:
+    def __init__(self, base_url: str, timeout_s: float = 30.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout_s = timeout_s
+
+    def _request(self, method: str, path: str, data=None, headers: dict = None) -> dict:
+        req = Request(self.base_url + path, data=data, headers=headers or {}, method=method)
+        try:
+            with urlopen(req, timeout=self.timeout_s) as resp:
+                return json.loads(resp.read() or b"{}")
+        except HTTPError as e:
+            try:
+                payload = json.loads(e.read())
+            except ValueError:
+                payload = {}
+            if e.code == 503 and "ready" in payload:
+                return payload
+            message = payload.get("error", e.reason)
+            if e.code == 429:
+                raise ServiceBusy(message) from None
+            raise ServiceError(f"HTTP {e.code}: {message}") from None
+        except (URLError, OSError) as e:
+            raise ServiceError(f"cannot reach {self.base_url}: {e}") from None
+
+    def health(self) -> dict:
+        return self._request("GET", "/healthz")
+
+    def ready(self) -> dict:
+        return self._request("GET", "/readyz")
+
+    def job(self, job_id: str) -> dict:
+        return self._request("GET", f"/jobs/{job_id}")
+
+    def submit_file(self, file_path, filename: str = None, streaming: bool = False) -> str:
+        """Upload a file as multipart/form-data, streamed from disk; returns the job id."""
+        filename = filename or os.path.basename(str(file_path))
+        boundary = uuid.uuid4().hex
+        head = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode("utf-8")
+        tail = f"\r\n--{boundary}--\r\n".encode("utf-8")
+        length = len(head) + os.path.getsize(file_path) + len(tail)
+
+        def body():
+            yield head
+            with open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    yield chunk
+            yield tail
+
+        headers = {
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+            "Content-Length": str(length),
+        }
+        query = "?streaming=1" if streaming else ""
+        return self._request("POST", f"/predict{query}", data=body(), headers=headers)["job_id"]
+
+    def submit_path(self, path: str, streaming: bool = False) -> str:
+        """Submit a path the service can read itself (must be under its allowed roots)."""
+        data = json.dumps({"path": str(path), "streaming": streaming}).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        return self._request("POST", "/predict", data=data, headers=headers)["job_id"]
@@ -0,0 +1,150 @@
+import hashlib
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from src import config
+
+CHUNK_SIZE = 1 << 20
+_EVICT_EVERY_S = 60.0
+
+
+# ----------------------- Spool Entry -----------------------
+class SpoolEntry:
+    """A spooled upload: content-addressed file on disk plus its SHA-256."""
+
+    def __init__(self, path: Path, sha256: str, size: int, name: str):
+        self.path = path
+        self.sha256 = sha256
+        self.size = size
+        self.name = name
+
+    def to_dict(self) -> dict:
+        return {"path": str(self.path), "sha256": self.sha256, "size": self.size, "name": self.name}
+
+    @classmethod
+    def from_dict(cls, d: dict):
+        return cls(Path(d["path"]), d["sha256"], d["size"], d["name"])
+
+# ----------------------- Spool -----------------------
+class Spool:
+    """
+    Directory of uploads named `<sha256><ext>`.
+
+    Uploads are copied in chunks and hashed during the copy, so the bytes are
+    never duplicated in memory. Identical uploads share one file. Files idle
+    for longer than `ttl_s` are removed, then the oldest ones until the
+    directory fits in `max_bytes`.
+
+    `pinned()` returns the paths still needed by queued or running jobs;
+    those are never evicted. If it fails, only expired files are removed.
+    """
+
+    def __init__(self, spool_dir, ttl_s: float, max_bytes: int, pinned=None):
+        self.spool_dir = Path(spool_dir)
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.pinned = pinned
+        self._lock = threading.Lock()
+        self._last_evict = 0.0
+
+    def add(self, stream, name: str) -> SpoolEntry:
+        """Copy a binary file-like object into the spool."""
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        suffix = Path(name).suffix.lower()
+        tmp = self.spool_dir / f".{uuid.uuid4().hex}.part"
+
+        h = hashlib.sha256()
+        size = 0
+        if hasattr(stream, "seek"):
+            stream.seek(0)
+        with open(tmp, "wb") as out:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                h.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+
+        sha = h.hexdigest()
+        path = self.spool_dir / f"{sha}{suffix}"
+        if path.exists():
+            tmp.unlink()
+            os.utime(path)  # reused: keep it alive
+        else:
+            os.replace(tmp, path)
+
+        self.maybe_evict()
+        return SpoolEntry(path, sha, size, name)
+
+    def touch(self, entry: SpoolEntry) -> bool:
+        """Refresh an entry's TTL; False if it has already been evicted."""
+        try:
+            os.utime(entry.path)
+            return True
+        except OSError:
+            return False
+
+    def maybe_evict(self):
+        now = time.time()
+        if now - self._last_evict < _EVICT_EVERY_S:
+            return
+        self.evict(now)
+
+    def evict(self, now: float = None):
+        now = now or time.time()
+        with self._lock:
+            self._last_evict = now
+            entries = []
+            for p in self.spool_dir.iterdir():
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, p))
+            entries.sort()
+            try:
+                pinned = set(self.pinned()) if self.pinned else set()
+                size_limit = self.max_bytes
+            except Exception:
+                pinned, size_limit = set(), float("inf")  # unknown job state: only TTL expiry
+
+            total = sum(size for _, size, _ in entries)
+            for mtime, size, p in entries:
+                if str(p) in pinned:
+                    continue
+                expired = now - mtime > self.ttl_s
+                in_progress = p.name.endswith(".part")
+                if not expired and (in_progress or total <= size_limit):
+                    continue
+                try:
+                    p.unlink()
+                except OSError:
+                    continue
+                total -= size
+
+
+_SPOOL = None
+
+
+def job_inputs() -> set:
+    """Spooled paths referenced by unfinished jobs of the UI queue or the HTTP service."""
+    from src.jobs import JOBS_DB, SERVICE_JOBS_DB, JobStore
+
+    paths = set()
+    for name in (JOBS_DB, SERVICE_JOBS_DB):
+        if (config.CACHE_ROOT / name).exists():
+            paths |= JobStore(config.CACHE_ROOT / name).active_media_paths()
+    return paths
+
+
+def get_spool() -> Spool:
+    global _SPOOL
+    if _SPOOL is None:
+        _SPOOL = Spool(
+            config.CACHE_ROOT / "spool",
+            ttl_s=config.SPOOL_TTL_S,
+            max_bytes=config.SPOOL_MAX_MB * 1024 * 1024,
+            pinned=job_inputs,
+        )
+    return _SPOOL
@@ -0,0 +1,26 @@
+import contextvars
+from contextlib import contextmanager
+
+# Pipeline stages, in the order a prediction normally goes through them
+STAGES = ("probing", "extracting", "features", "transcribing", "scoring")
+
+_LISTENERS = contextvars.ContextVar("stage_listeners", default=())
+
+
+# ----------------------- Stage Events -----------------------
+@contextmanager
+def listening(callback):
+    """Call `callback(stage)` whenever the pipeline enters a stage in this context."""
+    token = _LISTENERS.set(_LISTENERS.get() + (callback,))
+    try:
+        yield
+    finally:
+        _LISTENERS.reset(token)
+
+
+def report(stage: str):
+    for callback in _LISTENERS.get():
+        try:
+            callback(stage)
+        except Exception:
+            pass  # progress reporting must never break a prediction
@@ -0,0 +1,178 @@
+import subprocess
+import threading
+
+import numpy as np
+
+from src import config
+from src import probe
+from src.mfcc import MfccEngine, RunningStats, StreamFramer
+
+DEFAULT_WINDOW_S = 30.0  # matches Whisper's own context length
+
+
+# ----------------------- Streaming Decode -----------------------
+def iter_audio_chunks(media_path: str, sr: int, chunk_samples: int):
+    """
+    Yield mono float32 chunks of `chunk_samples` from one ffmpeg pipe.
+
+    Only one chunk is held in memory at a time, whatever the clip length.
+    ffmpeg is killed if the job deadline passes mid-decode or the caller
+    stops iterating early; if it exits with an error after the last chunk,
+    CalledProcessError is raised.
+    """
+    cmd = [
+        "ffmpeg", "-nostdin", "-i", str(media_path),
+        "-vn", "-ac", "1", "-ar", str(sr), "-t", str(config.MAX_DURATION_S),
+        "-f", "s16le", "-acodec", "pcm_s16le", "-",
+    ]
+    probe.check_deadline("audio extraction")
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    timed_out = threading.Event()
+    left = probe.remaining()
+    timer = None
+    if left is not None:
+        timer = threading.Timer(left, lambda: (timed_out.set(), proc.kill()))
+        timer.daemon = True
+        timer.start()
+    n_bytes = chunk_samples * 2
+    finished = False
+    try:
+        while True:
+            data = _read_exact(proc.stdout, n_bytes)
+            if timed_out.is_set():
+                break
+            if not data:
+                break
+            yield np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+            if len(data) < n_bytes:
+                break
+        finished = True
+    finally:
+        if not finished:
+            proc.kill()  # the consumer stopped early or raised
+        proc.stdout.close()
+        proc.wait()  # still bounded by the deadline timer
+        if timer is not None:
+            timer.cancel()
+
+    if timed_out.is_set():
+        raise probe.MediaRejected(
+            "timeout", f"audio extraction killed after exceeding the {config.JOB_TIMEOUT_S:g} s job limit"
+        )
+    if proc.returncode != 0:
+        # A decode error part way through would otherwise be scored as a complete, shorter clip
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def _read_exact(stream, n: int) -> bytes:
+    parts = []
+    while n > 0:
+        data = stream.read(n)
+        if not data:
+            break
+        parts.append(data)
+        n -= len(data)
+    return b"".join(parts)
+
+# ----------------------- Streaming Analysis -----------------------
+def analyze_stream(media_path: str, window_s: float = DEFAULT_WINDOW_S):
+    """
+    Score long media in fixed windows with bounded memory.
+
+    Each window is transcribed and scored on its own, giving a per-window
+    fake probability timeline. The aggregate verdict uses the joined
+    transcript and MFCC mean/std accumulated frame by frame, which match the
+    whole-file `mfcc_stats` features.
+
+    The whole-file features clip each mel band 80 dB below the clip's peak
+    (librosa's `top_db`), which is only known at the end. The first pass
+    accumulates unclipped statistics and tracks the peak; if any frame fell
+    below the final floor, the audio is decoded a second time (no Whisper) to
+    accumulate the clipped statistics exactly.
+    """
+    from src import instrument, stages
+    from src.app_predict import WHISPER_SR, asr_info, load_bundle, mfcc_engine, score_features, transcribe_speech
+
+    meta = load_bundle()[3]
+    sr = int(meta["sr"])
+    n_mfcc = int(meta["n_mfcc"])
+    if sr != WHISPER_SR:
+        raise ValueError(f"Streaming mode needs the bundle sample rate to be {WHISPER_SR} Hz, got {sr}")
+
+    engine = mfcc_engine(sr, n_mfcc)
+    window_samples = int(window_s * sr)
+
+    framer = StreamFramer(engine.n_fft, engine.hop_length)
+    unclipped = RunningStats(n_mfcc)
+    peak = 0.0
+    min_db = np.inf
+
+    def consume(frames):
+        nonlocal peak, min_db
+        if not len(frames):
+            return
+        with instrument.stage("mfcc"):
+            mel = engine.mel_power(frames)
+            peak = max(peak, float(mel.max()))
+            min_db = min(min_db, float(10.0 * np.log10(max(1e-10, float(mel.min())))))
+            unclipped.update(engine.mfcc_frames(mel, -np.inf))
+
+    windows = []
+    speech_ratios = []
+    transcripts = []
+    window_feats = []
+    offset = 0
+    stages.report("extracting")
+    for chunk in iter_audio_chunks(media_path, sr, window_samples):
+        stages.report("features")
+        consume(framer.push(chunk))
+
+        stages.report("transcribing")
+        transcript, vad_info = transcribe_speech(chunk)
+        transcripts.append(transcript)
+        speech_ratios.append(vad_info["speech_ratio"] if vad_info else None)
+        window_feats.append(engine.stats(chunk))
+        windows.append((offset / sr, (offset + len(chunk)) / sr))
+        offset += len(chunk)
+    consume(framer.finish())
+
+    if offset == 0:
+        agg_feat = np.zeros(n_mfcc * 2, dtype=np.float32)
+    elif min_db >= engine.floor_db(peak):
+        agg_feat = unclipped.features()
+    else:
+        stages.report("features")
+        agg_feat = _clipped_stats(media_path, engine, window_samples, engine.floor_db(peak))
+
+    full_transcript = " ".join(t for t in transcripts if t).strip()
+    scored = score_features([full_transcript] + transcripts, [agg_feat] + window_feats)
+
+    result = scored[0]
+    result["streaming"] = True
+    result["asr"] = asr_info()
+    result["duration"] = offset / sr
+    result["segments"] = [
+        {
+            "start": round(start, 3),
+            "end": round(end, 3),
+            "prediction": seg["prediction"],
+            "prob_fake": seg["prob_fake"],
+            "speech_ratio": ratio,
+            "transcript": seg["transcript"],
+        }
+        for (start, end), ratio, seg in zip(windows, speech_ratios, scored[1:])
+    ]
+    return result
+
+
+def _clipped_stats(media_path: str, engine: MfccEngine, chunk_samples: int, floor_db: float) -> np.ndarray:
+    framer = StreamFramer(engine.n_fft, engine.hop_length)
+    stats = RunningStats(engine.n_mfcc)
+    for chunk in iter_audio_chunks(media_path, engine.sr, chunk_samples):
+        frames = framer.push(chunk)
+        if len(frames):
+            stats.update(engine.mfcc_frames(engine.mel_power(frames), floor_db))
+    frames = framer.finish()
+    if len(frames):
+        stats.update(engine.mfcc_frames(engine.mel_power(frames), floor_db))
+    return stats.features()
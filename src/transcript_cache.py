@@ -0,0 +1,168 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Fingerprint settings (16 kHz input): 32 bits per 32 ms hop, from 33 log-spaced
+# bands between 300 Hz and 3 kHz where speech energy and codec fidelity are highest.
+FP_N_FFT = 2048
+FP_HOP = 512
+FP_BITS = 32
+FP_FMIN = 300.0
+FP_FMAX = 3000.0
+_BLOCK_FRAMES = 4096
+_MAX_SHIFT = 3          # frames of misalignment tolerated between encodes
+_DURATION_SLACK_S = 0.25
+
+
+# ----------------------- Fingerprint -----------------------
+def _band_matrix(sr: int) -> np.ndarray:
+    freqs = np.fft.rfftfreq(FP_N_FFT, 1.0 / sr)
+    edges = np.geomspace(FP_FMIN, FP_FMAX, FP_BITS + 2)
+    m = np.zeros((len(freqs), FP_BITS + 1), dtype=np.float32)
+    for b in range(FP_BITS + 1):
+        m[(freqs >= edges[b]) & (freqs < edges[b + 1]), b] = 1.0
+    return m
+
+
+def fingerprint(y: np.ndarray, sr: int) -> np.ndarray:
+    """
+    Compact spectral fingerprint: one uint32 per hop (Haitsma-Kalker style).
+
+    Each bit is the sign of the energy difference between adjacent bands,
+    differenced again over time, so it survives re-encoding, bitrate changes
+    and gain changes while the decoded audio stays the same.
+    """
+    if y.size < FP_N_FFT:
+        return np.zeros(0, dtype=np.uint32)
+    bands = _band_matrix(sr)
+    window = np.hanning(FP_N_FFT).astype(np.float32)
+    n_frames = 1 + (len(y) - FP_N_FFT) // FP_HOP
+    strided = np.lib.stride_tricks.as_strided(
+        y, shape=(n_frames, FP_N_FFT), strides=(y.strides[0] * FP_HOP, y.strides[0]), writeable=False
+    )
+
+    energies = np.empty((n_frames, FP_BITS + 1), dtype=np.float32)
+    for start in range(0, n_frames, _BLOCK_FRAMES):
+        block = strided[start:start + _BLOCK_FRAMES] * window
+        spec = np.fft.rfft(block, axis=1)
+        energies[start:start + len(block)] = (spec.real ** 2 + spec.imag ** 2) @ bands
+
+    diff = energies[:, :-1] - energies[:, 1:]
+    bits = (diff[1:] - diff[:-1]) > 0
+    return np.packbits(bits, axis=1, bitorder="little").view("<u4").ravel()
+
+
+def bit_error_rate(a: np.ndarray, b: np.ndarray, max_shift: int = _MAX_SHIFT) -> float:
+    """Lowest fraction of differing bits over small alignment shifts."""
+    best = 1.0
+    for shift in range(-max_shift, max_shift + 1):
+        x, y = (a[shift:], b) if shift >= 0 else (a, b[-shift:])
+        n = min(len(x), len(y))
+        if n == 0 or n < 0.9 * max(len(a), len(b)):
+            continue
+        xor = np.bitwise_xor(x[:n], y[:n])
+        errors = np.unpackbits(xor.view(np.uint8)).sum()
+        best = min(best, errors / (n * FP_BITS))
+    return best
+
+# ----------------------- Transcript Cache -----------------------
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    asr_id      TEXT NOT NULL,
+    duration    REAL NOT NULL,
+    fp          BLOB NOT NULL,
+    transcript  TEXT NOT NULL,
+    extras      TEXT NOT NULL,
+    bytes       INTEGER NOT NULL,
+    last_used   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transcripts_lookup ON transcripts (asr_id, duration);
+CREATE INDEX IF NOT EXISTS transcripts_lru ON transcripts (last_used);
+"""
+
+
+class TranscriptCache:
+    """
+    Transcripts keyed on a fingerprint of the decoded 16 kHz waveform.
+
+    Lookups narrow candidates by transcription engine and duration via an
+    SQLite index, then compare fingerprints by bit error rate, so the same
+    audio re-wrapped in another container or bitrate is a hit. Trimmed
+    copies are intentionally misses: their transcript differs. Rows are
+    evicted least recently used first once the stored bytes exceed
+    `max_bytes`.
+    """
+
+    def __init__(self, db_path, max_bytes: int, max_ber: float = 0.15):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_ber = max_ber
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "puts": 0, "evictions": 0}
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+
+    def _connect(self):
+        db = sqlite3.connect(self.db_path, timeout=30)
+        db.execute("PRAGMA journal_mode=WAL")
+        return db
+
+    def get(self, fp: np.ndarray, duration: float, asr_id: str):
+        """(transcript, extras) for matching audio, or None."""
+        if fp.size == 0:
+            return None
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT id, fp, transcript, extras FROM transcripts "
+                "WHERE asr_id = ? AND duration BETWEEN ? AND ? ORDER BY last_used DESC LIMIT 64",
+                (asr_id, duration - _DURATION_SLACK_S, duration + _DURATION_SLACK_S),
+            ).fetchall()
+            for row_id, blob, transcript, extras in rows:
+                if bit_error_rate(fp, np.frombuffer(blob, dtype=np.uint32)) <= self.max_ber:
+                    db.execute("UPDATE transcripts SET last_used = ? WHERE id = ?", (time.time(), row_id))
+                    self._count("hits")
+                    return transcript, json.loads(extras)
+        self._count("misses")
+        return None
+
+    def put(self, fp: np.ndarray, duration: float, asr_id: str, transcript: str, extras: dict):
+        if fp.size == 0:
+            return
+        blob = fp.astype(np.uint32).tobytes()
+        extras_json = json.dumps(extras)
+        size = len(blob) + len(transcript.encode("utf-8")) + len(extras_json)
+        with self._connect() as db:
+            db.execute(
+                "INSERT INTO transcripts (asr_id, duration, fp, transcript, extras, bytes, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (asr_id, duration, blob, transcript, extras_json, size, time.time()),
+            )
+            self._count("puts")
+            self._evict(db)
+
+    def _evict(self, db):
+        total = db.execute("SELECT COALESCE(SUM(bytes), 0) FROM transcripts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        for row_id, size in db.execute("SELECT id, bytes FROM transcripts ORDER BY last_used").fetchall():
+            if total <= target:
+                break
+            db.execute("DELETE FROM transcripts WHERE id = ?", (row_id,))
+            total -= size
+            self._count("evictions")
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.counters["hits"] + self.counters["misses"]
+            return {**self.counters, "hit_rate": (self.counters["hits"] / lookups) if lookups else 0.0}
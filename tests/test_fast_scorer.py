@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix, hstack
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from src.fast_scorer import LinearScorer
+
+WORDS = "voice clone real fake synthetic news anchor studio breaking report weather sports".split()
+N_AUDIO = 26
+
+
+def _data(n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    transcripts = [" ".join(rng.choice(WORDS, size=int(rng.integers(0, 12)))) for _ in range(n)]
+    # MFCC-like scale: large means, mixed spreads
+    feats = rng.normal(loc=rng.uniform(-300, 100, N_AUDIO), scale=rng.uniform(1, 60, N_AUDIO), size=(n, N_AUDIO))
+    return transcripts, feats
+
+
+@pytest.fixture(scope="module")
+def bundle():
+    transcripts, feats = _data(400, seed=0)
+    y = (feats[:, 0] + 20 * np.array(["fake" in t for t in transcripts]) > feats[:, 0].mean()).astype(int)
+    vec = TfidfVectorizer().fit(transcripts)
+    scaler = StandardScaler().fit(feats)
+    X = hstack([vec.transform(transcripts), csr_matrix(scaler.transform(feats))]).tocsr()
+    clf = LogisticRegression(max_iter=2000).fit(X, y)
+    return vec, scaler, clf
+
+
+def _sklearn_proba(bundle, X_text, feats):
+    vec, scaler, clf = bundle
+    return clf.predict_proba(hstack([X_text, csr_matrix(scaler.transform(feats))]).tocsr())
+
+
+@pytest.mark.parametrize("dtype, atol", [(np.float64, 1e-12), (np.float32, 1e-6)])
+def test_matches_predict_proba(bundle, dtype, atol):
+    scorer = LinearScorer.from_bundle(*bundle)
+    assert scorer is not None
+    transcripts, feats = _data(2000, seed=1)
+    feats = feats.astype(dtype)  # the pipeline's MFCC vectors are float32
+    X_text = bundle[0].transform(transcripts)
+
+    expected = _sklearn_proba(bundle, X_text, feats)
+    actual = scorer.predict_proba(X_text, feats)
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=atol)
+    np.testing.assert_array_equal(actual.argmax(axis=1), expected.argmax(axis=1))
+
+
+@pytest.mark.filterwarnings("ignore::sklearn.exceptions.ConvergenceWarning")
+def test_non_binary_model_is_not_handled(bundle):
+    vec, scaler, _ = bundle
+    transcripts, feats = _data(300, seed=2)
+    X = hstack([vec.transform(transcripts), csr_matrix(scaler.transform(feats))]).tocsr()
+    clf = LogisticRegression(max_iter=50).fit(X[:, :5], np.arange(300) % 3)  # only the class count matters
+    assert LinearScorer.from_bundle(vec, scaler, clf) is None
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from src.mfcc import N_FFT, MfccEngine, RunningStats, StreamFramer
+
+librosa = pytest.importorskip("librosa")
+
+SR = 16000
+N_MFCC = 13
+
+
+def _clip(seconds: float, seed: int = 0, freq: float = 440.0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SR)) / SR
+    y = 0.3 * np.sin(2 * np.pi * freq * t) + 0.02 * rng.standard_normal(len(t))
+    return y.astype(np.float32)
+
+
+def _librosa_stats(y: np.ndarray) -> np.ndarray:
+    mfcc = librosa.feature.mfcc(y=y, sr=SR, n_mfcc=N_MFCC)
+    return np.concatenate([mfcc.mean(axis=1), mfcc.std(axis=1)])
+
+
+def _assert_close(actual, expected, rtol=1e-4):
+    # float32 rounding; relative to each feature's magnitude (MFCC c0 is in the hundreds)
+    scale = np.maximum(np.abs(expected), 1.0)
+    assert np.max(np.abs(actual - expected) / scale) < rtol
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return MfccEngine(SR, N_MFCC)
+
+
+@pytest.mark.filterwarnings("ignore:n_fft=.*is too large")
+@pytest.mark.parametrize("seconds", [0.05, 0.5, 1.0, 3.3])
+def test_stats_matches_librosa(engine, seconds):
+    y = _clip(seconds)
+    _assert_close(engine.stats(y), _librosa_stats(y))
+
+
+@pytest.mark.filterwarnings("ignore:n_fft=.*is too large")
+def test_clip_shorter_than_n_fft(engine):
+    y = _clip((N_FFT // 4) / SR)
+    assert len(y) < N_FFT
+    _assert_close(engine.stats(y), _librosa_stats(y))
+    _assert_close(engine.stats_batch([y])[0], _librosa_stats(y))
+
+
+@pytest.mark.parametrize("block_frames", [1, 7, 32, 4096])
+def test_stats_batch_matches_stats(engine, block_frames):
+    clips = [
+        _clip(1.0, seed=1),
+        np.zeros(0, dtype=np.float32),
+        _clip(0.3, seed=2, freq=1000.0),
+        None,
+        _clip((N_FFT // 2) / SR, seed=3),
+        _clip(2.1, seed=4, freq=150.0) * 0.01,
+        np.zeros(SR // 2, dtype=np.float32),
+    ]
+    # Frame counts chosen so small blocks split clips and mix several clips in one block
+    out = engine.stats_batch(clips, block_frames=block_frames)
+    assert out.shape == (len(clips), 2 * N_MFCC) and out.dtype == np.float32
+    for i, y in enumerate(clips):
+        if y is None or y.size == 0:
+            assert not out[i].any()
+        else:
+            _assert_close(out[i], engine.stats(y))
+
+
+def test_stats_batch_empty(engine):
+    assert engine.stats_batch([]).shape == (0, 2 * N_MFCC)
+    assert not engine.stats_batch([None, np.zeros(0, dtype=np.float32)]).any()
+
+
+@pytest.mark.parametrize("chunk", [1000, N_FFT, 7919])
+def test_stream_framer_matches_whole_clip_frames(engine, chunk):
+    y = _clip(1.7, seed=5)
+    framer = StreamFramer(engine.n_fft, engine.hop_length)
+    frames = [framer.push(y[i:i + chunk]) for i in range(0, len(y), chunk)] + [framer.finish()]
+    np.testing.assert_array_equal(np.concatenate(frames), engine.frames(y))
+
+
+def test_running_stats_matches_whole_clip_stats(engine):
+    y = _clip(2.5, seed=6)
+    mel = engine.mel_power(engine.frames(y))
+    mfcc = engine.mfcc_frames(mel, engine.floor_db(float(mel.max())))
+    stats = RunningStats(N_MFCC)
+    for start in range(0, len(mfcc), 17):
+        stats.update(mfcc[start:start + 17])
+    _assert_close(stats.features(), engine.stats(y), rtol=1e-5)
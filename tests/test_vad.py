@@ -0,0 +1,36 @@
+import numpy as np
+
+from src import vad
+
+SR = 16000
+
+
+def _tone(seconds: float, amp: float = 0.3, freq: float = 220.0) -> np.ndarray:
+    t = np.arange(int(seconds * SR)) / SR
+    return (amp * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def test_continuous_tone_is_kept():
+    y = _tone(5.0)
+    segments = vad.detect_speech(y, SR)
+    assert segments and vad.summarize(segments, 5.0)["speech_ratio"] > 0.95
+
+
+def test_steady_noise_bed_is_kept():
+    rng = np.random.default_rng(0)
+    y = (0.2 * rng.standard_normal(4 * SR)).astype(np.float32)
+    assert vad.summarize(vad.detect_speech(y, SR), 4.0)["speech_ratio"] > 0.95
+
+
+def test_pauses_are_trimmed():
+    silence = np.zeros(SR, dtype=np.float32)
+    y = np.concatenate([silence, _tone(1.0), silence, _tone(1.0), silence])
+    segments = vad.detect_speech(y, SR)
+    assert len(segments) == 2
+    assert abs(segments[0][0] - (1.0 - vad.PAD_S)) < 0.05
+    assert abs(segments[1][1] - (4.0 + vad.PAD_S)) < 0.05
+
+
+def test_silence_has_no_speech():
+    assert vad.detect_speech(np.zeros(2 * SR, dtype=np.float32), SR) == []
+    assert vad.detect_speech(np.zeros(0, dtype=np.float32), SR) == []
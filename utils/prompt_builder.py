@@ -1,18 +1,12 @@
-def build_prompt(result):
-    artifacts = ", ".join(result["artifacts"])
-
-    anomalies = "\n".join(
-        f"- {k}: {v} abnormal frames"
-        for k, v in result["frame_anomalies"].items()
-    )
+from functools import lru_cache
 
-    return f"""
+PROMPT_TEMPLATE = """
 You are a forensic AI assistant.
 
 Explain the following deepfake detection result in simple,
 non-technical language for general users.
 
-Confidence Score: {result['confidence']*100:.1f}%
+Confidence Score: {confidence}%
 
 Detected Visual Artifacts:
 {artifacts}
@@ -22,3 +16,25 @@ Frame-Level Anomalies:
 
 Explain clearly why the media is likely manipulated.
 """
+
+
+def prompt_key(result) -> tuple:
+    """The parts of `result` the prompt shows, normalized to a hashable key."""
+    return (
+        f"{result['confidence']*100:.1f}",
+        tuple(str(a) for a in result.get("artifacts", ())),
+        tuple((str(k), str(v)) for k, v in result.get("frame_anomalies", {}).items()),
+    )
+
+
+@lru_cache(maxsize=4096)
+def _render(confidence: str, artifacts: tuple, anomalies: tuple) -> str:
+    return PROMPT_TEMPLATE.format(
+        confidence=confidence,
+        artifacts=", ".join(artifacts),
+        anomalies="\n".join(f"- {k}: {v} abnormal frames" for k, v in anomalies),
+    )
+
+
+def build_prompt(result):
+    return _render(*prompt_key(result))